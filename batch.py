@@ -0,0 +1,81 @@
+from units.configs.node_library import NodeLibrary
+from units.engine import BatchRunner, BatchOutput, disk_cache
+from units.calculation_functions.output.write import EncoderSettings
+
+from argparse import ArgumentParser
+from glob import glob
+import sys
+
+
+def parse_output(value: str) -> BatchOutput:
+    '''
+    Разбирает выходной параметр в формате "узел.параметр[:формат]"
+    '''
+    target, _, file_format = value.partition(":")
+    node_name, _, key = target.rpartition(".")
+    if not node_name or not key:
+        raise ValueError(f"Ожидается 'узел.параметр[:формат]', получено '{value}'")
+    return BatchOutput(node_name, key, file_format or "jpg")
+
+
+def main(argv=None) -> int:
+    parser = ArgumentParser(description="Пакетная обработка файлов сохраненным графом узлов")
+    parser.add_argument("graph", help="файл графа (JSON)")
+    parser.add_argument("--bind", required=True, help="входной параметр для файлов: узел.параметр")
+    parser.add_argument("--glob", required=True, help="шаблон входных файлов, например \"DATA/jpg/*.jpg\"")
+    parser.add_argument(
+        "--output", required=True, action="append",
+        help="сохраняемый выходной параметр: узел.параметр[:jpg|png|xcr|bin] (можно указать несколько)"
+    )
+    parser.add_argument("--out-dir", required=True, help="папка для результатов")
+    parser.add_argument("--workers", type=int, default=None, help="количество потоков (по умолчанию по числу процессоров)")
+    parser.add_argument("--read-ahead", type=int, default=None, help="сколько файлов декодировать заранее")
+    parser.add_argument("--write-queue", type=int, default=None, help="сколько результатов может ждать записи")
+    parser.add_argument("--jpeg-quality", type=int, default=95, help="качество JPEG (0..100)")
+    parser.add_argument("--png-compression", type=int, default=3, help="уровень сжатия PNG (0..9)")
+    parser.add_argument(
+        "--no-decode", action="store_true",
+        help="передавать в граф файл, а не декодированные данные"
+    )
+    parser.add_argument(
+        "--cache-dir", default=None,
+        help="папка кэша результатов на диске (повторный запуск берет результаты из нее)"
+    )
+    args = parser.parse_args(argv)
+
+    bind_node_name, _, bind_key = args.bind.rpartition(".")
+    paths = sorted(glob(args.glob, recursive=True))
+    if not paths:
+        print(f"Нет файлов по шаблону '{args.glob}'")
+        return 1
+
+    if args.cache_dir:
+        disk_cache.open(args.cache_dir)
+
+    runner = BatchRunner(
+        graph_path = args.graph,
+        configs = NodeLibrary.get_nodes_configs(),
+        bind_node_name = bind_node_name,
+        bind_key = bind_key,
+        outputs = [parse_output(value) for value in args.output],
+        out_dir = args.out_dir,
+        workers = args.workers,
+        read_ahead = args.read_ahead,
+        is_decode = not args.no_decode,
+        write_queue = args.write_queue,
+        settings = EncoderSettings(args.jpeg_quality, args.png_compression),
+    )
+
+    def on_file_done(path: str, error: str) -> None:
+        print(f"{path}: {'ошибка: ' + error if error else 'готово'}")
+
+    report = runner.run(paths, on_file_done)
+    print(report)
+    return 0 if not report.errors else 2
+
+
+if __name__ == "__main__":
+    # Защита нужна для пула процессов (дочерние процессы импортируют этот модуль)
+    sys.exit(main())
+
+# python batch.py graph.json --bind open.image_file --glob "DATA/jpg/*.jpg" --output gamma.gamma_image --out-dir out
@@ -1,15 +1,30 @@
 from flet import Page, app, AppView
 from units.workplace import Workplace
+from units.engine import disk_cache
+from units.calculation_functions.input import thumbnail_cache
+import os
+
+
+# Папка кэша результатов на диске (пустая строка в PHOTO_EDITOR_CACHE_DIR выключает кэш)
+CACHE_DIR = os.environ.get(
+    "PHOTO_EDITOR_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".photo_editor_cache")
+)
 
 
 def main(page: Page):
+    if CACHE_DIR:
+        disk_cache.open(CACHE_DIR)
+        thumbnail_cache.open(os.path.join(CACHE_DIR, "thumbnails"))
     page.title = "Photo Editor App"
     page.padding = 0
     workplace = Workplace(None, page)
     page.add(workplace)
     page.update()
 
-app(target=main)#, view=AppView.WEB_BROWSER)
+if __name__ == "__main__":
+    # Защита нужна для пула процессов (дочерние процессы импортируют этот модуль)
+    app(target=main)#, view=AppView.WEB_BROWSER)
 
 # flet run app\node\main.py
 # flet run main.py
\ No newline at end of file
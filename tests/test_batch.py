@@ -0,0 +1,62 @@
+from units.calculation_functions.input.read import read_file, decoded_file_cache
+from units.engine.result_cache import fingerprint_value
+import batch
+
+import json
+
+import cv2
+import numpy as np
+
+
+
+def write_graph(path):
+    '''
+    Записывает граф из одного узла "Открыть изображение"
+    '''
+    graph = {
+        "version": 1,
+        "nodes": [{"name": "open", "key": "open_image", "values": {"image_file": None}}],
+        "connections": [],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(graph, file)
+
+
+
+def test_batch_cli_writes_outputs(tmp_path):
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    images = {}
+    for name in ("a", "b"):
+        image = np.random.default_rng(len(name) + ord(name)).integers(0, 256, (24, 32), dtype=np.uint8)
+        cv2.imwrite(str(input_dir / f"{name}.png"), image)
+        images[name] = image
+    graph_path = tmp_path / "graph.json"
+    write_graph(graph_path)
+    out_dir = tmp_path / "out"
+
+    exit_code = batch.main([
+        str(graph_path),
+        "--bind", "open.image_file",
+        "--glob", str(input_dir / "*.png"),
+        "--output", "open.image:png",
+        "--out-dir", str(out_dir),
+        "--workers", "2",
+    ])
+
+    assert exit_code == 0
+    for name, image in images.items():
+        written = cv2.imread(str(out_dir / f"{name}.png"), cv2.IMREAD_GRAYSCALE)
+        assert np.array_equal(written, image)
+
+
+
+def test_decoded_file_fingerprint_does_not_hash_data(tmp_path):
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, np.zeros((8, 8), dtype=np.uint8))
+    data = read_file(path, is_lazy=True)
+
+    assert fingerprint_value(data).startswith("decoded:")
+    # Копия данных не связана с файлом и получает отпечаток по содержимому
+    assert fingerprint_value(np.array(data)).startswith("array:")
+    decoded_file_cache.clear()
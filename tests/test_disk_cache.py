@@ -0,0 +1,74 @@
+from units.calculation_functions import NodeResult, ResultType
+from units.engine import GraphEngine, disk_cache
+from units.node import NodeConfig
+from units.parameters import OutParamConfig, SingleValueParamConfig
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+import matplotlib.pyplot as plt
+import numpy as np
+import pytest
+
+
+
+calls = []
+
+
+
+def plot_values(scale):
+    '''
+    Узел, возвращающий график (как lab6 и detect_artifacts)
+    '''
+    calls.append(scale)
+    fig, ax = plt.subplots(figsize=(3, 2))
+    ax.plot(np.arange(10) * scale)
+    return {
+        "values": np.arange(10) * scale,
+        "fig": NodeResult(fig, ResultType.MATPLOTLIB_FIG),
+    }
+
+
+
+PLOT_CONFIG = NodeConfig(
+    key = "plot_values",
+    name = "График",
+    function = plot_values,
+    parameters = [
+        OutParamConfig(key = "values", name = "Значения"),
+        OutParamConfig(key = "fig", name = "График"),
+        SingleValueParamConfig(key = "scale", name = "Масштаб", default_value = 2),
+    ]
+)
+
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(disk_cache, "min_calculation_time", 0)
+    disk_cache.open(str(tmp_path / "cache"))
+    yield disk_cache
+    disk_cache.close()
+
+
+
+def run_graph():
+    engine = GraphEngine()
+    node = engine.add_node(PLOT_CONFIG)
+    engine.run(outputs=[node])
+    return node.result
+
+
+
+def test_figure_node_is_served_from_disk_cache(cache):
+    calls.clear()
+    first = run_graph()
+    # Новый граф: кэш в памяти пуст, результат берется с диска
+    second = run_graph()
+
+    assert calls == [2]
+    assert np.array_equal(second["values"], first["values"])
+    figure = second["fig"].value
+    assert isinstance(figure, Figure)
+    assert second["fig"].type == ResultType.MATPLOTLIB_FIG
+    assert tuple(figure.get_size_inches()) == tuple(first["fig"].value.get_size_inches())
@@ -0,0 +1,79 @@
+from units.calculation_functions.input.read import read_file, open_image_file, decoded_file_cache
+from units.calculation_functions.input.prefetch import FilePrefetcher
+from units.data_types import File
+
+import shutil
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "DATA")
+
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    decoded_file_cache.clear()
+    yield
+    decoded_file_cache.clear()
+
+
+
+def prefetch_and_open(path):
+    '''
+    Читает файл в фоне, затем открывает его узлом "Открыть изображение".
+    Возвращает прочитанные данные и данные узла
+    '''
+    prefetched = FilePrefetcher(workers=1).prefetch(File(path)).result()
+    hits, misses = decoded_file_cache.hits, decoded_file_cache.misses
+    image = open_image_file(File(path))["image"].value
+    assert decoded_file_cache.hits == hits + 1
+    assert decoded_file_cache.misses == misses
+    assert len(decoded_file_cache.entries) == 1
+    return prefetched, image
+
+
+
+def test_prefetched_jpg_is_cache_hit(tmp_path):
+    path = str(tmp_path / "image.jpg")
+    cv2.imwrite(path, np.arange(64 * 48, dtype=np.uint8).reshape(64, 48))
+
+    prefetched, image = prefetch_and_open(path)
+    assert image is prefetched
+    # Узлы, читающие файл без is_lazy, получают ту же запись
+    assert read_file(path) is prefetched
+
+
+
+def test_prefetched_xcr_is_cache_hit(tmp_path):
+    source = os.path.join(DATA_DIR, "xcr", "c12-85v.xcr")
+    if not os.path.exists(source):
+        pytest.skip("нет тестового файла XCR")
+    path = str(tmp_path / "scan.xcr")
+    shutil.copy(source, path)
+
+    prefetched, image = prefetch_and_open(path)
+    assert image is prefetched
+    # Файл только отображен в память, а не прочитан полностью
+    assert isinstance(prefetched, np.memmap)
+
+
+
+def test_file_changed_after_prefetch_is_read_again(tmp_path):
+    path = str(tmp_path / "image.png")
+    cv2.imwrite(path, np.zeros((16, 16), dtype=np.uint8))
+    prefetched = FilePrefetcher(workers=1).prefetch(File(path)).result()
+
+    changed = np.full((16, 16), 200, dtype=np.uint8)
+    cv2.imwrite(path, changed)
+    # Время изменения задается явно: запись может попасть в тот же квант времени файловой системы
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    image = open_image_file(File(path))["image"].value
+    assert image is not prefetched
+    assert np.array_equal(image, changed)
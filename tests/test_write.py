@@ -0,0 +1,21 @@
+from units.calculation_functions.output.write import write_to_png_file
+
+import cv2
+import numpy as np
+import pytest
+
+
+
+def test_png_of_big_endian_image_keeps_values(tmp_path):
+    image = np.arange(64 * 32, dtype=">u2").reshape(64, 32) * 17
+    path = write_to_png_file(image, str(tmp_path), "scan")
+
+    written = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+    assert written.dtype == np.uint16
+    assert np.array_equal(written, image)
+
+
+
+def test_failed_write_raises(tmp_path):
+    with pytest.raises(ValueError):
+        write_to_png_file(np.zeros((4, 4), dtype=np.uint8), str(tmp_path / "missing"), "image")
@@ -1 +0,0 @@
-from .workplace import Workplace
\ No newline at end of file
@@ -1,4 +1,7 @@
-from .calculation_functions_typing import NodeResult, ResultType
+from .calculation_functions_typing import NodeResult, ResultType, Signal
+from .copy_on_write import make_read_only, make_writable, copy_statistics
+from .byte_order import to_native_byte_order
+from .input.read import as_native_byte_order
 
 from .math import *
 from .output import *
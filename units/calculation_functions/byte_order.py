@@ -0,0 +1,31 @@
+import numpy as np
+
+
+
+# Количество элементов, преобразуемых за один шаг (ограничивает размер временных буферов)
+TILE_SIZE = 1 << 20
+
+
+
+def is_native_byte_order(array: np.ndarray) -> bool:
+    '''
+    Возвращает True, если элементы массива хранятся в порядке байт процессора
+    '''
+    return array.dtype.isnative
+
+
+
+def to_native_byte_order(array: np.ndarray, tile_size: int = TILE_SIZE) -> np.ndarray:
+    '''
+    Возвращает массив в порядке байт процессора.
+    Преобразование выполняется частями по tile_size элементов в заранее выделенный массив,
+    поэтому дополнительная память равна размеру результата (без полноразмерных временных массивов)
+    '''
+    if is_native_byte_order(array):
+        return array
+    native = np.empty(array.shape, dtype=array.dtype.newbyteorder("="))
+    source = array.reshape(-1)
+    target = native.reshape(-1)
+    for start in range(0, source.size, tile_size):
+        target[start:start + tile_size] = source[start:start + tile_size]
+    return native
@@ -1,6 +1,8 @@
 from enum import Enum
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Tuple
+
+import numpy as np
 
 
 
@@ -14,6 +16,8 @@ class ResultType(Enum):
     IMAGE_CV2 - изображение в формате OpenCV
     IMAGE_BASE64 - изображение в формате base64
     HISTOGRAM - гистограмма matplotlib.
+    SIGNAL - одномерный сигнал или спектр (Signal)
+    AUDIO - звуковой поток (AudioStream), отображаются его параметры
     '''
 
     NONE = "none"
@@ -24,6 +28,8 @@ class ResultType(Enum):
     HISTOGRAM = "hist"
     MATPLOTLIB_FIG = "matplotlib_fig"
     PLOTLY_FIG = "plotly_fig"
+    SIGNAL = "signal"
+    AUDIO = "audio"
 
 
     def __str__(self) -> str:
@@ -42,4 +48,50 @@ class NodeResult:
 
     value: Any = None
     type: ResultType = ResultType.NONE
-    
\ No newline at end of file
+    
+
+
+
+class Signal:
+    '''
+    Одномерный сигнал или спектр: значения values в точках x (время, частота, задержка)
+
+    Массивы хранятся непрерывными (float64 или complex128), поэтому операции над сигналом
+    выполняются векторно, без промежуточных таблиц
+
+    x - координаты отсчетов
+    values - значения отсчетов
+    x_label - название оси x
+    y_label - название значений
+    '''
+
+    __slots__ = ("x", "values", "x_label", "y_label")
+
+    def __init__(self, values, x=None, x_label: str = "Отсчет", y_label: str = "Значение"):
+        values = np.ascontiguousarray(values)
+        if not np.iscomplexobj(values):
+            values = values.astype(np.float64, copy=False)
+        self.values: np.ndarray = values.reshape(-1)
+        self.x: np.ndarray = (
+            np.arange(len(self.values), dtype=np.float64) if x is None
+            else np.ascontiguousarray(x, dtype=np.float64).reshape(-1)
+        )
+        if len(self.x) != len(self.values):
+            raise ValueError(
+                f"Количество координат ({len(self.x)}) не совпадает с количеством значений ({len(self.values)})"
+            )
+        self.x_label = x_label
+        self.y_label = y_label
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def peak(self, start: int = 0) -> Tuple[float, float]:
+        '''
+        Возвращает координату и значение максимума среди отсчетов, начиная с start
+        '''
+        index = start + int(np.argmax(self.values[start:]))
+        return float(self.x[index]), float(self.values[index])
+
+    def __repr__(self) -> str:
+        return f"Signal({len(self)} отсчетов, {self.x_label} -> {self.y_label})"
@@ -0,0 +1,71 @@
+from .calculation_functions_typing import NodeResult, Signal
+
+from dataclasses import dataclass, field
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+
+
+@dataclass
+class CopyStatistics:
+    '''
+    Счетчики копирований массивов при записи (make_writable)
+
+    copies - количество копий
+    copied_bytes - объем скопированных данных (байт)
+    '''
+
+    copies: int = 0
+    copied_bytes: int = 0
+    lock: Lock = field(default_factory=Lock, repr=False, compare=False)
+
+    def add(self, nbytes: int) -> None:
+        with self.lock:
+            self.copies += 1
+            self.copied_bytes += nbytes
+
+    def reset(self) -> None:
+        with self.lock:
+            self.copies = 0
+            self.copied_bytes = 0
+
+
+
+copy_statistics = CopyStatistics()
+
+
+
+def make_read_only(value: Any) -> Any:
+    '''
+    Запрещает запись в массивы результата (в том числе внутри NodeResult, словарей и списков).
+    Результаты узлов передаются зависимым узлам без копирования, поэтому изменять их нельзя
+    '''
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, NodeResult):
+        make_read_only(value.value)
+    elif isinstance(value, Signal):
+        make_read_only(value.x)
+        make_read_only(value.values)
+    elif isinstance(value, dict):
+        for item in value.values():
+            make_read_only(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            make_read_only(item)
+    return value
+
+
+
+def make_writable(array: np.ndarray) -> np.ndarray:
+    '''
+    Возвращает массив, который можно изменять: сам массив, если запись в него разрешена,
+    иначе копию (копирование при записи). Функции узлов вызывают ее перед изменением
+    входного изображения на месте
+    '''
+    if array.flags.writeable:
+        return array
+    copy_statistics.add(array.nbytes)
+    return array.copy()
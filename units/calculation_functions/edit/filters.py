@@ -2,6 +2,7 @@ from ..calculation_functions_typing import *
 from ...data_types import File
 from ..input.read import read_file
 from ..statistics.histogram import plot_brightness_histogram
+from .pointwise import register_pointwise, apply_pointwise
 
 import cv2
 import numpy as np
@@ -26,6 +27,15 @@ def apply_grayscale_scaling(image, scale_size: int = 255):
 
 
 
+def _negative_kernel(image):
+    """
+    Поэлементное негативное преобразование
+    """
+    L = np.iinfo(image.dtype).max
+    return L - 1 - image
+
+
+
 def negative_transformation(image):
     """
     Применяет негативное градационное преобразование к изображению.
@@ -35,13 +45,24 @@ def negative_transformation(image):
     if isinstance(image, File):
         image = read_file(image.path)
 
-    L = np.iinfo(image.dtype).max
-    negative_image = L - 1 - image
+    negative_image = _negative_kernel(image)
     return {
         "negative_image": NodeResult(negative_image, ResultType.IMAGE_CV2)
     }
 
 
+register_pointwise(negative_transformation, _negative_kernel, "image", "negative_image")
+
+
+
+def _gamma_kernel(image, gamma: float = 1.0, constant: float = 1.0):
+    """
+    Поэлементное гамма-преобразование с ограничением диапазоном [0, 255]
+    """
+    gamma_image = constant * np.power(image, gamma)
+    return np.clip(gamma_image, 0, 255).astype(np.uint8)
+
+
 
 def gamma_correction(image, gamma: float = 1.0, constant: float = 1.0):
     """
@@ -52,13 +73,23 @@ def gamma_correction(image, gamma: float = 1.0, constant: float = 1.0):
     if isinstance(image, File):
         image = read_file(image.path)
 
-    gamma_image = constant * np.power(image, gamma)
-    gamma_image = np.clip(gamma_image, 0, 255).astype(np.uint8)
+    gamma_image = apply_pointwise(_gamma_kernel, image, gamma=gamma, constant=constant)
     return {
         "gamma_image": NodeResult(gamma_image, ResultType.IMAGE_CV2)
     }
 
 
+register_pointwise(gamma_correction, _gamma_kernel, "image", "gamma_image")
+
+
+
+def _logarithmic_kernel(image, constant=1):
+    """
+    Поэлементное логарифмическое преобразование
+    """
+    return np.uint8(constant * np.log1p(image + 1))
+
+
 
 def logarithmic_transformation(image, constant=1):
     """
@@ -69,12 +100,15 @@ def logarithmic_transformation(image, constant=1):
     if isinstance(image, File):
         image = read_file(image.path)
 
-    logarithmic_image = np.uint8(constant * np.log1p(image + 1))
+    logarithmic_image = apply_pointwise(_logarithmic_kernel, image, constant=constant)
     return {
         "logarithmic_image": NodeResult(logarithmic_image, ResultType.IMAGE_CV2)
     }
 
 
+register_pointwise(logarithmic_transformation, _logarithmic_kernel, "image", "logarithmic_image")
+
+
 
 def image_histogram_equalization(image):
     """
@@ -8,15 +8,22 @@ import matplotlib.pyplot as plt
 
 
 
-def fourier_2d_to_show(image_path, is_gamma_transform=False):
+def fourier_2d_to_show(image, is_gamma_transform=False, fourier_image=None):
     """
     Применить прямое 2-D преобразование Фурье
-    """
-    image = cv2.imread(image_path, cv2.IMREAD_GRAYSCALE)
 
-    img_fft2D = np.fft.ifftshift(image)
-    img_fft2D = np.fft.fft2(img_fft2D)
-    img_fft2D = np.fft.fftshift(img_fft2D)
+    image - изображение или путь к файлу
+    fourier_image - уже вычисленный сдвинутый спектр изображения (амплитуды совпадают
+    со спектром сдвинутого изображения, поэтому преобразование не выполняется повторно)
+    """
+    if fourier_image is None:
+        if isinstance(image, str):
+            image = read_file(image)
+        img_fft2D = np.fft.ifftshift(image)
+        img_fft2D = np.fft.fft2(img_fft2D)
+        img_fft2D = np.fft.fftshift(img_fft2D)
+    else:
+        img_fft2D = np.abs(fourier_image)
 
     def gamma_transform(img, C, gamma):
         if img.ndim == 1:
@@ -43,12 +50,11 @@ def fourier_2d(image, is_gamma_transform: bool = False):
     if image is None:
         return {"fourier_image": None, "fourier_image_show": None}
     if isinstance(image, File):
-        fig_fft = fourier_2d_to_show(image.path, is_gamma_transform)
         image = read_file(image.path)
 
     f_transform = np.fft.fft2(image)
     fourier_image = np.fft.fftshift(f_transform)
-
+    fig_fft = fourier_2d_to_show(image, is_gamma_transform, fourier_image)
 
     return {
         "fourier_image": NodeResult(fourier_image, ResultType.IMAGE_CV2),
@@ -1,6 +1,7 @@
 from ..calculation_functions_typing import *
 from ...data_types import File
 from ..input.read import read_file
+from ..copy_on_write import make_writable
 
 import cv2
 import numpy as np
@@ -40,7 +41,8 @@ def add_impulse_noise(image, salt_vs_pepper_ratio=0.05):
     if isinstance(image, File):
         image = read_file(image.path)
     
-    noisy_image = np.copy(image)
+    # Копия создается, только если изображение - результат другого узла (запись в него запрещена)
+    noisy_image = make_writable(image)
     salt_vs_pepper = salt_vs_pepper_ratio / 2
     
     # Генерация координат для соли (белые пятна)
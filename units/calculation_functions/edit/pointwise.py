@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+
+
+# Типы, для которых поэлементное преобразование заменяется таблицей (256 или 65536 значений)
+LUT_DTYPES = (np.dtype(np.uint8), np.dtype(np.uint16))
+# Количество таблиц, хранящихся в кэше (65536 значений занимают не больше 512 КБ)
+LUT_CACHE_SIZE = 64
+
+
+
+@dataclass(frozen=True)
+class PointwiseKernel:
+    '''
+    Поэлементное преобразование изображения:
+    значение каждого пикселя результата зависит только от значения этого же пикселя
+
+    kernel - функция kernel(image, **parameters), вычисляющая преобразование
+    image_key - входной параметр узла с изображением
+    out_key - выходной параметр узла с результатом
+    '''
+
+    kernel: Callable[..., np.ndarray]
+    image_key: str
+    out_key: str
+
+
+
+POINTWISE_KERNELS: Dict[Callable, PointwiseKernel] = {}
+
+
+
+def register_pointwise(function: Callable, kernel: Callable, image_key: str, out_key: str) -> None:
+    '''
+    Регистрирует функцию узла как поэлементное преобразование (узлы таких функций могут объединяться)
+    '''
+    POINTWISE_KERNELS[function] = PointwiseKernel(kernel, image_key, out_key)
+
+
+
+def build_lut(steps: Sequence[Tuple[Callable, Dict[str, Any]]], dtype: np.dtype) -> np.ndarray:
+    '''
+    Строит таблицу значений для цепочки преобразований steps ((kernel, parameters), ...),
+    применяя их ко всем возможным значениям пикселя типа dtype
+    '''
+    table = np.arange(np.iinfo(dtype).max + 1, dtype=dtype)
+    for kernel, parameters in steps:
+        table = kernel(table, **parameters)
+    return table
+
+
+
+def _get_steps_key(steps: Sequence[Tuple[Callable, Dict[str, Any]]]) -> Tuple:
+    '''
+    Возвращает ключ кэша таблиц для цепочки преобразований.
+    Тип значений входит в ключ: 30 и 30.0 равны, но дают разный тип результата в NumPy
+    '''
+    return tuple(
+        (kernel, tuple((name, type(value), value) for name, value in sorted(parameters.items())))
+        for kernel, parameters in steps
+    )
+
+
+
+@lru_cache(maxsize=LUT_CACHE_SIZE)
+def _get_cached_lut(steps_key: Tuple, dtype_str: str) -> np.ndarray:
+    '''
+    Строит таблицу значений по ключу цепочки преобразований (результат кэшируется)
+    '''
+    steps = [
+        (kernel, {name: value for name, _, value in parameters})
+        for kernel, parameters in steps_key
+    ]
+    table = build_lut(steps, np.dtype(dtype_str))
+    table.flags.writeable = False
+    return table
+
+
+
+def get_lut(steps: Sequence[Tuple[Callable, Dict[str, Any]]], dtype: np.dtype) -> np.ndarray:
+    '''
+    Возвращает таблицу значений для цепочки преобразований (из кэша, если параметры уже встречались)
+    '''
+    steps_key = _get_steps_key(steps)
+    try:
+        return _get_cached_lut(steps_key, np.dtype(dtype).str)
+    except TypeError:
+        # Параметры нельзя хэшировать - строим таблицу без кэша
+        return build_lut(steps, dtype)
+
+
+
+def apply_lut(image: np.ndarray, table: np.ndarray) -> np.ndarray:
+    '''
+    Заменяет значения пикселей изображения значениями из таблицы
+    '''
+    if image.dtype == np.uint8 and table.dtype == np.uint8:
+        try:
+            return cv2.LUT(image, table)
+        except cv2.error:
+            pass
+    return table[image]
+
+
+
+def apply_pointwise_chain(image: np.ndarray, steps: Sequence[Tuple[Callable, Dict[str, Any]]]) -> np.ndarray:
+    '''
+    Применяет цепочку поэлементных преобразований за один проход по изображению:
+    для 8 и 16-битных изображений - через общую таблицу значений, иначе - последовательно.
+    Для изображений меньше таблицы преобразования применяются напрямую
+    '''
+    if image.dtype in LUT_DTYPES and image.size >= np.iinfo(image.dtype).max + 1:
+        return apply_lut(image, get_lut(steps, image.dtype))
+    for kernel, parameters in steps:
+        image = kernel(image, **parameters)
+    return image
+
+
+
+def apply_pointwise(kernel: Callable, image: np.ndarray, **parameters) -> np.ndarray:
+    '''
+    Применяет поэлементное преобразование kernel(image, **parameters)
+    (для 8 и 16-битных изображений - через кэшированную таблицу значений)
+    '''
+    if not isinstance(image, np.ndarray):
+        return kernel(image, **parameters)
+    return apply_pointwise_chain(image, [(kernel, parameters)])
@@ -1,12 +1,20 @@
 from ..calculation_functions_typing import *
 from ...data_types import File
 from ..input.read import read_file
+from .pointwise import register_pointwise, apply_pointwise
 
 import cv2
 import numpy as np
 
 
 
+def _shift_by_constant_kernel(image, shift_constant: float = 30):
+    '''
+    Поэлементный сдвиг яркости с ограничением диапазоном [0, 255]
+    '''
+    return np.clip(image + shift_constant, 0, 255).astype(np.uint8)
+
+
 def shift_image_by_constant(image, shift_constant: float = 30):
     """
     LAB_NAME: shift_2D
@@ -16,12 +24,22 @@ def shift_image_by_constant(image, shift_constant: float = 30):
         return {"shifted_image": None}
     if isinstance(image, File):
         image = read_file(image.path)
-    shifted_image = np.clip(image + shift_constant, 0, 255).astype(np.uint8)
+    shifted_image = apply_pointwise(_shift_by_constant_kernel, image, shift_constant=shift_constant)
     return {
         "shifted_image": NodeResult(shifted_image, ResultType.IMAGE_CV2),
     }
 
 
+register_pointwise(shift_image_by_constant, _shift_by_constant_kernel, "image", "shifted_image")
+
+
+def _multiply_by_constant_kernel(image, multiply_constant: float = 1.3):
+    '''
+    Поэлементное умножение яркости с ограничением диапазоном [0, 255]
+    '''
+    return np.clip(image * multiply_constant, 0, 255).astype(np.uint8)
+
+
 def multiply_image_by_constant(image, multiply_constant: float = 1.3):
     """
     LAB_NAME: multModel_2D
@@ -31,12 +49,15 @@ def multiply_image_by_constant(image, multiply_constant: float = 1.3):
         return {"multiply_image": None}
     if isinstance(image, File):
         image = read_file(image.path)
-    modified_image = np.clip(image * multiply_constant, 0, 255).astype(np.uint8)
+    modified_image = apply_pointwise(_multiply_by_constant_kernel, image, multiply_constant=multiply_constant)
     return {
         "multiply_image": NodeResult(modified_image, ResultType.IMAGE_CV2),
     }
 
 
+register_pointwise(multiply_image_by_constant, _multiply_by_constant_kernel, "image", "multiply_image")
+
+
 def shift_image(image, dx: int, dy: int):
     """
     Сдвигает входное изображение на указанные значения dx (горизонтальный сдвиг) и dy (вертикальный сдвиг)
@@ -1 +1,5 @@
-from .read import *
\ No newline at end of file
+from .read import *
+from .volume import *
+from .audio import *
+from .prefetch import FilePrefetcher, file_prefetcher
+from .thumbnail import ThumbnailCache, thumbnail_cache
\ No newline at end of file
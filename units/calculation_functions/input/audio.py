@@ -0,0 +1,18 @@
+from ..calculation_functions_typing import *
+from ...data_types import File
+from .read import read_file
+
+
+
+def open_audio(audio_file):
+    """
+    Открывает звуковой файл WAV как поток блоков (отсчеты не читаются до обработки)
+    """
+    if audio_file is None:
+        return {"audio": None}
+    if isinstance(audio_file, File):
+        audio_file = read_file(audio_file.path)
+
+    return {
+        "audio": NodeResult(audio_file, ResultType.AUDIO),
+    }
@@ -0,0 +1,62 @@
+from ...data_types import File
+from .read import read_file
+
+from typing import Dict, Iterable
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import RLock
+import os
+
+
+
+class FilePrefetcher:
+    """
+    Фоновое чтение выбранных файлов в кэш декодированных файлов (decoded_file_cache)
+
+    Файлы читаются так же, как их открывает узел "Открыть изображение" (is_lazy=True),
+    поэтому узел получает данные из той же записи кэша: XCR только отображается в память
+
+    Файл начинает декодироваться сразу после выбора, а узлы пересчитываются, когда
+    чтение завершено: интерфейс не ждет декодирования, а узлы получают данные из кэша.
+    Повторный запрос файла, который еще читается, возвращает тот же Future
+
+    workers - количество потоков чтения
+    """
+
+    def __init__(self, workers: int = 2):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="file_prefetch")
+        # RLock: обратный вызов уже завершенного Future выполняется сразу, под блокировкой
+        self.lock = RLock()
+        self.pending: Dict[str, Future] = {}
+
+
+    def prefetch(self, file: File) -> Future:
+        '''
+        Запускает чтение файла в фоне и возвращает Future
+        (ошибки чтения сохраняются в Future и повторяются при вычислении узла)
+        '''
+        key = os.path.abspath(file.path)
+        with self.lock:
+            future = self.pending.get(key)
+            if future is None:
+                future = self.executor.submit(read_file, file, True)
+                self.pending[key] = future
+                future.add_done_callback(lambda _: self._remove_pending(key, future))
+        return future
+
+
+    def _remove_pending(self, key: str, future: Future) -> None:
+        with self.lock:
+            if self.pending.get(key) is future:
+                del self.pending[key]
+
+
+    def prefetch_many(self, files: Iterable[File]) -> None:
+        '''
+        Запускает чтение нескольких файлов (например, последних выбранных)
+        '''
+        for file in files:
+            self.prefetch(file)
+
+
+
+file_prefetcher = FilePrefetcher()
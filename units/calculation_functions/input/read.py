@@ -1,5 +1,14 @@
 from ..calculation_functions_typing import *
-from ...data_types import File
+from ..byte_order import is_native_byte_order, to_native_byte_order
+from ..copy_on_write import make_read_only
+from ...data_types import File, Volume, AudioStream
+
+from typing import Any, Dict
+from collections import OrderedDict
+from threading import Lock
+import math
+import os
+import re
 
 import cv2
 import numpy as np
@@ -14,35 +23,268 @@ def read_jpg_image(file_path):
 
 
 
-def read_xcr_file(file_path, shape=(1024, 1024)):
+# Заголовок XCR: 2048 байт, поля - текст ASCII по 16 байт
+XCR_HEADER_SIZE = 2048
+XCR_FIELD_SIZE = 16
+# Смещения полей с количеством строк и столбцов изображения
+XCR_ROWS_OFFSET = 608
+XCR_COLUMNS_OFFSET = 624
+# Данные - двухбайтовые беззнаковые целые числа со старшим байтом впереди
+XCR_DTYPE = np.dtype(">u2")
+
+
+
+def read_xcr_shape(file_path, default_shape=(1024, 1024)):
     """
-    Читает файл XCR и возвращает данные в виде массива NumPy с указанной формой
+    Возвращает размер изображения (строки, столбцы) из заголовка файла XCR.
+    Если в заголовке нет размера (например, у файлов, сохраненных write_to_xcr_file),
+    возвращается default_shape
     """
     with open(file_path, 'rb') as file:
-        # Пропуск заголовка (2048 байт)
-        file.seek(2048)
-        # Чтение данных (shape[0] * shape[1] двухбайтовых, беззнаковых целочисленных значений)
-        data = np.fromfile(file, dtype=np.uint16, count=shape[0]*shape[1])
+        header = file.read(XCR_HEADER_SIZE)
+
+    def read_field(offset):
+        field = header[offset:offset + XCR_FIELD_SIZE].split(b'\0', 1)[0]
+        try:
+            return int(field.decode('ascii').strip())
+        except ValueError:
+            return None
 
-    # Меняем местами младший и старший байты
-    data = ((data & 0xff) << 8) | (data >> 8)
-    # Преобразуем данные в массив с указанной формой
-    return data.reshape(shape)
+    shape = (read_field(XCR_ROWS_OFFSET), read_field(XCR_COLUMNS_OFFSET))
+    if None in shape or 0 in shape:
+        return default_shape
+    return shape
 
 
 
-def read_bin_file(file_path, shape=(1024, 1024)):
+def open_xcr_file(file_path, shape=None):
     """
-    Читает бинарный файл и возвращает данные в виде массива NumPy.
+    Отображает данные файла XCR в память без чтения (только для чтения).
+    Возвращает массив с порядком байт файла (>u2): порядок байт меняется только тогда,
+    когда данные нужны функции узла (as_native_byte_order)
+    """
+    if shape is None:
+        shape = read_xcr_shape(file_path)
+    return np.memmap(file_path, dtype=XCR_DTYPE, mode='r', offset=XCR_HEADER_SIZE, shape=shape)
+
+
+
+def read_xcr_file(file_path, shape=None):
     """
-    # TODO: НЕ РАБОТАЕТ!
-    return np.fromfile(file_path, dtype=np.uint8).reshape(shape)
+    Читает файл XCR и возвращает данные в виде массива NumPy (uint16).
+    Размер изображения берется из заголовка, если shape не указан
+    """
+    return to_native_byte_order(open_xcr_file(file_path, shape))
+
+
+
+def read_bin_file(file_path, index=0):
+    """
+    Читает срез index бинарного файла объемных данных и возвращает его в виде массива NumPy.
+    Размер среза берется из имени файла (например, brain-H_x512.bin), остальные срезы не читаются
+    """
+    return Volume.open(file_path).get_slice(index)
+
+
+
+class DecodedFileCache:
+    """
+    Кэш декодированных файлов (общий для всех узлов процесса)
+
+    Ключ - путь к файлу, время изменения, размер и параметры чтения, поэтому измененный файл
+    читается заново. Данные возвращаются только для чтения (make_read_only), чтобы функции узлов
+    не изменяли общий массив. При превышении max_bytes удаляются давно использованные записи.
+    Отображенные в память файлы учитываются по размеру отображения, а копия данных в порядке
+    байт процессора (get_native) хранится в записи: при удалении записи освобождается и она
+
+    max_bytes - максимальный объем декодированных данных (байт)
+    hits, misses - счетчики попаданий и промахов
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 ** 2):
+        self.max_bytes = max_bytes
+        # Ключ -> [данные, размер записи (байт), данные в порядке байт процессора или None]
+        self.entries: OrderedDict = OrderedDict()
+        self.keys_by_id: Dict[int, Any] = {}
+        self.total_bytes = 0
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+
+    @staticmethod
+    def get_nbytes(data) -> int:
+        return data.nbytes if isinstance(data, np.ndarray) else 0
+
+
+    def get(self, key):
+        '''
+        Возвращает данные записи или None
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+
+    def put(self, key, data) -> None:
+        '''
+        Сохраняет данные и удаляет давно использованные записи при превышении max_bytes
+        '''
+        nbytes = self.get_nbytes(data)
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = [data, nbytes, None]
+            self.keys_by_id[id(data)] = key
+            self.total_bytes += nbytes
+            self._evict()
+
+
+    def get_key(self, data):
+        '''
+        Возвращает ключ записи с данными data (путь, время изменения, размер, формат, is_lazy)
+        или None, если данных нет в кэше
+        '''
+        with self.lock:
+            key = self.keys_by_id.get(id(data))
+            entry = self.entries.get(key)
+            return key if entry is not None and entry[0] is data else None
+
+
+    def get_native(self, data):
+        '''
+        Возвращает данные записи в порядке байт процессора (только для чтения).
+        Преобразование выполняется при первом обращении и хранится в записи.
+        Возвращает None, если данных нет в кэше
+        '''
+        with self.lock:
+            key = self.keys_by_id.get(id(data))
+            entry = self.entries.get(key)
+            if entry is None or entry[0] is not data:
+                return None
+            self.entries.move_to_end(key)
+            if entry[2] is not None:
+                return entry[2]
 
+        native = to_native_byte_order(data)
+        native.flags.writeable = False
+        with self.lock:
+            if self.entries.get(key) is entry and entry[2] is None:
+                entry[2] = native
+                entry[1] += native.nbytes
+                self.total_bytes += native.nbytes
+                self._evict()
+        return native
 
 
-def read_file(file: File | str = None):
+    def _remove(self, key) -> None:
+        data, nbytes, _ = self.entries.pop(key)
+        self.total_bytes -= nbytes
+        if self.keys_by_id.get(id(data)) == key:
+            del self.keys_by_id[id(data)]
+
+
+    def _evict(self) -> None:
+        '''
+        Удаляет давно использованные записи, пока размер кэша больше max_bytes
+        '''
+        while self.total_bytes > self.max_bytes and self.entries:
+            self._remove(next(iter(self.entries)))
+
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.keys_by_id.clear()
+            self.total_bytes = 0
+
+
+
+decoded_file_cache = DecodedFileCache()
+
+
+
+def as_native_byte_order(value):
+    '''
+    Возвращает значение, которое можно передать функциям узлов: массивы с обратным порядком байт
+    (например, отображенные в память файлы XCR) преобразуются в порядок байт процессора.
+    Преобразование файлов из кэша хранится в записи кэша (decoded_file_cache.get_native)
+    '''
+    if not isinstance(value, np.ndarray) or is_native_byte_order(value):
+        return value
+    native = decoded_file_cache.get_native(value)
+    if native is None:
+        native = to_native_byte_order(value)
+        native.flags.writeable = False
+    return native
+
+
+
+# Данные .dat - числа float32 без заголовка
+DAT_DTYPE = np.dtype("<f4")
+
+
+
+def read_dat_shape(file_path, count):
+    """
+    Возвращает размер данных .dat (строки, столбцы) для count чисел в файле:
+    - размер из имени файла "<ширина>x<высота>" (blur259x185L.dat - 185 строк по 259 чисел);
+    - одна строка, если число в имени равно количеству чисел (kern64L.dat);
+    - квадрат, если количество чисел - точный квадрат (rect.dat);
+    - иначе одномерный сигнал (count,)
+    """
+    name = os.path.basename(file_path)
+    match = re.search(r"(\d+)x(\d+)", name)
+    if match:
+        width, height = int(match.group(1)), int(match.group(2))
+        if width * height == count:
+            return (height, width)
+    if str(count) in re.findall(r"\d+", name):
+        return (1, count)
+    side = math.isqrt(count)
+    if side > 1 and side * side == count:
+        return (side, side)
+    return (count,)
+
+
+
+def read_dat_file(file_path, width=None, height=None):
+    """
+    Отображает данные файла .dat (float32) в память без чтения (только для чтения).
+    Если ширина и высота не указаны, размер определяется по имени и размеру файла (read_dat_shape)
+    """
+    data_bytes = os.path.getsize(file_path)
+    if data_bytes % DAT_DTYPE.itemsize:
+        raise ValueError(f"Размер файла ({data_bytes} байт) не кратен размеру float32")
+    count = data_bytes // DAT_DTYPE.itemsize
+
+    if width and height:
+        if width * height != count:
+            raise ValueError(
+                f"Размер {width}x{height} не соответствует количеству чисел в файле ({count})"
+            )
+        shape = (height, width)
+    else:
+        shape = read_dat_shape(file_path, count)
+    return np.memmap(file_path, dtype=DAT_DTYPE, mode='r', shape=shape)
+
+
+
+def read_file(file: File | str = None, is_lazy: bool = False):
     '''
-    Чтение данных из файлов
+    Чтение данных из файлов.
+    Декодированные данные кэшируются (decoded_file_cache) и возвращаются только для чтения
+
+    is_lazy - не читать данные, если формат позволяет отобразить файл в память
+    (данные XCR возвращаются с порядком байт файла).
+    Для остальных форматов is_lazy ни на что не влияет и не входит в ключ кэша
     '''
     read_data = {
         'jpg': read_jpg_image,
@@ -52,14 +294,31 @@ def read_file(file: File | str = None):
         "bmp": read_jpg_image,
         "gif": read_jpg_image,
         "xcr": read_xcr_file,
-        "bin": read_bin_file
+        "bin": read_bin_file,
+        "dat": read_dat_file,
+        # Звук читается блоками при обработке (AudioStream.iter_blocks)
+        "wav": AudioStream,
     }
     
+    lazy_read_data = {
+        "xcr": open_xcr_file,
+    }
+
     if not isinstance(file, File):
         file = File(path=file)
+    is_lazy = is_lazy and file.extension in lazy_read_data
+    if is_lazy:
+        read_data.update(lazy_read_data)
     try:
         if file.extension in read_data:
-            return read_data[file.extension](file.path)
+            path = os.path.abspath(file.path)
+            stat = os.stat(path)
+            key = (path, stat.st_mtime_ns, stat.st_size, file.extension, is_lazy)
+            data = decoded_file_cache.get(key)
+            if data is None:
+                data = make_read_only(read_data[file.extension](path))
+                decoded_file_cache.put(key, data)
+            return data
         else: 
             raise ValueError(f"Формат {file.extension} не поддерживается")
     except Exception as e:
@@ -74,7 +333,7 @@ def open_image_file(image_file: File):
     if image_file is None:
         return {'image': None}
     if isinstance(image_file, File):
-        image_file = read_file(file=image_file)
+        image_file = read_file(file=image_file, is_lazy=True)
     return {
         'image': NodeResult(image_file, ResultType.IMAGE_CV2),
     }
\ No newline at end of file
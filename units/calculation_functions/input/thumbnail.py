@@ -0,0 +1,137 @@
+from ...data_types import File
+from .read import read_file
+from .volume import normalize_to_uint8
+
+from typing import Dict
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import Lock
+import tempfile
+import hashlib
+import os
+
+import cv2
+import numpy as np
+
+
+
+class ThumbnailCache:
+    """
+    Уменьшенные копии (превью) файлов для элементов выбора файла, сохраняемые на диске
+
+    Превью создается один раз через чтение файлов проекта (read_file), поэтому доступны
+    и форматы, которые не показывает интерфейс (xcr, bin, dat). Файл превью (PNG) адресуется
+    путем, временем изменения и размером исходного файла: измененный файл получает новое превью.
+    Большие изображения перед масштабированием прореживаются, поэтому у файлов, отображенных
+    в память (xcr), читается только часть строк
+
+    directory - папка превью (создается при первой записи)
+    workers - количество потоков создания превью
+    """
+
+    def __init__(self, directory: str = None, workers: int = 2):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), "photo_editor_thumbnails")
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="thumbnail")
+        self.lock = Lock()
+        self.pending: Dict[str, Future] = {}
+
+
+    def open(self, directory: str) -> None:
+        '''
+        Переносит кэш превью в папку directory
+        '''
+        self.directory = directory
+
+
+    def get_path(self, file: File, size: int) -> str:
+        '''
+        Возвращает путь к файлу превью (файл может еще не существовать)
+        '''
+        path = os.path.abspath(file.path)
+        stat = os.stat(path)
+        key = f"{path}|{stat.st_mtime_ns}|{stat.st_size}|{size}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+
+    def get(self, file: File, size: int) -> str | None:
+        '''
+        Возвращает путь к готовому превью или None
+        '''
+        try:
+            path = self.get_path(file, size)
+        except OSError:
+            return None
+        return path if os.path.exists(path) else None
+
+
+    def request(self, file: File, size: int) -> Future:
+        '''
+        Возвращает Future с путем к превью (создается в фоне, если его еще нет).
+        Повторный запрос превью, которое еще создается, возвращает тот же Future
+        '''
+        future = Future()
+        try:
+            path = self.get_path(file, size)
+        except OSError as e:
+            future.set_exception(e)
+            return future
+        if os.path.exists(path):
+            future.set_result(path)
+            return future
+
+        with self.lock:
+            pending = self.pending.get(path)
+            if pending is not None:
+                return pending
+            future = self.executor.submit(self.create, file, size, path)
+            self.pending[path] = future
+        future.add_done_callback(lambda _: self._remove_pending(path))
+        return future
+
+
+    def _remove_pending(self, path: str) -> None:
+        with self.lock:
+            self.pending.pop(path, None)
+
+
+    def create(self, file: File, size: int, path: str = None) -> str:
+        '''
+        Создает превью, вписанное в квадрат size x size, и возвращает путь к нему
+        '''
+        path = path or self.get_path(file, size)
+        image = make_thumbnail(read_file(file, is_lazy=True), size)
+
+        os.makedirs(self.directory, exist_ok=True)
+        # Запись во временный файл: элементы интерфейса не увидят недописанное превью
+        temp_path = f"{path[:-len('.png')]}_{os.getpid()}_{id(image)}.png"
+        if not cv2.imwrite(temp_path, image):
+            raise ValueError(f"Не удалось записать превью файла '{file.formatted_name}'")
+        os.replace(temp_path, path)
+        return path
+
+
+
+def make_thumbnail(data, size: int) -> np.ndarray:
+    """
+    Уменьшает изображение до размера не больше size x size (uint8).
+    Перед масштабированием изображение прореживается до размера не больше 2 * size,
+    поэтому из больших файлов читается только часть данных
+    """
+    if not isinstance(data, np.ndarray) or data.ndim not in (2, 3):
+        raise ValueError("Для файла нельзя создать превью")
+    height, width = data.shape[:2]
+    step = max(1, max(height, width) // (2 * size))
+    image = np.asarray(data[::step, ::step])
+
+    if image.dtype != np.uint8:
+        image = normalize_to_uint8(image.astype(np.float32))
+
+    height, width = image.shape[:2]
+    scale = size / max(height, width)
+    if scale < 1:
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = cv2.resize(image, new_size, interpolation=cv2.INTER_AREA)
+    return image
+
+
+
+thumbnail_cache = ThumbnailCache()
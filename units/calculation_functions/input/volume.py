@@ -0,0 +1,47 @@
+from ..calculation_functions_typing import *
+from ...data_types import File, Volume
+
+import numpy as np
+
+
+
+def open_volume_file(file_path, width=None, height=None, dtype="<i2"):
+    """
+    Открывает объемные данные (.bin) без чтения: срезы загружаются при обращении.
+    Размер среза берется из имени файла (например, brain-H_x512.bin), если не указан
+    """
+    return Volume.open(file_path, width, height, dtype)
+
+
+
+def normalize_to_uint8(image):
+    """
+    Приводит значения изображения к диапазону 0..255 (uint8) для отображения
+    """
+    min_value, max_value = image.min(), image.max()
+    if max_value == min_value:
+        return np.zeros(image.shape, dtype=np.uint8)
+    scale = 255.0 / (float(max_value) - float(min_value))
+    return ((image - min_value) * scale).astype(np.uint8)
+
+
+
+def volume_slice(volume_file, axis="z", index=0, is_normalize=True):
+    """
+    Возвращает срез объемных данных по оси axis (z - срезы файла, y - строки, x - столбцы).
+    С диска читается только нужный срез
+    """
+    if volume_file is None:
+        return {"slice": None}
+    if isinstance(volume_file, File):
+        volume_file = open_volume_file(volume_file.path)
+
+    depth = volume_file.shape[Volume.AXES[axis]]
+    index = min(max(int(index), 0), depth - 1)
+    image = volume_file.get_slice(index, axis)
+    if is_normalize:
+        image = normalize_to_uint8(image)
+
+    return {
+        "slice": NodeResult(image, ResultType.IMAGE_CV2),
+    }
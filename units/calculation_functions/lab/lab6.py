@@ -1,11 +1,12 @@
 from ..calculation_functions_typing import *
 from ...data_types import File
 from ..input.read import read_file
+from ..statistics.signal import (
+    to_signal, fourier_spectrum, derivative, autocorrelation, cross_correlation, plot_signal
+)
 
 import numpy as np
-import pandas as pd
 import matplotlib.pyplot as plt
-import plotly.express as px
 
 
 def rotate_image_90_degrees(image, angle: int):
@@ -16,45 +17,24 @@ def rotate_image_90_degrees(image, angle: int):
     return np.rot90(image, k=num_rotations)
 
 
-def fourier(data: np.ndarray) -> pd.DataFrame:
-    fourier_transform = np.fft.fft(data)
-    amplitude_spectrum = np.abs(fourier_transform)
-
-    return pd.DataFrame(
-        {
-            "Re[Xn]": fourier_transform.real,
-            "Im[Xn]": fourier_transform.imag,
-            "|Xn|": amplitude_spectrum,
-        }
-    )
-
+def fourier(data: np.ndarray) -> np.ndarray:
+    """
+    Комплексный спектр Фурье Xn
+    """
+    return np.fft.fft(to_signal(data).values)
 
-def spectr_fourier(data: np.ndarray, dt: float) -> pd.DataFrame:
-    n = len(data) // 2
-    fourier_data = fourier(data)
-    xn_values = fourier_data["|Xn|"].values
-    f_border = 1 / (2 * dt)
-    delta_f = f_border / n
-    frequencies = np.arange(n) * delta_f
 
-    return pd.DataFrame({"f": frequencies, "|Xn|": xn_values[:n]})
+def spectr_fourier(data: np.ndarray, dt: float) -> Signal:
+    """
+    Амплитудный спектр |Xn| на частотах f
+    """
+    return fourier_spectrum(data, dt)
 
 
 
 def spectr_fourier_plot(image, selected_line, dt):
-
     line_spectr = spectr_fourier(data=image[selected_line], dt=dt)
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Plot the Fourier spectrum
-    ax.plot(line_spectr['f'], line_spectr['|Xn|'], color='blue')
-    ax.set_title('Спектр Фурье для исходной линии')
-    ax.set_xlabel('Частота')
-    ax.set_ylabel('Амплитуда')
-    
-    # Return the figure object
-    return fig
+    return plot_signal(line_spectr, 'Спектр Фурье для исходной линии')
 
 
 
@@ -71,91 +51,52 @@ def compute_derivative(line_from_image: np.ndarray) -> np.ndarray:
     """
 
     # Вычисляем производную выбранной линии
-    derivative_line = np.gradient(line_from_image)
-
-    return derivative_line
+    return derivative(line_from_image).values
 
 
 def compute_derivative_plot(image, selected_line):
     derivative_line = compute_derivative(image[selected_line])
     line_spectr = spectr_fourier(data=derivative_line, dt=1)
-    
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Plot the Fourier spectrum
-    ax.plot(line_spectr['f'], line_spectr['|Xn|'], color='blue')
-    ax.set_title('Спектр Фурье для производной исходной линии')
-    ax.set_xlabel('Частота')
-    ax.set_ylabel('Амплитуда')
-    
-    # Return the figure object
+    fig = plot_signal(line_spectr, 'Спектр Фурье для производной исходной линии')
     return fig, derivative_line
 
 
 
-def acf(data: np.ndarray) -> pd.DataFrame:
+def acf(data: np.ndarray) -> Signal:
     """
     Вычисляет автокорреляционную функцию (ACF) для входного массива данных.
 
     Параметры:
-        data (np.ndarray): Входной массив данных, для которого необходимо рассчитать ACF или CCF.
-        function_type (str): Тип функции для расчета, либо "Автокорреляционная функция" для ACF, либо "Ковариационная функция" для CCF.
+        data (np.ndarray): Входной массив данных.
 
     Возвращает:
-        pd.DataFrame: DataFrame, содержащий значения лагов 'L' и соответствующие значения ACF или CCF 'AC'.
+        Signal: значения ACF для задержек L.
     """
-    data_mean = np.mean(data)
-    n = len(data)
-    l_values = np.arange(0, n)
-    ac_values = []
-
-    for L in l_values:
-        numerator = np.sum(
-            (data[: n - L - 1] - data_mean) * (data[L : n - 1] - data_mean)
-        )
-        denominator = np.sum((data - data_mean) ** 2)
-        ac = numerator / denominator
-
-        ac_values.append(ac)
-
-    return pd.DataFrame({"L": l_values, "AC": ac_values})
+    return autocorrelation(data)
 
 
 
-def plot_autocorrelation(data, x_label, y_label, color="blue"):
-    fig, ax = plt.subplots(figsize=(10, 5))
-    plt.plot(data.index[1:], data["AC"][1:], color=color, linewidth=2)
-    plt.xlabel(x_label)
-    plt.ylabel(y_label)
-    plt.title('Autocorrelation Plot')
-    plt.grid(True)
-    return fig
+def plot_autocorrelation(data: Signal, x_label, y_label, color="blue"):
+    data = Signal(data.values, data.x, x_label, y_label)
+    return plot_signal(data, 'Autocorrelation Plot', color, skip=1)
 
 
 def autocorrelation_plot(derivative_line):
     acf_data = acf(derivative_line)
 
     autocorrelation_fig = plot_autocorrelation(
-        acf_data.set_index("L"), "Время", "Значение автокорреляции", "blue"
+        acf_data, "Время", "Значение автокорреляции", "blue"
     )
     return autocorrelation_fig, acf_data
 
 
-def acf_spectr_polt(acf_data):
-    acf_spectr = spectr_fourier(data=acf_data["AC"], dt=1)
-
-    fig, ax = plt.subplots(figsize=(10, 5))
-    
-    # Plot the Fourier spectrum
-    ax.plot(acf_spectr, color='blue')
-    ax.set_title('Спектр Фурье для АКФ производной линии')
-    ax.set_xlabel('Частота')
-    ax.set_ylabel('Амплитуда')
-
+def acf_spectr_polt(acf_data: Signal):
+    acf_spectr = spectr_fourier(data=acf_data, dt=1)
+    fig = plot_signal(acf_spectr, 'Спектр Фурье для АКФ производной линии')
     return fig, acf_spectr
 
 
-def ccf(datax: np.ndarray, datay: np.ndarray) -> pd.DataFrame:
+def ccf(datax: np.ndarray, datay: np.ndarray) -> Signal:
     """
     Вычисляет функцию корреляции кросс-корреляции (CCF) между двумя входными массивами данных.
 
@@ -164,52 +105,20 @@ def ccf(datax: np.ndarray, datay: np.ndarray) -> pd.DataFrame:
         datay (np.ndarray): Второй входной массив данных.
 
     Возвращает:
-        pd.DataFrame: DataFrame, содержащий значения задержек 'L' и соответствующие значения CCF.
+        Signal: значения CCF для задержек L.
     """
-    if len(datax) != len(datay):
-        raise ValueError("Длины входных данных не совпадают")
-
-    n = len(datax)
-    l_values = np.arange(0, n)
-    x_mean = np.mean(datax)
-    y_mean = np.mean(datay)
-    ccf_values = (
-        np.correlate(datax - x_mean, datay - y_mean, mode="full")[:n][::-1] / n
-    )
-
-    return pd.DataFrame({"L": l_values, "CCF": ccf_values})
+    return cross_correlation(datax, datay)
 
 
 
-def plot_cross_correlation(data, x_label, y_label, color="blue"):
-    # fig = px.line(
-    #     x=data.index[1:],
-    #     y=data["CCF"][1:],
-    #     labels={"x": x_label, "y": y_label},
-    # )
-    # fig.update_traces(line=dict(color=color, width=2))
-    # fig.update_layout(
-    #     xaxis_title=x_label,
-    #     yaxis_title=y_label,
-    #     hovermode="x",
-    # )
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(data.index[1:], data["CCF"][1:], color=color, linewidth=2)
-    ax.set_xlabel(x_label)
-    ax.set_ylabel(y_label)
-    ax.set_title('Cross-Correlation Plot')
-    ax.grid(True)
-    return fig
+def plot_cross_correlation(data: Signal, x_label, y_label, color="blue"):
+    data = Signal(data.values, data.x, x_label, y_label)
+    return plot_signal(data, 'Cross-Correlation Plot', color, skip=1)
 
 
-def plot_fourier_spectrum(data, x_label, y_label, color="blue", title=""):
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(data["f"], data["|Xn|"], color=color, linewidth=2)
-    ax.set_xlabel(x_label)
-    ax.set_ylabel(y_label)
-    ax.set_title(title)
-    ax.grid(True)
-    return fig
+def plot_fourier_spectrum(data: Signal, x_label, y_label, color="blue", title=""):
+    data = Signal(data.values, data.x, x_label, y_label)
+    return plot_signal(data, title, color)
 
 
 
@@ -281,14 +190,8 @@ def lab6(image, rotation_angle, line_number, ds, convolution_type, dt, m, fc1, f
 
     acf_spectr_fig, acf_spectr = acf_spectr_polt(acf_data)
 
-    # Получаем массив амплитуд спектра
-    amplitudes = acf_spectr["|Xn|"]
-    # Ищем максимумы
-    max_amplitude = amplitudes.max()
-    # Находим индекс максимальной амплитуды
-    max_amplitude_index = acf_spectr["|Xn|"].idxmax()
-    # Получаем значение частоты для максимальной амплитуды
-    max_frequency_acf = acf_spectr["f"].iloc[max_amplitude_index]
+    # Частота и значение максимальной амплитуды спектра
+    max_frequency_acf, max_amplitude = acf_spectr.peak()
 
     derivative_line_2 = compute_derivative(rotate_image[line_number + ds])
 
@@ -296,20 +199,14 @@ def lab6(image, rotation_angle, line_number, ds, convolution_type, dt, m, fc1, f
 
     cross_correlation_fig = plot_cross_correlation(cross_corr, "Время", "Значение кроскорреляции", "blue")
 
-    ccf_spectr = spectr_fourier(data=cross_corr["CCF"], dt=1)
+    ccf_spectr = spectr_fourier(data=cross_corr, dt=1)
 
     ccf_spectr_fig = plot_fourier_spectrum(ccf_spectr,
         "Частота", "Амплитуда", "blue", title="Спектр Фурье для кроскорреляции двух строк",
     )
 
-    # Получаем массив амплитуд спектра
-    amplitudes_ccf = ccf_spectr["|Xn|"]
-
-    max_amplitudes_ccf = amplitudes_ccf.max()
-    # Находим индекс максимальной амплитуды
-    max_amplitude_index = ccf_spectr["|Xn|"].idxmax()
-    # Получаем значение частоты для максимальной амплитуды
-    max_frequency_ccf = ccf_spectr["f"].iloc[max_amplitude_index]
+    # Частота и значение максимальной амплитуды спектра
+    max_frequency_ccf, max_amplitudes_ccf = ccf_spectr.peak()
 
     max_frequency = np.mean([max_frequency_acf, max_frequency_ccf])
 
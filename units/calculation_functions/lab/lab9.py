@@ -6,30 +6,30 @@ import numpy as np
 
 
 
-def read_image_from_dat(file_path: str, width: int, height: int) -> np.ndarray:
+def read_image_from_dat(file_path: str, width: int = None, height: int = None) -> np.ndarray:
     """
     Функция для чтения изображения из файла формата .dat.
 
     Args:
         file_path (str): Путь к файлу .dat.
-        width (int): Ширина изображения.
-        height (int): Высота изображения.
+        width (int): Ширина изображения (None или 0 - из имени файла).
+        height (int): Высота изображения (None или 0 - из имени файла).
 
     Returns:
-        image (np.ndarray): Считанное изображение в виде массива numpy.
+        image (np.ndarray): Изображение, отображенное в память (только для чтения).
     """
-    try:
-        # Считываем данные из файла .dat как одномерный массив float32
-        image_data = np.fromfile(file_path, dtype=np.float32)
-        # Проверяем, что количество считанных данных соответствует размерам изображения
-        assert len(image_data) == width * height, "Неверные размеры изображения"
-        # Преобразуем одномерный массив в двумерный массив, представляющий изображение
-        image = np.reshape(image_data, (height, width))
-
-        return image
-    except Exception as e:
-        print(f"Ошибка при чтении изображения: {e}")
-        return None
+    # Файл читается через кэш декодированных файлов, заданный размер - представление тех же данных
+    image = read_file(file_path)
+    if width and height:
+        if width * height != image.size:
+            raise ValueError(
+                f"Размер {width}x{height} не соответствует количеству чисел в файле ({image.size})"
+            )
+        image = image.reshape(height, width)
+    # Одномерные данные (ядро без размера в имени) - одна строка
+    return image.reshape(1, -1) if image.ndim == 1 else image
+
+
 
 def inverse_filter_without_noise(
     image: np.ndarray, kernel: np.ndarray
@@ -120,8 +120,9 @@ def restore_blurred_image(
     
     if isinstance(image, File):
         image = read_image_from_dat(image.path, width_img, height_img)   
-    if isinstance(kernel_image, File):
-        kernel = read_image_from_dat(kernel_image.path, width_kernel, height_kernel)
+    kernel = kernel_image
+    if isinstance(kernel, File):
+        kernel = read_image_from_dat(kernel.path, width_kernel, height_kernel)
     
     if alpha == 0:
         restored_image = inverse_filter_without_noise(image, kernel)
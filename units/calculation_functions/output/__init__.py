@@ -1,2 +1,3 @@
 from .output import *
-from .write import *
\ No newline at end of file
+from .write import *
+from .sink import OutputSink
\ No newline at end of file
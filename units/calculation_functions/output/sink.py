@@ -0,0 +1,93 @@
+from .write import EncoderSettings, DEFAULT_ENCODER_SETTINGS
+
+from typing import Any, Callable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future
+from threading import BoundedSemaphore, Condition
+
+
+
+class OutputSink:
+    """
+    Фоновая запись результатов в файлы (очередь записи ограниченного размера)
+
+    submit ставит запись в очередь и сразу возвращает Future, поэтому вычисления продолжаются,
+    пока данные пишутся на диск. Если в очереди max_pending записей, submit ждет освобождения
+    места: объем данных, ожидающих записи, ограничен.
+    Данные не копируются: результаты узлов доступны только для чтения и не изменяются после записи
+    в очередь. flush ждет завершения всех поставленных записей
+
+    workers - количество потоков записи
+    max_pending - максимальное количество записей в очереди (включая выполняемые)
+    settings - параметры кодирования изображений
+    """
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 8,
+        settings: EncoderSettings = DEFAULT_ENCODER_SETTINGS
+    ):
+        self.settings = settings
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="output_sink")
+        self.slots = BoundedSemaphore(max_pending)
+        self.condition = Condition()
+        self.pending_count = 0
+        self.failures: List[Tuple[Any, BaseException]] = []
+
+
+    def submit(self, writer: Callable, data: Any, folder_path: str, file_name: str, tag: Any = None) -> Future:
+        '''
+        Ставит в очередь запись writer(data, folder_path, file_name, settings=...).
+        Future возвращает путь к файлу; ошибка записи сохраняется вместе с tag (например, путем входного файла)
+        '''
+        self.slots.acquire()
+        with self.condition:
+            self.pending_count += 1
+        try:
+            future = self.executor.submit(writer, data, folder_path, file_name, settings=self.settings)
+        except BaseException:
+            self._on_done(tag, None)
+            raise
+        future.add_done_callback(lambda future: self._on_done(tag, future))
+        return future
+
+
+    def _on_done(self, tag: Any, future: Future) -> None:
+        '''
+        Освобождает место в очереди и запоминает ошибку записи
+        '''
+        error = future.exception() if future is not None else None
+        with self.condition:
+            if error is not None:
+                self.failures.append((tag, error))
+            self.pending_count -= 1
+            self.condition.notify_all()
+        self.slots.release()
+
+
+    def flush(self) -> List[Tuple[Any, BaseException]]:
+        '''
+        Ждет завершения всех поставленных записей (барьер).
+        Возвращает ошибки записей, завершившихся после предыдущего вызова flush
+        '''
+        with self.condition:
+            self.condition.wait_for(lambda: self.pending_count == 0)
+            failures, self.failures = self.failures, []
+        return failures
+
+
+    def close(self) -> List[Tuple[Any, BaseException]]:
+        '''
+        Дожидается записей и останавливает потоки записи
+        '''
+        failures = self.flush()
+        self.executor.shutdown()
+        return failures
+
+
+    def __enter__(self) -> "OutputSink":
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
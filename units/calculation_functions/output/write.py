@@ -1,9 +1,40 @@
+from dataclasses import dataclass
 import os
+
 import cv2
 import numpy as np
 
 
 
+# Количество элементов, преобразуемых и записываемых за один шаг
+WRITE_CHUNK_SIZE = 1 << 20
+
+
+
+@dataclass(frozen=True)
+class EncoderSettings:
+    '''
+    Параметры кодирования изображений
+
+    jpeg_quality - качество JPEG (0..100)
+    png_compression - уровень сжатия PNG (0..9)
+    '''
+
+    jpeg_quality: int = 95
+    png_compression: int = 3
+
+    def __post_init__(self):
+        if not 0 <= self.jpeg_quality <= 100:
+            raise ValueError(f"Качество JPEG должно быть в диапазоне 0..100, а не {self.jpeg_quality}")
+        if not 0 <= self.png_compression <= 9:
+            raise ValueError(f"Уровень сжатия PNG должен быть в диапазоне 0..9, а не {self.png_compression}")
+
+
+
+DEFAULT_ENCODER_SETTINGS = EncoderSettings()
+
+
+
 def get_file_path(folder_path, file_name, extension, prefix=None):
     """
     Возвращает путь к файлу с учетом его названия и расширения.
@@ -16,41 +47,88 @@ def get_file_path(folder_path, file_name, extension, prefix=None):
 
 
 
-def write_to_jpg_file(image, folder_path, file_name='image.jpg', prefix=None):
+def write_array(file, data, dtype):
+    """
+    Записывает массив в открытый файл с типом элементов dtype (в порядке строк, как C-массив).
+    Преобразование (в том числе перестановка байт) выполняется частями по WRITE_CHUNK_SIZE элементов,
+    в том числе для несмежных массивов (np.rot90, срезы объема), поэтому полноразмерная копия
+    данных не создается
+    """
+    data = np.asarray(data)
+    dtype = np.dtype(dtype)
+    if data.dtype == dtype and data.flags.c_contiguous:
+        data.tofile(file)
+        return
+    chunks = np.nditer(
+        data,
+        flags=['external_loop', 'buffered', 'zerosize_ok'],
+        op_dtypes=[dtype],
+        casting='unsafe',
+        order='C',
+        buffersize=WRITE_CHUNK_SIZE,
+    )
+    for chunk in chunks:
+        chunk.tofile(file)
+
+
+
+def write_image(output_path, image, params):
+    """
+    Кодирует изображение в файл средствами OpenCV (формат - по расширению output_path).
+    Данные с неродным порядком байт (например, XCR) перед кодированием приводятся к родному
+    """
+    image = np.asarray(image)
+    if not image.dtype.isnative:
+        image = image.astype(image.dtype.newbyteorder('='))
+    if not cv2.imwrite(output_path, image, params):
+        raise ValueError(f"Не удалось записать изображение в файл '{output_path}'")
+
+
+
+def write_to_jpg_file(image, folder_path, file_name='image.jpg', prefix=None, settings=DEFAULT_ENCODER_SETTINGS):
     """
     Сохраняет изображение по указанному пути вывода
     """
     output_path = get_file_path(folder_path, file_name, '.jpg', prefix)
-    cv2.imwrite(output_path, image)
+    write_image(output_path, image, [cv2.IMWRITE_JPEG_QUALITY, settings.jpeg_quality])
+
+    return output_path
+
+
+
+def write_to_png_file(image, folder_path, file_name='image.png', prefix=None, settings=DEFAULT_ENCODER_SETTINGS):
+    """
+    Сохраняет изображение в формате PNG (без потерь, 8 или 16 бит)
+    """
+    output_path = get_file_path(folder_path, file_name, '.png', prefix)
+    write_image(output_path, image, [cv2.IMWRITE_PNG_COMPRESSION, settings.png_compression])
 
     return output_path
 
 
 
-def write_to_bin_file(data, folder_path, file_name='image.bin', prefix=None):
+def write_to_bin_file(data, folder_path, file_name='image.bin', prefix=None, settings=DEFAULT_ENCODER_SETTINGS):
     """
     Записывает данные в бинарный файл с заданным именем в указанной папке.
     """
     file_path = get_file_path(folder_path, file_name, ".bin", prefix) 
-    data.astype(np.uint8).tofile(file_path) 
+    with open(file_path, 'wb') as file:
+        write_array(file, data, np.uint8)
     return file_path
 
 
 
-def write_to_xcr_file(data, folder_path, file_name='image', prefix=None):
+def write_to_xcr_file(data, folder_path, file_name='image', prefix=None, settings=DEFAULT_ENCODER_SETTINGS):
     """
     Записывает данные в файл с структурой .xcr.
     """
     file_path = get_file_path(folder_path, file_name, '.xcr', prefix)
 
-    # Преобразуем данные обратно в байты (переставляя младший и старший байты)
-    data = ((data & 0xFF) << 8) | (data >> 8)
-
     # Записываем данные в файл с учетом формата .xcr
     with open(file_path, 'w+b') as file:
         # Пропуск заголовка (2048 байт)
         file.seek(2048)
-        # Запись данных
-        data.astype(np.uint16).tofile(file)
+        # Запись данных (старший байт впереди, перестановка байт - частями)
+        write_array(file, data, '>u2')
 
-    return file_path
\ No newline at end of file
+    return file_path
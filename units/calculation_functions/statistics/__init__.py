@@ -1,2 +1,4 @@
 from .histogram import *
-from .analysis import *
\ No newline at end of file
+from .analysis import *
+from .spectrogram import *
+from .signal import *
\ No newline at end of file
@@ -0,0 +1,156 @@
+from ..calculation_functions_typing import *
+from ...data_types import File
+from ..input.read import read_file
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+
+def to_signal(data, dt: float = 1) -> Signal:
+    """
+    Возвращает сигнал из массива (отсчеты через dt) или сам сигнал
+    """
+    if isinstance(data, Signal):
+        return data
+    values = np.asarray(data).reshape(-1)
+    return Signal(values, np.arange(len(values)) * dt, "Время")
+
+
+
+def sampling_step(signal: Signal) -> float:
+    """
+    Шаг дискретизации сигнала по его отсчетам x (1, если отсчет один)
+    """
+    if len(signal.x) < 2:
+        return 1
+    return float(signal.x[1] - signal.x[0])
+
+
+
+def fourier_spectrum(data, dt: float = None) -> Signal:
+    """
+    Амплитудный спектр Фурье |Xn| на частотах от 0 до частоты Найквиста 1 / (2 * dt)
+    (первая половина отсчетов преобразования).
+    Если dt не указан, шаг берется из отсчетов сигнала (для массива - 1)
+    """
+    signal = to_signal(data)
+    if dt is None:
+        dt = sampling_step(signal)
+    values = signal.values
+    n = len(values) // 2
+    amplitudes = np.abs(np.fft.fft(values)[:n])
+    frequencies = np.arange(n) * (1 / (2 * dt) / n) if n else np.zeros(0)
+    return Signal(amplitudes, frequencies, "Частота", "Амплитуда")
+
+
+
+def derivative(data) -> Signal:
+    """
+    Производная сигнала (центральные разности, на краях - односторонние)
+    """
+    signal = to_signal(data)
+    return Signal(np.gradient(signal.values), signal.x, signal.x_label, "Производная")
+
+
+
+def autocorrelation(data) -> Signal:
+    """
+    Автокорреляционная функция (нормированная на дисперсию) для задержек 0..n-1.
+    Последний отсчет сигнала в произведениях не участвует (как в исходной реализации лабораторной 6)
+    """
+    values = to_signal(data).values
+    n = len(values)
+    centered = values - values.mean()
+    denominator = np.sum(centered ** 2)
+    head = centered[:n - 1]
+    ac_values = np.zeros(n)
+    if n > 1:
+        # Корреляция с задержками 0..n-2 за один вызов вместо цикла по задержкам
+        ac_values[:n - 1] = np.correlate(head, head, mode="full")[n - 2:]
+    return Signal(ac_values / denominator, np.arange(n), "Задержка", "Автокорреляция")
+
+
+
+def cross_correlation(datax, datay) -> Signal:
+    """
+    Взаимная корреляционная функция двух сигналов одинаковой длины для задержек 0..n-1
+    """
+    x = to_signal(datax).values
+    y = to_signal(datay).values
+    if len(x) != len(y):
+        raise ValueError("Длины входных данных не совпадают")
+    n = len(x)
+    ccf_values = np.correlate(x - x.mean(), y - y.mean(), mode="full")[:n][::-1] / n
+    return Signal(ccf_values, np.arange(n), "Задержка", "Кросскорреляция")
+
+
+
+def plot_signal(signal: Signal, title: str = "", color: str = "blue", skip: int = 0):
+    """
+    Строит график сигнала (skip - количество пропускаемых первых отсчетов)
+    """
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.plot(signal.x[skip:], signal.values[skip:].real, color=color, linewidth=2)
+    ax.set_xlabel(signal.x_label)
+    ax.set_ylabel(signal.y_label)
+    ax.set_title(title)
+    ax.grid(True)
+    return fig
+
+
+
+def open_signal(signal_file, dt=1):
+    """
+    Открывает одномерный сигнал из файла .dat (отсчеты через dt)
+    """
+    if signal_file is None:
+        return {"signal": None}
+    if isinstance(signal_file, File):
+        signal_file = read_file(signal_file.path)
+
+    return {
+        "signal": NodeResult(to_signal(signal_file, dt), ResultType.SIGNAL),
+    }
+
+
+
+def signal_spectrum(signal):
+    """
+    Амплитудный спектр Фурье сигнала и частота максимальной амплитуды
+    (без нулевой частоты: ее амплитуда - сумма отсчетов, а не колебание).
+    Шаг дискретизации берется из сигнала (задается в узле "Открыть сигнал")
+    """
+    if signal is None:
+        return {"spectrum": None}
+    if isinstance(signal, File):
+        signal = read_file(signal.path)
+
+    spectrum = fourier_spectrum(signal)
+    peak_frequency, peak_amplitude = spectrum.peak(start=1) if len(spectrum) > 1 else (0, 0)
+
+    return {
+        "spectrum": NodeResult(spectrum, ResultType.SIGNAL),
+        "peak": NodeResult(
+            f"Максимальная амплитуда {peak_amplitude:.4g} на частоте {peak_frequency:.4g}",
+            ResultType.STR_VALUE
+        ),
+    }
+
+
+
+def signal_autocorrelation(signal, is_derivative=False):
+    """
+    Автокорреляционная функция сигнала (или его производной)
+    """
+    if signal is None:
+        return {"autocorrelation": None}
+    if isinstance(signal, File):
+        signal = read_file(signal.path)
+
+    if is_derivative:
+        signal = derivative(signal)
+
+    return {
+        "autocorrelation": NodeResult(autocorrelation(signal), ResultType.SIGNAL),
+    }
@@ -0,0 +1,86 @@
+from ..calculation_functions_typing import *
+from ...data_types import File, AudioStream
+from ..input.read import read_file
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+
+# Количество окон, обрабатываемых за один блок чтения
+FRAMES_PER_BLOCK = 256
+
+
+
+def compute_spectrogram(
+    audio: AudioStream,
+    window_size: int = 1024,
+    hop_size: int = 256,
+    max_columns: int = 2048,
+    channel: int = None
+) -> np.ndarray:
+    """
+    Вычисляет спектрограмму мощности (частоты x время) кратковременным преобразованием Фурье.
+    Запись читается блоками по FRAMES_PER_BLOCK окон с перекрытием window_size - hop_size отсчетов,
+    соседние окна по времени усредняются, чтобы в спектрограмме было не больше max_columns столбцов.
+    Объем памяти не зависит от длительности записи
+    """
+    if not 0 < hop_size <= window_size:
+        raise ValueError(f"Шаг окна {hop_size} должен быть в диапазоне 1..{window_size}")
+
+    frames_count = max(1 + (audio.frames - window_size) // hop_size, 0)
+    columns = max(min(frames_count, max_columns), 1)
+    power_sum = np.zeros((window_size // 2 + 1, columns), dtype=np.float64)
+    power_count = np.zeros(columns, dtype=np.int64)
+    window = np.hanning(window_size).astype(np.float32)
+
+    block_frames = window_size + hop_size * (FRAMES_PER_BLOCK - 1)
+    overlap = window_size - hop_size
+    for start, block in audio.iter_blocks(block_frames, overlap, channel):
+        if len(block) < window_size:
+            break
+        windows = np.lib.stride_tricks.sliding_window_view(block, window_size)[::hop_size]
+        power = np.abs(np.fft.rfft(windows * window, axis=1)) ** 2
+
+        # Номера окон в записи и столбцы спектрограммы, в которые они попадают
+        frame_numbers = start // hop_size + np.arange(len(windows))
+        frame_columns = np.minimum(frame_numbers * columns // max(frames_count, 1), columns - 1)
+        # Номера столбцов не убывают: суммируем подряд идущие окна одного столбца
+        block_columns, first_indexes, counts = np.unique(frame_columns, return_index=True, return_counts=True)
+        power_sum[:, block_columns] += np.add.reduceat(power, first_indexes, axis=0).T
+        power_count[block_columns] += counts
+
+    return power_sum / np.maximum(power_count, 1)
+
+
+
+def plot_spectrogram(audio, window_size=1024, hop_size=256, max_columns=2048):
+    """
+    Строит спектрограмму звукового файла (обрабатывается блоками, без загрузки записи целиком)
+    """
+    if audio is None:
+        return {"spectrogram": None}
+    if isinstance(audio, File):
+        audio = read_file(audio.path)
+
+    power = compute_spectrogram(audio, int(window_size), int(hop_size), int(max_columns))
+    power_db = 10 * np.log10(power + 1e-12)
+
+    # Изображение: низкие частоты внизу, 0..255 в диапазоне 80 дБ от максимума
+    top_db = power_db.max()
+    image = np.clip((power_db - (top_db - 80)) / 80 * 255, 0, 255).astype(np.uint8)[::-1]
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.imshow(
+        power_db, origin="lower", aspect="auto", cmap="magma",
+        vmin=top_db - 80, vmax=top_db,
+        extent=[0, audio.duration, 0, audio.sample_rate / 2]
+    )
+    ax.set_xlabel("Время (с)")
+    ax.set_ylabel("Частота (Гц)")
+    ax.set_title(f"Спектрограмма: {audio}")
+
+    return {
+        "spectrogram": NodeResult(image, ResultType.IMAGE_CV2),
+        "spectrogram_fig": NodeResult(fig, ResultType.MATPLOTLIB_FIG),
+    }
@@ -2,12 +2,25 @@ from .folder import Folder
 from ..node import NodeConfig
 from ..parameters import *
 from ..calculation_functions import *
+from ..data_types import (
+    PortType, PortKind, IMAGE_PORT, SPECTRUM_PORT, SCALAR_PORT, TEXT_PORT, FIGURE_PORT, FILE_PORT, AUDIO_PORT, SIGNAL_PORT
+)
 
 from typing import List
+import os
+
 from flet import icons, colors
 
 
 
+# Файл по умолчанию тестового узла (из папки DATA проекта; если его нет - файл не выбран)
+TEST_FILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "DATA", "jpg", "grace.jpg"
+)
+
+
+
 class NodeLibrary:
     """
     Библиотека нод с конфигурациями
@@ -64,7 +77,7 @@ class NodeLibrary:
                         FilePickerParamConfig(key="file_1", name="File 1"),
                         FilePickerParamConfig(
                             key="file_2", name="File 2",
-                            default_value = File('D:\\POLITEH\\DATA_ANALYSIS_APP_V2\\DATA\\jpg\\grace.jpg')
+                            default_value = File(TEST_FILE_PATH) if os.path.exists(TEST_FILE_PATH) else None
                         ),
 
                         DropdownValueParamConfig(
@@ -104,6 +117,8 @@ class NodeLibrary:
                     parameters = [
                         OutParamConfig(
                             key = "image", name = "Изображение",
+                            # Тип элементов и размерность зависят от формата выбранного файла
+                            port_type = IMAGE_PORT,
                             connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                         ),
 
@@ -111,6 +126,62 @@ class NodeLibrary:
                     ]
                 ),
 
+                NodeConfig(
+                    key = "volume_slice",
+                    name = "Срез объема",
+                    icon = icons.LAYERS,
+                    color = colors.BLACK,
+                    width = 300,
+                    function = volume_slice,
+                    parameters = [
+                        OutParamConfig(
+                            key = "slice", name = "Срез",
+                            port_type = PortType(PortKind.IMAGE, dtypes = ("uint8", "int16"), channels = (1,)),
+                            connect_point_color=colors.DEEP_PURPLE_ACCENT_700
+                        ),
+
+                        FilePickerParamConfig(
+                            key="volume_file", name="Файл", default_value = None,
+                            allowed_extensions=["bin"], port_type = FILE_PORT
+                        ),
+                        DropdownValueParamConfig(
+                            key="axis", name="Ось",
+                            default_value = "z",
+                            options = [
+                                DropdownOptionConfig(key="z", text="Z (срезы файла)"),
+                                DropdownOptionConfig(key="y", text="Y (строки)"),
+                                DropdownOptionConfig(key="x", text="X (столбцы)"),
+                            ]
+                        ),
+                        SingleValueParamConfig(
+                            key="index", name="Номер среза",
+                            default_value = 0, min_value = 0, decimal_accuracy = 0
+                        ),
+                        BoolValueParamConfig(key="is_normalize", name="Нормализовать", default_value = True),
+                    ]
+                ),
+
+                NodeConfig(
+                    key = "open_audio",
+                    name = "Открыть звук",
+                    icon = icons.AUDIO_FILE,
+                    color = colors.BLACK,
+                    width = 300,
+                    function = open_audio,
+                    parameters = [
+                        OutParamConfig(
+                            key = "audio", name = "Звук",
+                            port_type = AUDIO_PORT,
+                            connect_point_color=colors.ORANGE_ACCENT_700
+                        ),
+
+                        FilePickerParamConfig(
+                            key="audio_file", name="Файл", default_value = None,
+                            allowed_extensions=["wav"], port_type = FILE_PORT
+                        ),
+                    ]
+                ),
+
                 NodeConfig(
                     key = "image_library",
                     name = "Библиотека изображений",
@@ -121,6 +192,7 @@ class NodeLibrary:
                     parameters = [
                         OutParamConfig(
                             key = "image", name = "Image",
+                            port_type = IMAGE_PORT,
                             connect_point_color = colors.DEEP_PURPLE_ACCENT_700
                         ),
 
@@ -141,8 +213,9 @@ class NodeLibrary:
                     icon = icons.CASINO,
                     color = colors.BLUE_700,
                     function = random_value,
+                    is_cacheable = False,
                     parameters = [
-                        OutParamConfig(key = "value", name = "Value", connect_point_color = colors.BLUE_ACCENT_200),
+                        OutParamConfig(key = "value", name = "Value", connect_point_color = colors.BLUE_ACCENT_200, port_type = SCALAR_PORT),
 
                         SingleValueParamConfig(key = "min_value", name = "Min"),
                         SingleValueParamConfig(key = "max_value", name = "Max"),
@@ -161,7 +234,7 @@ class NodeLibrary:
                     color = colors.BLUE_700,
                     function = add_two_numbers,
                     parameters = [
-                        OutParamConfig(key = "sum", name = "Sum", connect_point_color = colors.BLUE_ACCENT_200),
+                        OutParamConfig(key = "sum", name = "Sum", connect_point_color = colors.BLUE_ACCENT_200, port_type = SCALAR_PORT),
 
                         SingleValueParamConfig(key = "a", name = "A"),
                         SingleValueParamConfig(key = "b", name = "B"),
@@ -170,6 +243,131 @@ class NodeLibrary:
             ]
         ),
 
+        Folder(
+            name = "Звук",
+            icon = icons.GRAPHIC_EQ,
+            color = colors.ORANGE_700,
+            obj_list = [
+                NodeConfig(
+                    key = "plot_spectrogram",
+                    name = "Спектрограмма",
+                    icon = icons.GRAPHIC_EQ,
+                    color = colors.ORANGE_700,
+                    width = 300,
+                    function = plot_spectrogram,
+                    parameters = [
+                        OutParamConfig(
+                            key = "spectrogram", name = "Спектрограмма",
+                            port_type = PortType(PortKind.IMAGE, dtypes = ("uint8",), channels = (1,)),
+                            connect_point_color=colors.DEEP_PURPLE_ACCENT_700
+                        ),
+                        OutParamConfig(
+                            key = "spectrogram_fig", name = "График спектрограммы",
+                            port_type = FIGURE_PORT,
+                            connect_point_color=colors.DEEP_PURPLE_ACCENT_700
+                        ),
+
+                        FilePickerParamConfig(
+                            key="audio", name="Звук", default_value = None,
+                            allowed_extensions=["wav"], port_type = AUDIO_PORT
+                        ),
+                        SingleValueParamConfig(
+                            key="window_size", name="Размер окна",
+                            default_value = 1024, min_value = 16, decimal_accuracy = 0
+                        ),
+                        SingleValueParamConfig(
+                            key="hop_size", name="Шаг окна",
+                            default_value = 256, min_value = 1, decimal_accuracy = 0
+                        ),
+                        SingleValueParamConfig(
+                            key="max_columns", name="Макс. столбцов",
+                            default_value = 2048, min_value = 1, decimal_accuracy = 0
+                        ),
+                    ]
+                ),
+            ]
+        ),
+
+        Folder(
+            name = "Сигналы",
+            icon = icons.SHOW_CHART,
+            color = colors.CYAN_700,
+            obj_list = [
+                NodeConfig(
+                    key = "open_signal",
+                    name = "Открыть сигнал",
+                    icon = icons.SHOW_CHART,
+                    color = colors.CYAN_700,
+                    width = 300,
+                    function = open_signal,
+                    parameters = [
+                        OutParamConfig(
+                            key = "signal", name = "Сигнал",
+                            port_type = SIGNAL_PORT,
+                            connect_point_color=colors.CYAN_ACCENT_400
+                        ),
+
+                        FilePickerParamConfig(
+                            key="signal_file", name="Файл", default_value = None,
+                            allowed_extensions=["dat"], port_type = FILE_PORT
+                        ),
+                        SingleValueParamConfig(
+                            key="dt", name="Шаг дискретизации",
+                            default_value = 1, min_value = 0.000001, value_step = 0.001
+                        ),
+                    ]
+                ),
+
+                NodeConfig(
+                    key = "signal_spectrum",
+                    name = "Спектр сигнала",
+                    icon = icons.SSID_CHART,
+                    color = colors.CYAN_700,
+                    width = 300,
+                    function = signal_spectrum,
+                    parameters = [
+                        OutParamConfig(
+                            key = "spectrum", name = "Спектр",
+                            port_type = SIGNAL_PORT,
+                            connect_point_color=colors.CYAN_ACCENT_400
+                        ),
+                        OutParamConfig(
+                            key = "peak", name = "Максимум",
+                            port_type = TEXT_PORT,
+                            connect_point_color=colors.BLUE_ACCENT_200
+                        ),
+
+                        FilePickerParamConfig(
+                            key="signal", name="Сигнал", default_value = None,
+                            allowed_extensions=["dat"], port_type = SIGNAL_PORT
+                        ),
+                    ]
+                ),
+
+                NodeConfig(
+                    key = "signal_autocorrelation",
+                    name = "Автокорреляция сигнала",
+                    icon = icons.MULTILINE_CHART,
+                    color = colors.CYAN_700,
+                    width = 300,
+                    function = signal_autocorrelation,
+                    parameters = [
+                        OutParamConfig(
+                            key = "autocorrelation", name = "АКФ",
+                            port_type = SIGNAL_PORT,
+                            connect_point_color=colors.CYAN_ACCENT_400
+                        ),
+
+                        FilePickerParamConfig(
+                            key="signal", name="Сигнал", default_value = None,
+                            allowed_extensions=["dat"], port_type = SIGNAL_PORT
+                        ),
+                        BoolValueParamConfig(key="is_derivative", name="Производная", default_value = False),
+                    ]
+                ),
+            ]
+        ),
+
         Folder(
             name = "Лабораторные",
             icon = icons.ASSIGNMENT_OUTLINED,
@@ -188,6 +386,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="shifted_image", name="Shifted image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 
@@ -205,6 +404,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="multiply_image", name="Multiply_image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -222,6 +422,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="shifted_image", name="Shifted image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -254,6 +455,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="grayscale_image", name="Grayscale image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -274,6 +476,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="histogram_fig", name="Histogram",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color = colors.PINK_ACCENT_400
                                 ),
 
@@ -297,6 +500,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="Resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -315,9 +519,11 @@ class NodeLibrary:
                             icon = icons.IMAGE_ASPECT_RATIO,
                             color = colors.YELLOW,
                             function = resize_nearest_neighbor_manual,
+                            run_in_process = True,
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="Resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -338,6 +544,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="Resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -355,9 +562,11 @@ class NodeLibrary:
                             icon = icons.PHOTO_SIZE_SELECT_LARGE,
                             color = colors.YELLOW,
                             function = resize_bilinear_interpolation_manual,
+                            run_in_process = True,
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="Resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -378,6 +587,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="rotate_image", name="Rotated image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -404,6 +614,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="rotate_image", name="Rotated image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -421,9 +632,11 @@ class NodeLibrary:
                             icon = icons.AUTORENEW,
                             color = colors.YELLOW,
                             function = rotate_image_manual,
+                            run_in_process = True,
                             parameters = [
                                 OutParamConfig(
                                     key="rotate_image", name="Rotated image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -453,6 +666,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="negative_image", name="Negative image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -469,6 +683,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="gamma_image", name="Gamma image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -491,6 +706,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="logarithmic_image", name="Logarithmic image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -518,18 +734,24 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="equalization_image", name="Equalization image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="original_hist", name="Original histogram",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400,
                                 ),
                                 OutParamConfig(
                                     key="equalized_hist", name="Equalized histogram",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400,
                                 ),
                                 
-                                FilePickerParamConfig(key="image", name="Фото"),
+                                FilePickerParamConfig(
+                                    key="image", name="Фото",
+                                    port_type = PortType(PortKind.IMAGE, dtypes = ("uint8",))
+                                ),
                             ]
                         ),
 
@@ -542,6 +764,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="histogram_fig", name="Гистограмма",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400
                                 ),
 
@@ -558,6 +781,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="difference_image", name="Difference image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -575,10 +799,14 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="optimal_image", name="Optimal image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
-                                FilePickerParamConfig(key="image", name="Фото"),
+                                FilePickerParamConfig(
+                                    key="image", name="Фото",
+                                    port_type = PortType(PortKind.IMAGE, dtypes = ("uint8",), channels = (3,))
+                                ),
                             ]
                         )
                     ]
@@ -598,18 +826,22 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="original_spectrum", name="Original spectrum",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400
                                 ),
                                 OutParamConfig(
                                     key="derivative_spectrum", name="Derivative spectrum",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400
                                 ),
                                 OutParamConfig(
                                     key="autocorrelation", name="Autocorrelation",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400
                                 ),
                                 OutParamConfig(
                                     key="crosscorrelation", name="Crosscorrelation",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.PINK_ACCENT_400
                                 ),
 
@@ -630,58 +862,72 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="rotate_image", name="rotate_image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="rotate_image_line_spectr", name="rotate_image_line_spectr",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="compute_derivative_plt", name="compute_derivative_plt",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="autocorrelation_plt", name="autocorrelation_plt",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="acf_spectr_plt", name="acf_spectr_plt",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="max_amplitude", name="max_amplitude",
+                                    port_type = TEXT_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
                                 OutParamConfig(
                                     key="max_frequency_acf", name="max_frequency_acf",
+                                    port_type = TEXT_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
                                 OutParamConfig(
                                     key="cross_correlation_fig", name="cross_correlation_fig",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="ccf_spectr_fig", name="ccf_spectr_fig",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.BLUE
                                 ),
                                 OutParamConfig(
                                     key="max_amplitudes_ccf", name="max_amplitudes_ccf",
+                                    port_type = TEXT_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
                                 OutParamConfig(
                                     key="max_frequency_ccf", name="max_frequency_ccf",
+                                    port_type = TEXT_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
                                 OutParamConfig(
                                     key="max_frequency", name="max_frequency",
+                                    port_type = TEXT_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
                                 OutParamConfig(
                                     key="normalized_filtered_image", name="normalized_filtered_image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="filtered_spectr_fig", name="filtered_spectr_fig",
+                                    port_type = FIGURE_PORT,
                                     connect_point_color=colors.GREEN
                                 ),
 
@@ -745,13 +991,16 @@ class NodeLibrary:
                             icon = icons.BLUR_ON,
                             color = colors.PINK,
                             function = add_random_noise,
+                            is_cacheable = False,
                             parameters = [
                                 OutParamConfig(
                                     key="noisy_image", name="Noisy image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="noise", name="Noise",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -773,13 +1022,16 @@ class NodeLibrary:
                             icon = icons.GRAIN,
                             color = colors.PINK,
                             function = add_impulse_noise,
+                            is_cacheable = False,
                             parameters = [
                                 OutParamConfig(
                                     key="noisy_image", name="Noisy image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="noise", name="Noise",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -798,17 +1050,21 @@ class NodeLibrary:
                             icon = icons.WAVES,
                             color = colors.PINK,
                             function = add_mixed_noise,
+                            is_cacheable = False,
                             parameters = [
                                 OutParamConfig(
                                     key="noisy_image", name="Noisy image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="random_noise", name="Random noise",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="impulse_noise", name="Impulse noise",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -837,6 +1093,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
 									key="anti_noisy_image", name="Anti noisy image",
+									port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -861,6 +1118,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="anti_noisy_image", name="Anti noisy image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -889,10 +1147,12 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="furier_image", name="Fourier image show",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="furier_image_value", name="Fourier image value",
+                                    port_type = SPECTRUM_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -909,10 +1169,11 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="inverse_furier_image", name="Inverse fourier image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
-                                FilePickerParamConfig(key="image", name="Фото"),
+                                FilePickerParamConfig(key="image", name="Фото", port_type = SPECTRUM_PORT),
                             ]
                         )
                     ]
@@ -932,31 +1193,29 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="restored_image", name="Restored image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
-                                FilePickerParamConfig(
-                                    key="image", name="Фото", allowed_extensions=["dat"]
-                                ),
+                                FilePickerParamConfig(key="image", name="Фото", allowed_extensions=["dat"]),
+                                # 0 - размер из имени файла (blur307x221D.dat)
                                 SingleValueParamConfig(
                                     key="width_img", name="width img",
-                                    decimal_accuracy=0, default_value = 307
+                                    decimal_accuracy=0, default_value = 0, min_value = 0
                                 ),
                                 SingleValueParamConfig(
                                     key="height_img", name="height img",
-                                    decimal_accuracy=0, default_value = 221
+                                    decimal_accuracy=0, default_value = 0, min_value = 0
                                 ),
 
-                                FilePickerParamConfig(
-                                    key="kernel_image", name="Kernel", allowed_extensions=["dat"]
-                                ),
+                                FilePickerParamConfig(key="kernel_image", name="Kernel", allowed_extensions=["dat"]),
                                 SingleValueParamConfig(
                                     key="width_kernel", name="width kernel",
-                                    decimal_accuracy=0, default_value = 76
+                                    decimal_accuracy=0, default_value = 0, min_value = 0
                                 ),
                                 SingleValueParamConfig(
                                     key="height_kernel", name="height kernel",
-                                    decimal_accuracy=0, default_value = 1
+                                    decimal_accuracy=0, default_value = 0, min_value = 0
                                 ),
 
                                 SingleValueParamConfig(
@@ -983,6 +1242,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1000,13 +1260,16 @@ class NodeLibrary:
                             icon = icons.HELP,
                             color = colors.AMBER,
                             function = fourier_resize_image2,
+                            run_in_process = True,
                             parameters = [
                                 OutParamConfig(
                                     key="resized_image", name="resized image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
                                 OutParamConfig(
                                     key="resized_image_spectrum", name="resized image spectrum",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1045,6 +1308,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="low_pass_img", name="Low pass img",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1065,6 +1329,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="high_pass_img", name="High pass img",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1085,6 +1350,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="filtered_image", name="Filtered img",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1130,6 +1396,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="thresholding_image", name="Thresholding image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1153,6 +1420,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="sharpened_image", name="Sharpened image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
@@ -1176,6 +1444,7 @@ class NodeLibrary:
                             parameters = [
                                 OutParamConfig(
                                     key="morphology_image", name="Morphology image",
+                                    port_type = IMAGE_PORT,
                                     connect_point_color=colors.DEEP_PURPLE_ACCENT_700
                                 ),
 
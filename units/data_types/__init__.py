@@ -1,3 +1,9 @@
 from .colors_enum import Color
 from .file import File
-from .parameter_connect_type import ParameterConnectType
\ No newline at end of file
+from .volume import Volume
+from .audio_stream import AudioStream
+from .parameter_connect_type import ParameterConnectType
+from .port_type import (
+    PortKind, PortType, ANY_PORT, IMAGE_PORT, GRAY_IMAGE_PORT, SPECTRUM_PORT,
+    SCALAR_PORT, TEXT_PORT, FIGURE_PORT, FILE_PORT, AUDIO_PORT, SIGNAL_PORT
+)
\ No newline at end of file
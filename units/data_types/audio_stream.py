@@ -0,0 +1,109 @@
+from typing import Iterator, Tuple
+import wave
+import os
+
+import numpy as np
+
+
+
+class AudioStream:
+    '''
+    Звуковой файл WAV, читаемый блоками
+
+    При открытии читается только заголовок: отсчеты загружаются блоками при обходе
+    (iter_blocks), поэтому объем памяти не зависит от длительности записи
+
+    path - путь к файлу
+    sample_rate - частота дискретизации (Гц)
+    channels - количество каналов
+    sample_width - размер отсчета (байт)
+    frames - количество отсчетов в канале
+    '''
+
+    def __init__(self, path: str):
+        self.path = path
+        with wave.open(path, "rb") as file:
+            self.sample_rate: int = file.getframerate()
+            self.channels: int = file.getnchannels()
+            self.sample_width: int = file.getsampwidth()
+            self.frames: int = file.getnframes()
+        if self.sample_width not in (1, 2, 3, 4):
+            raise ValueError(f"Размер отсчета {self.sample_width} байт не поддерживается")
+
+
+    @property
+    def duration(self) -> float:
+        '''
+        Длительность записи (сек)
+        '''
+        return self.frames / self.sample_rate
+
+
+    def decode(self, data: bytes, channel: int = None) -> np.ndarray:
+        '''
+        Преобразует байты отсчетов в массив float32 в диапазоне [-1, 1].
+        channel - номер канала (None - среднее по каналам)
+        '''
+        if self.sample_width == 1:
+            samples = (np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128) / 128
+        elif self.sample_width == 3:
+            # 24 бита: дополняем каждый отсчет младшим нулевым байтом до int32
+            raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            padded = np.zeros((len(raw), 4), dtype=np.uint8)
+            padded[:, 1:] = raw
+            samples = padded.view("<i4").reshape(-1).astype(np.float32) / 2 ** 31
+        else:
+            dtype = np.dtype(f"<i{self.sample_width}")
+            samples = np.frombuffer(data, dtype=dtype).astype(np.float32) / 2 ** (8 * self.sample_width - 1)
+
+        samples = samples.reshape(-1, self.channels)
+        if channel is None:
+            return samples.mean(axis=1)
+        if not 0 <= channel < self.channels:
+            raise IndexError(f"Канал {channel} вне диапазона 0..{self.channels - 1}")
+        return np.ascontiguousarray(samples[:, channel])
+
+
+    def iter_blocks(
+        self,
+        block_frames: int,
+        overlap: int = 0,
+        channel: int = None
+    ) -> Iterator[Tuple[int, np.ndarray]]:
+        '''
+        Возвращает блоки по block_frames отсчетов (последний может быть короче)
+        и номер первого отсчета каждого блока.
+        Соседние блоки перекрываются на overlap отсчетов
+        '''
+        if not 0 <= overlap < block_frames:
+            raise ValueError(f"Перекрытие {overlap} должно быть меньше размера блока {block_frames}")
+        step = block_frames - overlap
+        with wave.open(self.path, "rb") as file:
+            tail = np.zeros(0, dtype=np.float32)
+            start = 0
+            while True:
+                data = file.readframes(block_frames - len(tail))
+                block = np.concatenate((tail, self.decode(data, channel))) if len(tail) else self.decode(data, channel)
+                if len(block) <= len(tail) and start > 0:
+                    return
+                yield start, block
+                if len(block) < block_frames:
+                    return
+                tail = block[step:]
+                start += step
+
+
+    def read(self, start: int = 0, frames: int = None, channel: int = None) -> np.ndarray:
+        '''
+        Возвращает frames отсчетов, начиная с start (None - до конца файла)
+        '''
+        with wave.open(self.path, "rb") as file:
+            file.setpos(start)
+            return self.decode(file.readframes(self.frames - start if frames is None else frames), channel)
+
+
+    def __str__(self) -> str:
+        return (
+            f"{os.path.basename(self.path)} ({self.channels} кан., {self.sample_rate} Гц, "
+            + f"{self.duration:.2f} с)"
+        )
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from enum import Enum
+from typing import Tuple
+
+
+
+class PortKind(Enum):
+    '''
+    Вид данных точки подключения
+
+    ANY - любые данные
+    IMAGE - изображение (массив NumPy)
+    SPECTRUM - комплексный спектр (массив NumPy)
+    SCALAR - число
+    TEXT - строка
+    FIGURE - график (matplotlib, plotly)
+    FILE - файл
+    AUDIO - звуковой поток (AudioStream)
+    SIGNAL - одномерный сигнал или спектр (Signal)
+    '''
+
+    ANY = "any"
+    IMAGE = "image"
+    SPECTRUM = "spectrum"
+    SCALAR = "scalar"
+    TEXT = "text"
+    FIGURE = "figure"
+    FILE = "file"
+    AUDIO = "audio"
+    SIGNAL = "signal"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+
+# Виды данных, которые дополнительно принимает вход (функции изображений читают файл сами,
+# функции сигналов принимают любой массив, например данные .dat из узла "Открыть изображение")
+_ACCEPTED_KINDS = {
+    PortKind.IMAGE: (PortKind.IMAGE, PortKind.FILE),
+    PortKind.AUDIO: (PortKind.AUDIO, PortKind.FILE),
+    PortKind.SIGNAL: (PortKind.SIGNAL, PortKind.FILE, PortKind.IMAGE),
+}
+
+
+
+@dataclass(frozen=True)
+class PortType:
+    '''
+    Тип данных точки подключения (проверяется один раз при соединении параметров)
+
+    kind - вид данных
+    dtypes - типы элементов массива ("uint8", "uint16", ...; None - любые)
+    channels - количество каналов изображения (None - любое)
+    '''
+
+    kind: PortKind = PortKind.ANY
+    dtypes: Tuple[str, ...] = None
+    channels: Tuple[int, ...] = None
+
+    def accepts(self, source: "PortType") -> bool:
+        '''
+        Возвращает True, если вход этого типа может принять данные выхода source.
+        Типы элементов и количество каналов сравниваются, только если указаны у обоих
+        '''
+        if PortKind.ANY in (self.kind, source.kind):
+            return True
+        if source.kind not in _ACCEPTED_KINDS.get(self.kind, (self.kind,)):
+            return False
+        if self.dtypes is not None and source.dtypes is not None:
+            if not set(self.dtypes) & set(source.dtypes):
+                return False
+        if self.channels is not None and source.channels is not None:
+            if not set(self.channels) & set(source.channels):
+                return False
+        return True
+
+    def __str__(self) -> str:
+        details = []
+        if self.dtypes is not None:
+            details.append("/".join(self.dtypes))
+        if self.channels is not None:
+            details.append(f"каналов: {'/'.join(map(str, self.channels))}")
+        return f"{self.kind} ({', '.join(details)})" if details else str(self.kind)
+
+
+
+ANY_PORT = PortType()
+IMAGE_PORT = PortType(PortKind.IMAGE)
+GRAY_IMAGE_PORT = PortType(PortKind.IMAGE, channels=(1,))
+SPECTRUM_PORT = PortType(PortKind.SPECTRUM, dtypes=("complex64", "complex128"))
+SCALAR_PORT = PortType(PortKind.SCALAR)
+TEXT_PORT = PortType(PortKind.TEXT)
+FIGURE_PORT = PortType(PortKind.FIGURE)
+FILE_PORT = PortType(PortKind.FILE)
+AUDIO_PORT = PortType(PortKind.AUDIO)
+SIGNAL_PORT = PortType(PortKind.SIGNAL)
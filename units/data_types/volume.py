@@ -0,0 +1,101 @@
+from typing import Tuple
+import os
+import re
+
+import numpy as np
+
+
+
+class Volume:
+    '''
+    Объемные данные (набор срезов), отображенные в память из файла
+
+    Данные не читаются при открытии: срезы и части объема загружаются при обращении,
+    поэтому можно работать с файлами больше оперативной памяти
+
+    path - путь к файлу
+    shape - размер объема (срезы, строки, столбцы)
+    dtype - тип элементов
+    data - массив, отображенный в память (только для чтения)
+    '''
+
+    AXES = {"z": 0, "y": 1, "x": 2}
+
+    def __init__(self, path: str, shape: Tuple[int, int, int], dtype: str = "<i2", offset: int = 0):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.data: np.memmap = np.memmap(path, dtype=self.dtype, mode="r", offset=offset, shape=shape)
+        self.shape: Tuple[int, int, int] = self.data.shape
+
+
+    @staticmethod
+    def get_side_from_name(path: str) -> int | None:
+        '''
+        Возвращает размер среза, указанный в имени файла (например, brain-H_x512.bin - 512)
+        '''
+        match = re.search(r"_x(\d+)(?:\.\w+)?$", os.path.basename(path))
+        return int(match.group(1)) if match else None
+
+
+    @classmethod
+    def open(
+        cls,
+        path: str,
+        width: int = None,
+        height: int = None,
+        dtype: str = "<i2",
+        offset: int = 0
+    ) -> "Volume":
+        '''
+        Открывает файл без заголовка.
+        Если размер среза не указан, он берется из имени файла (квадратный срез),
+        количество срезов вычисляется по размеру файла
+        '''
+        dtype = np.dtype(dtype)
+        if width is None and height is None:
+            width = height = cls.get_side_from_name(path)
+        elif width is None or height is None:
+            width = height = width or height
+        if width is None:
+            raise ValueError(
+                f"Размер среза не указан и не найден в имени файла '{os.path.basename(path)}' "
+                + "(ожидается суффикс _x<размер>)"
+            )
+
+        slice_bytes = width * height * dtype.itemsize
+        data_bytes = os.path.getsize(path) - offset
+        if data_bytes < slice_bytes or data_bytes % slice_bytes:
+            raise ValueError(
+                f"Размер данных файла '{os.path.basename(path)}' ({data_bytes} байт) "
+                + f"не кратен размеру среза {width}x{height} ({dtype})"
+            )
+        return cls(path, (data_bytes // slice_bytes, height, width), dtype, offset)
+
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+
+    def get_slice(self, index: int, axis: str = "z") -> np.ndarray:
+        '''
+        Возвращает срез объема по оси axis (z - срезы файла, y - строки, x - столбцы).
+        Срез по оси z читается с диска без копирования остальных данных
+        '''
+        if axis not in self.AXES:
+            raise ValueError(f"Ось '{axis}' не поддерживается, доступны: {', '.join(self.AXES)}")
+        size = self.shape[self.AXES[axis]]
+        if not -size <= index < size:
+            raise IndexError(f"Номер среза {index} вне диапазона 0..{size - 1} (ось {axis})")
+        return np.asarray(np.take(self.data, index, axis=self.AXES[axis]))
+
+
+    def get_subvolume(self, z: slice = slice(None), y: slice = slice(None), x: slice = slice(None)) -> np.ndarray:
+        '''
+        Возвращает часть объема (представление данных на диске, читается при обращении)
+        '''
+        return np.asarray(self.data[z, y, x])
+
+
+    def __str__(self) -> str:
+        depth, height, width = self.shape
+        return f"{os.path.basename(self.path)} ({depth}x{height}x{width}, {self.dtype})"
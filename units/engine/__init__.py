@@ -0,0 +1,9 @@
+from .binding import get_signature_type_hints, is_valid_parameter, get_parameter_value, BindingPlan
+from .engine_node import EngineNode, EngineConnection
+from .graph_engine import GraphEngine
+from .scheduler import ThreadPoolScheduler
+from .graph_index import GraphIndex
+from .process_pool import ProcessPoolBackend, process_pool, call_node_function
+from .disk_cache import DiskCache, disk_cache
+from .graph_file import save_graph, load_graph
+from .batch import BatchRunner, BatchOutput, BatchReport
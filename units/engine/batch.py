@@ -0,0 +1,245 @@
+from .engine_node import EngineNode
+from .graph_engine import GraphEngine
+from .graph_file import load_graph
+from ..calculation_functions.input.read import read_file
+from ..calculation_functions.output.write import (
+    write_to_jpg_file, write_to_png_file, write_to_xcr_file, write_to_bin_file,
+    EncoderSettings, DEFAULT_ENCODER_SETTINGS
+)
+from ..calculation_functions.output.sink import OutputSink
+from ..data_types import File
+
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from collections import deque
+from threading import local
+from time import perf_counter
+import os
+
+
+
+OUTPUT_WRITERS: Dict[str, Callable] = {
+    "jpg": write_to_jpg_file,
+    "png": write_to_png_file,
+    "xcr": write_to_xcr_file,
+    "bin": write_to_bin_file,
+}
+
+
+
+@dataclass
+class BatchOutput:
+    '''
+    Выходной параметр графа, сохраняемый для каждого файла
+
+    node_name - имя узла в файле графа
+    key - выходной параметр узла
+    file_format - формат файла (jpg, png, xcr, bin)
+    '''
+
+    node_name: str
+    key: str
+    file_format: str = "jpg"
+
+    def __post_init__(self):
+        if self.file_format not in OUTPUT_WRITERS:
+            raise ValueError(
+                f"Формат '{self.file_format}' не поддерживается, "
+                + f"доступны: {', '.join(OUTPUT_WRITERS)}"
+            )
+
+
+
+@dataclass
+class BatchReport:
+    '''
+    Итоги пакетной обработки
+
+    files_count - количество обработанных файлов
+    written_paths - пути сохраненных файлов
+    errors - ошибки по путям входных файлов
+    elapsed_time - время обработки (сек)
+    '''
+
+    files_count: int = 0
+    written_paths: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed_time: float = 0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_count / self.elapsed_time if self.elapsed_time else 0
+
+    def __str__(self) -> str:
+        return (
+            f"Обработано файлов: {self.files_count} за {self.elapsed_time:.2f} с "
+            + f"({self.files_per_second:.2f} файлов/с), "
+            + f"сохранено: {len(self.written_paths)}, ошибок: {len(self.errors)}"
+        )
+
+
+
+class BatchRunner:
+    """
+    Пакетная обработка файлов одним графом
+
+    Для каждого файла значение входного параметра bind_key узла bind_node_name
+    заменяется файлом (или его декодированными данными), граф вычисляется,
+    а выходные параметры outputs сохраняются в папку out_dir.
+
+    Файлы обрабатываются в пуле из workers потоков (у каждого потока своя копия графа),
+    декодирование выполняется заранее, не более чем на read_ahead файлов вперед,
+    а результаты записываются в фоне (OutputSink, не более write_queue записей в очереди),
+    поэтому в памяти одновременно находится ограниченное число изображений,
+    а вычисления не ждут записи на диск
+
+    graph_path - путь к файлу графа (формат описан в graph_file.save_graph)
+    configs - конфигурации узлов (NodeLibrary.get_nodes_configs())
+    is_decode - передавать в граф декодированные данные (read_file), а не объект File
+    settings - параметры кодирования изображений
+    """
+
+    def __init__(
+        self,
+        graph_path: str,
+        configs: Iterable[Any],
+        bind_node_name: str,
+        bind_key: str,
+        outputs: List[BatchOutput],
+        out_dir: str,
+        workers: int = None,
+        read_ahead: int = None,
+        is_decode: bool = True,
+        write_queue: int = None,
+        settings: EncoderSettings = DEFAULT_ENCODER_SETTINGS,
+    ):
+        self.graph_path = graph_path
+        self.configs = list(configs)
+        self.bind_node_name = bind_node_name
+        self.bind_key = bind_key
+        self.outputs = outputs
+        self.out_dir = out_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.read_ahead = read_ahead or self.workers * 2
+        self.is_decode = is_decode
+        self.write_queue = write_queue or self.workers * 2
+        self.settings = settings
+        self.thread_data = local()
+
+        # Проверяем граф заранее, чтобы ошибки конфигурации не повторялись для каждого файла
+        _, nodes = load_graph(self.graph_path, self.configs)
+        for node_name in [bind_node_name] + [output.node_name for output in outputs]:
+            if node_name not in nodes:
+                raise KeyError(f"Узел '{node_name}' не найден в графе")
+        if bind_key not in nodes[bind_node_name].values:
+            raise KeyError(f"У узла '{bind_node_name}' нет входного параметра '{bind_key}'")
+        for output in outputs:
+            if output.key not in nodes[output.node_name].out_keys:
+                raise KeyError(f"У узла '{output.node_name}' нет выходного параметра '{output.key}'")
+
+
+    def get_graph(self) -> Tuple[GraphEngine, Dict[str, EngineNode]]:
+        '''
+        Возвращает копию графа текущего потока
+        '''
+        if not hasattr(self.thread_data, "graph"):
+            self.thread_data.graph = load_graph(self.graph_path, self.configs)
+        return self.thread_data.graph
+
+
+    def decode(self, path: str) -> Any:
+        '''
+        Читает входной файл
+        '''
+        file = File(path)
+        return read_file(file, is_lazy=True) if self.is_decode else file
+
+
+    def process(self, path: str, decoded: Future, sink: OutputSink) -> List[Future]:
+        '''
+        Вычисляет граф для одного файла и ставит выходные параметры в очередь записи.
+        Возвращает Future записей (результат - путь сохраненного файла)
+        '''
+        engine, nodes = self.get_graph()
+        engine.set_value(nodes[self.bind_node_name], self.bind_key, decoded.result())
+        engine.run(outputs=[nodes[output.node_name] for output in self.outputs])
+
+        file_name = os.path.splitext(os.path.basename(path))[0]
+        writes = []
+        for output in self.outputs:
+            data = engine.get_output(nodes[output.node_name], output.key)
+            if data is None:
+                raise ValueError(f"Выходной параметр '{output.node_name}.{output.key}' пуст")
+            output_name = (
+                file_name if len(self.outputs) == 1
+                else f"{file_name}_{output.node_name}_{output.key}"
+            )
+            writes.append(sink.submit(OUTPUT_WRITERS[output.file_format], data, self.out_dir, output_name, tag=path))
+        return writes
+
+
+    def run(self, paths: Iterable[str], on_file_done: Callable[[str, str], None] = None) -> BatchReport:
+        '''
+        Обрабатывает файлы paths.
+        on_file_done(path, error) вызывается после вычисления и записи каждого файла
+        (error - None при успехе)
+        '''
+        os.makedirs(self.out_dir, exist_ok=True)
+        report = BatchReport()
+        start_time = perf_counter()
+
+        paths = iter(paths)
+        decoded: deque = deque()
+        running: Dict[Future, str] = {}
+        # Записи, которые еще выполняются, и все записи каждого файла
+        writing: Dict[Future, str] = {}
+        file_writes: Dict[str, List[Future]] = {}
+
+        def read_ahead(decode_executor: ThreadPoolExecutor) -> None:
+            while len(decoded) < self.read_ahead:
+                path = next(paths, None)
+                if path is None:
+                    return
+                decoded.append((path, decode_executor.submit(self.decode, path)))
+
+        def finish(path: str, error: str = None) -> None:
+            for write in file_writes.pop(path, []):
+                if write.exception() is None:
+                    report.written_paths.append(write.result())
+                elif error is None:
+                    error = str(write.exception())
+            report.files_count += 1
+            if error is not None:
+                report.errors[path] = error
+            if on_file_done is not None:
+                on_file_done(path, error)
+
+        with ThreadPoolExecutor(self.read_ahead, thread_name_prefix="batch_decode") as decode_executor, \
+             ThreadPoolExecutor(self.workers, thread_name_prefix="batch_worker") as run_executor, \
+             OutputSink(self.workers, self.write_queue, self.settings) as sink:
+            read_ahead(decode_executor)
+            while decoded or running or writing:
+                while decoded and len(running) < self.workers:
+                    path, decoded_future = decoded.popleft()
+                    running[run_executor.submit(self.process, path, decoded_future, sink)] = path
+                    read_ahead(decode_executor)
+
+                done, _ = wait(list(running) + list(writing), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in running:
+                        path = running.pop(future)
+                        try:
+                            writes = future.result()
+                        except Exception as e:
+                            finish(path, str(e))
+                            continue
+                        file_writes[path] = writes
+                        writing.update((write, path) for write in writes)
+                    else:
+                        path = writing.pop(future)
+                    if not any(write in writing for write in file_writes[path]):
+                        finish(path)
+
+        report.elapsed_time = perf_counter() - start_time
+        return report
@@ -0,0 +1,85 @@
+from ..calculation_functions import NodeResult, as_native_byte_order
+
+from typing import Any, Callable, Dict, List, get_type_hints
+from inspect import signature
+
+
+
+def get_signature_type_hints(function: Callable) -> Dict[str, Any]:
+    '''
+    Возвращает типы параметров функции
+    '''
+    if function is None:
+        return {}
+    type_hints = get_type_hints(function)
+    type_hints.pop('return', None)
+    return {
+        name: type_hints.get(name)
+        for name in signature(function).parameters
+    }
+
+
+
+def is_valid_parameter(function_signature: Dict[str, Any], name: str, value: Any) -> bool:
+    '''
+    Возвращает True, если параметр имеет допустимый тип
+    '''
+    if (
+        (
+            function_signature[name] in [bool, int, str]
+            and not type(value) == function_signature[name]
+        ) or (
+            function_signature[name] in [float]
+            and not isinstance(value, (float, int))
+        )
+    ):
+        raise TypeError(f"Тип параметра {name} должен быть типа {function_signature[name]}, а не {type(value)}")
+    return True
+
+
+
+def get_parameter_value(value: Any, is_display_result: bool = False) -> Any:
+    '''
+    Возвращает значение параметра
+
+    Узлы отображения результата получают NodeResult целиком.
+    Массивы с обратным порядком байт преобразуются в порядок байт процессора
+    '''
+    if isinstance(value, NodeResult) and not is_display_result:
+        return as_native_byte_order(value.value)
+    return as_native_byte_order(value)
+
+
+
+class BindingPlan:
+    """
+    План передачи параметров в функцию узла
+
+    Строится один раз по сигнатуре функции. Типы значений при вычислении не проверяются:
+    совместимость подключенных данных проверяется один раз при соединении (PortType),
+    а значения параметров узла задаются элементами интерфейса своего типа,
+    поэтому при каждом вычислении остается только собрать значения
+
+    names - имена параметров функции
+    is_display_result - узлы отображения результата получают NodeResult целиком
+    """
+
+    def __init__(self, function_signature: Dict[str, Any], is_display_result: bool = False):
+        self.names: List[str] = list(function_signature)
+        self.is_display_result = is_display_result
+
+
+    def bind_value(self, value: Any) -> Any:
+        '''
+        Возвращает значение параметра для функции
+        '''
+        if isinstance(value, NodeResult) and not self.is_display_result:
+            value = value.value
+        return as_native_byte_order(value)
+
+
+    def bind(self, get_value: Callable[[str], Any]) -> Dict[str, Any]:
+        '''
+        Возвращает параметры функции, получая значения через get_value(name)
+        '''
+        return {name: self.bind_value(get_value(name)) for name in self.names}
@@ -0,0 +1,371 @@
+from ..calculation_functions import NodeResult, ResultType, Signal
+
+from typing import Any, Dict, List, Optional
+from threading import Lock, get_ident
+from time import time
+import sqlite3
+import json
+import io
+import os
+
+from matplotlib.figure import Figure
+import numpy as np
+
+
+
+# Версия формата кэша: при изменении старые записи не используются
+DISK_CACHE_VERSION = 1
+
+
+
+class _NotStorable(Exception):
+    '''
+    Значение результата нельзя сохранить на диск
+    '''
+
+
+
+def _render_figure(figure: Figure) -> np.ndarray:
+    '''
+    Возвращает растровое изображение графика matplotlib (RGBA, uint8)
+    '''
+    dpi = figure.dpi
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="rgba", dpi=dpi)
+    width, height = figure.canvas.get_width_height()
+    return np.frombuffer(buffer.getvalue(), dtype=np.uint8).reshape(height, width, 4)
+
+
+
+def _figure_from_image(image: np.ndarray, dpi: float) -> Figure:
+    '''
+    Создает график, показывающий сохраненное растровое изображение графика
+    (вне pyplot: такие графики не накапливаются в списке открытых)
+    '''
+    height, width = image.shape[:2]
+    figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    figure.figimage(image, origin="upper")
+    return figure
+
+
+
+def _encode(value: Any, arrays: List[np.ndarray]) -> Any:
+    '''
+    Преобразует значение результата в JSON-совместимое описание.
+    Массивы заменяются ссылками {"array": номер} и добавляются в arrays.
+    Графики matplotlib сохраняются как растровое изображение и восстанавливаются графиком,
+    который его показывает (графики только отображаются, их данные узлам не нужны)
+    '''
+    if isinstance(value, np.generic) and not isinstance(value, np.object_):
+        return {"scalar": value.item(), "dtype": value.dtype.str}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.ndarray):
+        if value.dtype.hasobject:
+            raise _NotStorable()
+        arrays.append(value)
+        return {"array": len(arrays) - 1}
+    if isinstance(value, Figure):
+        arrays.append(_render_figure(value))
+        return {"figure": len(arrays) - 1, "dpi": value.dpi}
+    if isinstance(value, NodeResult):
+        return {"node_result": _encode(value.value, arrays), "type": value.type.value}
+    if isinstance(value, Signal):
+        return {
+            "signal": [_encode(value.values, arrays), _encode(value.x, arrays)],
+            "labels": [value.x_label, value.y_label],
+        }
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return {"dict": {key: _encode(item, arrays) for key, item in value.items()}}
+    if type(value) in (list, tuple):
+        return {type(value).__name__: [_encode(item, arrays) for item in value]}
+    raise _NotStorable()
+
+
+
+def _decode(value: Any, arrays: List[np.ndarray]) -> Any:
+    '''
+    Восстанавливает значение результата из описания _encode
+    '''
+    if not isinstance(value, dict):
+        return value
+    if "array" in value:
+        return arrays[value["array"]]
+    if "figure" in value:
+        return _figure_from_image(arrays[value["figure"]], value["dpi"])
+    if "scalar" in value:
+        return np.dtype(value["dtype"]).type(value["scalar"])
+    if "signal" in value:
+        values, x = (_decode(item, arrays) for item in value["signal"])
+        return Signal(values, x, *value["labels"])
+    if "node_result" in value:
+        return NodeResult(_decode(value["node_result"], arrays), ResultType(value["type"]))
+    if "dict" in value:
+        return {key: _decode(item, arrays) for key, item in value["dict"].items()}
+    if "tuple" in value:
+        return tuple(_decode(item, arrays) for item in value["tuple"])
+    return [_decode(item, arrays) for item in value["list"]]
+
+
+
+class DiskCache:
+    """
+    Кэш результатов узлов на диске, адресуемый по отпечатку входных данных
+
+    Отпечаток включает идентификатор функции узла, значения параметров и отпечатки
+    результатов узлов-источников, поэтому результат можно использовать после перезапуска.
+    Массивы хранятся в файлах .npy и читаются через отображение в память (только для чтения),
+    графики matplotlib - как растровые изображения в тех же файлах,
+    остальные значения (числа, строки, NodeResult, Signal) - в индексе SQLite.
+    При превышении max_bytes удаляются записи, к которым дольше всего не обращались.
+    Результаты, вычисленные быстрее min_calculation_time, не сохраняются:
+    их дешевле пересчитать, чем записать на диск
+
+    directory - папка кэша (None - кэш выключен)
+    max_bytes - максимальный суммарный размер записей (байт)
+    min_calculation_time - минимальное время вычисления сохраняемого результата (сек)
+    hits, misses - счетчики попаданий и промахов
+    """
+
+    INDEX_FILE_NAME = "index.sqlite"
+
+    def __init__(
+        self,
+        directory: str = None,
+        max_bytes: int = 2 * 1024 ** 3,
+        min_calculation_time: float = 0.05
+    ):
+        self.directory: Optional[str] = None
+        self.max_bytes = max_bytes
+        self.min_calculation_time = min_calculation_time
+        self.connection: Optional[sqlite3.Connection] = None
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            self.open(directory)
+
+
+    @property
+    def is_enabled(self) -> bool:
+        return self.connection is not None
+
+
+    def open(self, directory: str, max_bytes: int = None) -> None:
+        '''
+        Включает кэш в папке directory (создается, если ее нет)
+        '''
+        os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(
+            os.path.join(directory, self.INDEX_FILE_NAME),
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "fingerprint TEXT PRIMARY KEY, version INTEGER, meta TEXT, "
+            "arrays_count INTEGER, size INTEGER, last_access REAL)"
+        )
+        with self.lock:
+            self.close_connection()
+            self.directory = directory
+            self.connection = connection
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self.evict()
+
+
+    def close_connection(self) -> None:
+        '''
+        Закрывает индекс (вызывается под блокировкой)
+        '''
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+    def close(self) -> None:
+        '''
+        Выключает кэш (файлы кэша остаются на диске)
+        '''
+        with self.lock:
+            self.close_connection()
+            self.directory = None
+
+
+    def get_array_path(self, fingerprint: str, number: int) -> str:
+        '''
+        Возвращает путь к файлу массива записи
+        '''
+        return os.path.join(self.directory, f"{fingerprint}_{number}.npy")
+
+
+    def get(self, fingerprint: Optional[str]) -> Optional[Dict]:
+        '''
+        Возвращает сохраненный результат или None
+        '''
+        if fingerprint is None or not self.is_enabled:
+            return None
+        with self.lock:
+            if self.connection is None:
+                return None
+            row = self.connection.execute(
+                "SELECT meta, arrays_count FROM entries WHERE fingerprint = ? AND version = ?",
+                (fingerprint, DISK_CACHE_VERSION)
+            ).fetchone()
+            if row is not None:
+                self.connection.execute(
+                    "UPDATE entries SET last_access = ? WHERE fingerprint = ?",
+                    (time(), fingerprint)
+                )
+        if row is None:
+            self.misses += 1
+            return None
+
+        meta, arrays_count = row
+        try:
+            # np.asarray - обычный массив вместо np.memmap (данные остаются отображенными с диска)
+            arrays = [
+                np.asarray(np.load(self.get_array_path(fingerprint, number), mmap_mode="r"))
+                for number in range(arrays_count)
+            ]
+        except (OSError, ValueError):
+            # Файлы записи удалены или повреждены
+            self.remove(fingerprint)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return _decode(json.loads(meta), arrays)
+
+
+    def put(self, fingerprint: Optional[str], result: Dict, calculation_time: float = None) -> bool:
+        '''
+        Сохраняет результат, вычисленный за calculation_time секунд.
+        Возвращает False, если результат не сохранен (кэш выключен, вычисление слишком быстрое
+        или результат содержит значения, которые нельзя сохранить, например графики plotly)
+        '''
+        if (
+            fingerprint is None
+            or not self.is_enabled
+            or not isinstance(result, dict)
+            or (calculation_time is not None and calculation_time < self.min_calculation_time)
+        ):
+            return False
+
+        arrays: List[np.ndarray] = []
+        try:
+            meta = json.dumps(_encode(result, arrays))
+        except (_NotStorable, TypeError, ValueError):
+            return False
+        size = len(meta) + sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return False
+
+        directory = self.directory
+        try:
+            for number, array in enumerate(arrays):
+                path = os.path.join(directory, f"{fingerprint}_{number}.npy")
+                # Запись через временный файл: другой процесс не прочитает файл частично
+                temp_path = f"{path}.{os.getpid()}_{get_ident()}.tmp"
+                with open(temp_path, "wb") as file:
+                    np.save(file, np.ascontiguousarray(array), allow_pickle=False)
+                os.replace(temp_path, path)
+        except OSError:
+            self._remove_files(directory, fingerprint, len(arrays))
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return False
+
+        with self.lock:
+            if self.connection is None or self.directory != directory:
+                # Кэш закрыт или перенесен во время записи: файлы без записи в индексе не нужны
+                self._remove_files(directory, fingerprint, len(arrays))
+                return False
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                (fingerprint, DISK_CACHE_VERSION, meta, len(arrays), size, time())
+            )
+            self.evict()
+        return True
+
+
+    def evict(self) -> None:
+        '''
+        Удаляет давно использованные записи, пока размер кэша больше max_bytes
+        (вызывается под блокировкой)
+        '''
+        total_size = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total_size <= self.max_bytes:
+            return
+        rows = self.connection.execute(
+            "SELECT fingerprint, arrays_count, size FROM entries ORDER BY last_access"
+        ).fetchall()
+        for fingerprint, arrays_count, size in rows:
+            if total_size <= self.max_bytes:
+                break
+            self._remove_entry(fingerprint, arrays_count)
+            total_size -= size
+
+
+    def _remove_entry(self, fingerprint: str, arrays_count: int) -> None:
+        '''
+        Удаляет запись и ее файлы (вызывается под блокировкой)
+        '''
+        self.connection.execute("DELETE FROM entries WHERE fingerprint = ?", (fingerprint,))
+        self._remove_files(self.directory, fingerprint, arrays_count)
+
+
+    @staticmethod
+    def _remove_files(directory: str, fingerprint: str, arrays_count: int) -> None:
+        '''
+        Удаляет файлы массивов записи
+        '''
+        for number in range(arrays_count):
+            try:
+                os.remove(os.path.join(directory, f"{fingerprint}_{number}.npy"))
+            except OSError:
+                # Файл отсутствует или отображен в память (Windows) - будет перезаписан позже
+                pass
+
+
+    def remove(self, fingerprint: str) -> None:
+        '''
+        Удаляет запись
+        '''
+        with self.lock:
+            if self.connection is None:
+                return
+            row = self.connection.execute(
+                "SELECT arrays_count FROM entries WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row is not None:
+                self._remove_entry(fingerprint, row[0])
+
+
+    def clear(self) -> None:
+        '''
+        Удаляет все записи
+        '''
+        with self.lock:
+            if self.connection is None:
+                return
+            rows = self.connection.execute("SELECT fingerprint, arrays_count FROM entries").fetchall()
+            for fingerprint, arrays_count in rows:
+                self._remove_entry(fingerprint, arrays_count)
+
+
+    def get_size(self) -> int:
+        '''
+        Возвращает суммарный размер записей (байт)
+        '''
+        with self.lock:
+            if self.connection is None:
+                return 0
+            return self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+
+
+disk_cache = DiskCache()
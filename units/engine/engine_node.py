@@ -0,0 +1,222 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..node.node_config import NodeConfig
+
+from .binding import get_signature_type_hints, BindingPlan
+from .process_pool import call_node_function
+from .disk_cache import disk_cache
+from .result_cache import (
+    ResultCache, fingerprint_value, make_fingerprint, get_function_key, unique_fingerprint
+)
+from ..data_types import ParameterConnectType
+from ..calculation_functions import make_read_only
+
+from itertools import count
+from typing import Any, Callable, Dict, List
+from time import perf_counter
+
+
+
+class EngineConnection:
+    """
+    Соединение выходного параметра одного узла с входным параметром другого
+    """
+
+    def __init__(
+        self,
+        from_node: "EngineNode",
+        from_key: str,
+        to_node: "EngineNode",
+        to_key: str
+    ):
+        self.from_node: "EngineNode" = from_node
+        self.from_key: str = from_key
+        self.to_node: "EngineNode" = to_node
+        self.to_key: str = to_key
+
+
+    def __hash__(self) -> int:
+        return hash((self.from_node.id, self.from_key, self.to_node.id, self.to_key))
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EngineConnection) and hash(self) == hash(other)
+
+
+    def __str__(self) -> str:
+        return f"{self.from_node.id}:{self.from_key} -> {self.to_node.id}:{self.to_key}"
+
+
+
+class EngineNode:
+    """
+    Узел графа без графического интерфейса
+
+    config - конфигурация узла (та же, что и у узла в редакторе)
+    values - значения входных параметров
+    inputs - подключения к входным параметрам
+    outputs - значения выходных параметров
+    result - результат последнего вычисления функции
+    result_fingerprint - отпечаток входных данных, по которым получен result
+    result_cache - кэш результатов по отпечатку входных данных
+    calculation_time - время последнего вычисления (сек)
+    is_dirty - входные данные изменились после последнего вычисления
+    binding_plan - план передачи параметров в функцию (строится один раз по сигнатуре)
+    """
+
+    id_counter = count()
+
+    def __init__(
+        self,
+        config: "NodeConfig",
+        values: Dict[str, Any] = None
+    ):
+        self.id: int = next(EngineNode.id_counter)
+        self.config: "NodeConfig" = config
+        self.name: str = config.name
+        self.function = config.function
+        self.function_signature: Dict[str, Any] = get_signature_type_hints(self.function)
+        self.is_display_result: bool = config.is_display_result
+        self.binding_plan = BindingPlan(self.function_signature, self.is_display_result)
+
+        self.out_keys: List[str] = [
+            param.key for param in config.parameters
+            if param.connect_type == ParameterConnectType.OUT
+        ]
+        self.values: Dict[str, Any] = {
+            param.key: param.normalize_value(param.default_value)
+            for param in config.parameters
+            if param.connect_type != ParameterConnectType.OUT
+        }
+        self.inputs: Dict[str, EngineConnection] = {}
+        self.outputs: Dict[str, Any] = {key: None for key in self.out_keys}
+        self.result: Dict = None
+        self.result_fingerprint: str = None
+        self.result_cache: ResultCache = ResultCache()
+        self.function_key: str = get_function_key(self.function, config.key)
+        self.calculation_time: float = 0
+        self.is_dirty: bool = True
+
+        for key, value in (values or {}).items():
+            self.set_value(key, value)
+
+
+    def __str__(self) -> str:
+        return f"EngineNode: id: {self.id}, name: {self.name}"
+
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, EngineNode) and hash(self) == hash(other)
+
+
+    def get_param_config(self, key: str):
+        '''
+        Возвращает конфигурацию параметра по ключу
+        '''
+        for param in self.config.parameters:
+            if param.key == key:
+                return param
+        raise KeyError(f"У узла '{self.name}' нет параметра '{key}'")
+
+
+    def set_value(self, key: str, value: Any) -> None:
+        '''
+        Устанавливает значение входного параметра
+        '''
+        if key not in self.values:
+            raise KeyError(f"У узла '{self.name}' нет входного параметра '{key}'")
+        self.values[key] = make_read_only(self.get_param_config(key).normalize_value(value))
+
+
+    def get_input_value(self, key: str) -> Any:
+        '''
+        Возвращает значение входного параметра с учетом подключения
+        '''
+        connect = self.inputs.get(key)
+        if connect is None:
+            return self.values[key]
+        return connect.from_node.outputs.get(connect.from_key)
+
+
+    def get_valid_parameters(self) -> Dict[str, Any]:
+        '''
+        Возвращает значения параметров функции с учетом сигнатуры функции
+        '''
+        return self.binding_plan.bind(self.get_input_value)
+
+
+    def get_input_fingerprint(self, key: str) -> str:
+        '''
+        Возвращает отпечаток входного параметра.
+        Для подключенного параметра - отпечаток результата узла-источника
+        '''
+        connect = self.inputs.get(key)
+        if connect is None:
+            return fingerprint_value(self.values[key])
+        if connect.from_node.result_fingerprint is None:
+            return None
+        return f"{connect.from_node.result_fingerprint}:{connect.from_key}"
+
+
+    def get_fingerprint(self) -> str:
+        '''
+        Возвращает отпечаток текущих входных данных или None, если результат нельзя кэшировать
+        '''
+        if not self.config.is_cacheable:
+            return None
+        return make_fingerprint(self.function_key, {
+            name: self.get_input_fingerprint(name)
+            for name in self.function_signature
+        })
+
+
+    def calculate(self, compute: Callable[[], Dict] = None) -> Dict:
+        '''
+        Вычисляет значение функции и обновляет выходные параметры.
+        Если входные данные не изменились, возвращает результат из кэша.
+        compute - вычисление результата вместо вызова функции узла (для объединенных узлов)
+        '''
+        start_time = perf_counter()
+        fingerprint = self.get_fingerprint()
+        cached_result = self.result_cache.get(fingerprint)
+        if cached_result is None:
+            cached_result = disk_cache.get(fingerprint)
+            if cached_result is not None:
+                self.result_cache.put(fingerprint, cached_result)
+
+        if cached_result is not None:
+            self.result = cached_result
+        else:
+            if compute is not None:
+                self.result = make_read_only(compute())
+            else:
+                self.result = call_node_function(
+                    self.function, self.get_valid_parameters(), self.config.run_in_process
+                )
+            self.result_cache.put(fingerprint, self.result)
+            disk_cache.put(fingerprint, self.result, perf_counter() - start_time)
+        self.result_fingerprint = fingerprint or unique_fingerprint()
+        self.calculation_time = perf_counter() - start_time
+        self.is_dirty = False
+
+        for key in self.out_keys:
+            if key in self.result:
+                self.outputs[key] = self.result[key]
+        return self.result
+
+
+    def skip_fused(self) -> None:
+        '''
+        Пропускает вычисление промежуточного узла объединенной цепочки:
+        результат не сохраняется, передается только отпечаток для следующего узла.
+        Узел остается требующим пересчета, чтобы вычислиться, когда понадобится его результат
+        '''
+        self.result = None
+        self.result_fingerprint = self.get_fingerprint() or unique_fingerprint()
+        self.outputs = {key: None for key in self.out_keys}
+        self.calculation_time = 0
+        self.is_dirty = True
@@ -0,0 +1,124 @@
+from .engine_node import EngineNode
+from .graph_index import GraphIndex
+from .binding import get_parameter_value
+from ..calculation_functions import NodeResult, ResultType
+from ..calculation_functions.edit.pointwise import POINTWISE_KERNELS, PointwiseKernel, apply_pointwise_chain
+from ..calculation_functions.input.read import read_file
+from ..data_types import File
+
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+import numpy as np
+
+
+
+def get_pointwise_kernel(node: EngineNode) -> Optional[PointwiseKernel]:
+    '''
+    Возвращает поэлементное преобразование узла или None
+    '''
+    return POINTWISE_KERNELS.get(node.function)
+
+
+
+def is_fusable(from_node: EngineNode, to_node: EngineNode, graph_index: GraphIndex) -> bool:
+    '''
+    Возвращает True, если узел to_node можно объединить с from_node:
+    оба поэлементные, изображение to_node берется из from_node и больше никто не использует from_node
+    '''
+    from_kernel, to_kernel = get_pointwise_kernel(from_node), get_pointwise_kernel(to_node)
+    if from_kernel is None or to_kernel is None or from_node.is_display_result:
+        return False
+    connect = to_node.inputs.get(to_kernel.image_key)
+    return (
+        connect is not None
+        and connect.from_node == from_node
+        and connect.from_key == from_kernel.out_key
+        and graph_index.get_out_degree(from_node) == 1
+    )
+
+
+
+def find_fused_chains(
+    nodes: List[EngineNode],
+    graph_index: GraphIndex,
+    keep_nodes: Iterable[EngineNode] = ()
+) -> List[List[EngineNode]]:
+    '''
+    Находит цепочки из двух и более поэлементных узлов среди nodes (в топологическом порядке).
+    Узлы keep_nodes не становятся промежуточными (их результат нужен)
+    '''
+    node_set, keep_nodes = set(nodes), set(keep_nodes)
+    node_chain: Dict[EngineNode, List[EngineNode]] = {}
+    chains = []
+    for node in nodes:
+        kernel = get_pointwise_kernel(node)
+        if kernel is None or node not in node_set:
+            continue
+        connect = node.inputs.get(kernel.image_key)
+        previous = connect.from_node if connect is not None else None
+        if (
+            previous not in node_set
+            or previous in keep_nodes
+            or not is_fusable(previous, node, graph_index)
+        ):
+            continue
+        chain = node_chain.get(previous)
+        if chain is None:
+            chain = node_chain[previous] = [previous]
+            chains.append(chain)
+        chain.append(node)
+        node_chain[node] = chain
+    return chains
+
+
+
+def fuse_graph(
+    graph: Dict[EngineNode, List[EngineNode]],
+    chains: List[List[EngineNode]]
+) -> Dict[EngineNode, List[EngineNode]]:
+    '''
+    Заменяет в графе смежности каждую цепочку ее последним узлом
+    '''
+    fused_into = {node: chain[-1] for chain in chains for node in chain[:-1]}
+    fused_graph: Dict[Hashable, List[Hashable]] = {}
+    for node, neighbors in graph.items():
+        source = fused_into.get(node, node)
+        for neighbor in neighbors:
+            target = fused_into.get(neighbor, neighbor)
+            if target != source:
+                fused_graph.setdefault(source, []).append(target)
+    return fused_graph
+
+
+
+def calculate_fused(chain: List[EngineNode]) -> Dict:
+    '''
+    Вычисляет цепочку поэлементных узлов за один проход по изображению.
+    Результат сохраняется только у последнего узла цепочки
+    '''
+    first_kernel = get_pointwise_kernel(chain[0])
+    image = get_parameter_value(chain[0].get_input_value(first_kernel.image_key))
+    if isinstance(image, File):
+        image = read_file(image.path)
+    if not isinstance(image, np.ndarray):
+        # Нет изображения - узлы вычисляются по отдельности
+        for node in chain:
+            node.calculate()
+        return chain[-1].result
+
+    for node in chain[:-1]:
+        node.skip_fused()
+
+    def compute() -> Dict:
+        steps = []
+        for node in chain:
+            kernel = get_pointwise_kernel(node)
+            parameters = node.get_valid_parameters()
+            parameters.pop(kernel.image_key, None)
+            steps.append((kernel.kernel, parameters))
+        last_kernel = get_pointwise_kernel(chain[-1])
+        return {
+            last_kernel.out_key: NodeResult(apply_pointwise_chain(image, steps), ResultType.IMAGE_CV2)
+        }
+
+    return chain[-1].calculate(compute)
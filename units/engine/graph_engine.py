@@ -0,0 +1,213 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..node.node_config import NodeConfig
+
+from .engine_node import EngineNode, EngineConnection
+from .scheduler import ThreadPoolScheduler
+from .graph_index import GraphIndex
+from .fusion import find_fused_chains, fuse_graph, calculate_fused
+from ..calculation_functions import NodeResult
+
+from typing import Any, Dict, List, Iterable
+
+
+
+class GraphEngine:
+    """
+    Вычисление графа узлов без графического интерфейса
+
+    Принимает те же конфигурации узлов (NodeConfig), что и редактор,
+    и позволяет запускать конвейеры из скриптов, пакетных задач и бенчмарков
+
+    max_workers - количество потоков для параллельного вычисления независимых ветвей
+                  (1 - последовательное вычисление, None - по числу процессоров)
+    is_fuse_pointwise - объединять цепочки поэлементных узлов в один проход по изображению
+                        (результаты промежуточных узлов цепочки не сохраняются,
+                        чтобы их получить, узлы нужно указать в outputs при запуске)
+    """
+
+    def __init__(self, max_workers: int = 1, is_fuse_pointwise: bool = True):
+        self.is_fuse_pointwise: bool = is_fuse_pointwise
+        self.nodes: List[EngineNode] = []
+        self.connections: List[EngineConnection] = []
+        self.graph_index = GraphIndex()
+        self.scheduler = ThreadPoolScheduler(max_workers)
+
+
+    def add_node(self, config: "NodeConfig", values: Dict[str, Any] = None) -> EngineNode:
+        '''
+        Добавляет узел в граф
+        '''
+        node = EngineNode(config, values)
+        self.nodes.append(node)
+        self.graph_index.add_node(node)
+        return node
+
+
+    def remove_node(self, node: EngineNode) -> None:
+        '''
+        Удаляет узел и все его соединения
+        '''
+        for connect in list(self.connections):
+            if connect.from_node == node or connect.to_node == node:
+                self.disconnect(connect)
+        self.nodes.remove(node)
+        self.graph_index.remove_node(node)
+
+
+    def connect(
+        self,
+        from_node: EngineNode,
+        from_key: str,
+        to_node: EngineNode,
+        to_key: str
+    ) -> EngineConnection:
+        '''
+        Соединяет выходной параметр from_key узла from_node с входным параметром to_key узла to_node.
+        Предыдущее подключение к входному параметру заменяется
+        '''
+        if from_node == to_node:
+            raise ValueError(f"Нельзя соединить узел '{from_node.name}' сам с собой")
+        if from_key not in from_node.out_keys:
+            raise KeyError(f"У узла '{from_node.name}' нет выходного параметра '{from_key}'")
+        if to_key not in to_node.values:
+            raise KeyError(f"У узла '{to_node.name}' нет входного параметра '{to_key}'")
+        from_port = from_node.get_param_config(from_key).port_type
+        to_port = to_node.get_param_config(to_key).port_type
+        if not to_port.accepts(from_port):
+            raise TypeError(
+                f"Нельзя подключить '{from_node.name}.{from_key}' ({from_port}) "
+                + f"к '{to_node.name}.{to_key}' ({to_port})"
+            )
+
+        if to_key in to_node.inputs:
+            self.disconnect(to_node.inputs[to_key])
+
+        connect = EngineConnection(from_node, from_key, to_node, to_key)
+        to_node.inputs[to_key] = connect
+        self.connections.append(connect)
+        self.graph_index.add_edge(from_node, to_node)
+        self.mark_dirty([to_node])
+        return connect
+
+
+    def disconnect(self, connect: EngineConnection) -> None:
+        '''
+        Удаляет соединение
+        '''
+        self.connections.remove(connect)
+        connect.to_node.inputs.pop(connect.to_key, None)
+        self.graph_index.remove_edge(connect.from_node, connect.to_node)
+        self.mark_dirty([connect.to_node])
+
+
+    def set_value(self, node: EngineNode, key: str, value: Any) -> None:
+        '''
+        Устанавливает значение входного параметра узла
+        '''
+        node.set_value(key, value)
+        self.mark_dirty([node])
+
+
+    def mark_dirty(self, start_nodes: Iterable[EngineNode]) -> None:
+        '''
+        Помечает узлы и все зависящие от них узлы как требующие пересчета
+        '''
+        for node in self.graph_index.get_downstream(start_nodes):
+            node.is_dirty = True
+
+
+    def get_output(self, node: EngineNode, key: str, unwrap: bool = True) -> Any:
+        '''
+        Возвращает значение выходного параметра узла (по умолчанию без обертки NodeResult)
+        '''
+        value = node.outputs.get(key)
+        if unwrap and isinstance(value, NodeResult):
+            return value.value
+        return value
+
+
+    def get_graph(self, nodes: Iterable[EngineNode] = None) -> Dict[EngineNode, List[EngineNode]]:
+        '''
+        Возвращает граф смежности узлов (для nodes или для всех узлов)
+        '''
+        return self.graph_index.get_graph(nodes)
+
+
+    def topological_sort(self, start_nodes: Iterable[EngineNode] = None) -> List[EngineNode]:
+        '''
+        Возвращает узлы в порядке вычисления.
+        Если заданы start_nodes, то только их и зависящие от них узлы
+        '''
+        if start_nodes is None:
+            result = self.graph_index.get_topological_order()
+        else:
+            result = self.graph_index.sort_downstream(start_nodes)
+
+        if result is None:
+            raise ValueError("Граф содержит циклы, вычисление невозможно")
+        return result
+
+
+    def topological_sort_demanded(self, outputs: Iterable[EngineNode]) -> List[EngineNode]:
+        '''
+        Возвращает в порядке вычисления только те узлы, требующие пересчета,
+        от которых зависят узлы outputs
+        '''
+        result = self.graph_index.sort_nodes(
+            self.graph_index.get_upstream(outputs, lambda node: node.is_dirty)
+        )
+        if result is None:
+            raise ValueError("Граф содержит циклы, вычисление невозможно")
+        return result
+
+
+    def add_dirty_upstream(self, nodes: List[EngineNode]) -> List[EngineNode]:
+        '''
+        Дополняет nodes требующими пересчета узлами, от которых они зависят
+        (например, промежуточными узлами объединенных цепочек), и возвращает их в порядке вычисления
+        '''
+        node_set = set(nodes)
+        return self.graph_index.sort_nodes(self.graph_index.get_upstream(
+            nodes, lambda node: node in node_set or node.is_dirty
+        ))
+
+
+    def run(
+        self,
+        start_nodes: Iterable[EngineNode] = None,
+        outputs: Iterable[EngineNode] = None
+    ) -> Dict[EngineNode, Dict]:
+        '''
+        Вычисляет граф.
+        Если заданы start_nodes, то пересчитываются только они и зависящие от них узлы.
+        Если заданы outputs, то вычисление ленивое: пересчитываются только требующие пересчета узлы,
+        от которых зависят outputs (ветви, не ведущие к outputs, не вычисляются)
+        '''
+        if outputs is None:
+            nodes = self.topological_sort(start_nodes)
+            if start_nodes is not None:
+                nodes = self.add_dirty_upstream(nodes)
+        else:
+            outputs = list(outputs)
+            if start_nodes is not None:
+                self.mark_dirty(start_nodes)
+            nodes = self.topological_sort_demanded(outputs)
+
+        chains = (
+            find_fused_chains(nodes, self.graph_index, keep_nodes = outputs or ())
+            if self.is_fuse_pointwise else []
+        )
+        last_node_chain = {chain[-1]: chain for chain in chains}
+        fused_nodes = {node for chain in chains for node in chain[:-1]}
+
+        def calculate(node: EngineNode) -> Dict:
+            if node in last_node_chain:
+                return calculate_fused(last_node_chain[node])
+            return node.calculate()
+
+        return self.scheduler.run(
+            nodes = [node for node in nodes if node not in fused_nodes],
+            graph = fuse_graph(self.get_graph(nodes), chains),
+            calculate = calculate,
+        )
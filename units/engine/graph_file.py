@@ -0,0 +1,138 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from ..node.node_config import NodeConfig
+
+from .engine_node import EngineNode
+from .graph_engine import GraphEngine
+from ..data_types import File
+
+from typing import Any, Dict, Iterable, Tuple
+import json
+
+
+
+GRAPH_FILE_VERSION = 1
+
+
+
+def iter_node_configs(configs: Iterable[Any]) -> Iterable["NodeConfig"]:
+    '''
+    Перебирает конфигурации узлов, в том числе вложенные в папки (Folder)
+    '''
+    for item in configs:
+        if hasattr(item, "obj_list"):
+            yield from iter_node_configs(item.obj_list)
+        else:
+            yield item
+
+
+
+def value_to_json(value: Any) -> Any:
+    '''
+    Преобразует значение параметра для записи в JSON
+    '''
+    if isinstance(value, File):
+        return {"file": value.path}
+    if isinstance(value, (list, tuple)):
+        return [value_to_json(item) for item in value]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Значение типа {type(value)} нельзя сохранить в файл графа")
+
+
+
+def value_from_json(value: Any) -> Any:
+    '''
+    Восстанавливает значение параметра из JSON
+    '''
+    if isinstance(value, dict) and "file" in value:
+        return File(value["file"])
+    if isinstance(value, list):
+        return [value_from_json(item) for item in value]
+    return value
+
+
+
+def save_graph(engine: GraphEngine, path: str, node_names: Dict[EngineNode, str] = None) -> None:
+    '''
+    Сохраняет граф в JSON файл.
+    node_names - имена узлов в файле (по умолчанию "<ключ узла>_<id>")
+
+    Формат файла:
+    {
+        "version": 1,
+        "nodes": [{"name": "gamma", "key": "gamma_correction", "values": {"gamma": 1.5}}, ...],
+        "connections": [{"from": "open", "from_key": "image", "to": "gamma", "to_key": "image"}, ...]
+    }
+    '''
+    node_names = {
+        node: (node_names or {}).get(node, f"{node.config.key}_{node.id}")
+        for node in engine.nodes
+    }
+    graph_data = {
+        "version": GRAPH_FILE_VERSION,
+        "nodes": [
+            {
+                "name": node_names[node],
+                "key": node.config.key,
+                "values": {key: value_to_json(value) for key, value in node.values.items()},
+            }
+            for node in engine.nodes
+        ],
+        "connections": [
+            {
+                "from": node_names[connect.from_node],
+                "from_key": connect.from_key,
+                "to": node_names[connect.to_node],
+                "to_key": connect.to_key,
+            }
+            for connect in engine.connections
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(graph_data, file, ensure_ascii=False, indent=4)
+
+
+
+def load_graph(
+    path: str,
+    configs: Iterable[Any],
+    max_workers: int = 1
+) -> Tuple[GraphEngine, Dict[str, EngineNode]]:
+    '''
+    Загружает граф из JSON файла (формат описан в save_graph).
+    configs - конфигурации узлов (например, NodeLibrary.get_nodes_configs()), узлы ищутся по ключу.
+    Возвращает граф и словарь узлов по именам
+    '''
+    with open(path, encoding="utf-8") as file:
+        graph_data = json.load(file)
+
+    version = graph_data.get("version", GRAPH_FILE_VERSION)
+    if version != GRAPH_FILE_VERSION:
+        raise ValueError(f"Версия файла графа {version} не поддерживается")
+
+    configs_by_key = {config.key: config for config in iter_node_configs(configs)}
+    engine = GraphEngine(max_workers)
+    nodes: Dict[str, EngineNode] = {}
+
+    for node_data in graph_data.get("nodes", []):
+        name, key = node_data["name"], node_data["key"]
+        if key not in configs_by_key:
+            raise KeyError(f"Узел '{key}' не найден в библиотеке узлов")
+        if name in nodes:
+            raise ValueError(f"Имя узла '{name}' повторяется")
+        values = {
+            param_key: value_from_json(value)
+            for param_key, value in node_data.get("values", {}).items()
+        }
+        nodes[name] = engine.add_node(configs_by_key[key], values)
+
+    for connect_data in graph_data.get("connections", []):
+        for name in (connect_data["from"], connect_data["to"]):
+            if name not in nodes:
+                raise KeyError(f"Узел '{name}' не найден в графе")
+        engine.connect(
+            nodes[connect_data["from"]], connect_data["from_key"],
+            nodes[connect_data["to"]], connect_data["to_key"],
+        )
+    return engine, nodes
@@ -0,0 +1,373 @@
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set
+from collections import Counter, deque
+from itertools import count
+from threading import RLock
+
+
+
+class GraphIndex:
+    """
+    Индекс смежности графа с инкрементальным отслеживанием циклов и кэшем топологического порядка
+
+    successors / predecessors - прямые и обратные списки смежности
+                                (Counter, т.к. между двумя узлами может быть несколько соединений)
+    components - компоненты сильной связности, содержащие цикл
+    order - кэшированный топологический порядок всех узлов (None - нужно пересчитать)
+
+    Компоненты обновляются при добавлении и удалении ребер:
+    добавление ребра затрагивает только узлы, достижимые из его конца,
+    удаление - только узлы компоненты, в которой оно лежало.
+    Проверка наличия циклов выполняется за O(1).
+    Топологический порядок сбрасывается только при изменении ребер.
+    Все обходы итеративные, поэтому длинные цепочки узлов не упираются в предел рекурсии
+    """
+
+    def __init__(self):
+        self.successors: Dict[Hashable, Counter] = {}
+        self.predecessors: Dict[Hashable, Counter] = {}
+        self.components: Dict[int, Set[Hashable]] = {}
+        self.node_component: Dict[Hashable, int] = {}
+        self.component_counter = count()
+        self.order: Optional[List[Hashable]] = None
+        self.order_position: Dict[Hashable, int] = {}
+        # Индекс изменяется в потоке интерфейса, а читается и в потоке пересчета
+        self.lock = RLock()
+
+
+    def add_node(self, node: Hashable) -> None:
+        '''
+        Добавляет узел без ребер
+        '''
+        with self.lock:
+            if node in self.successors:
+                return
+            self.successors[node] = Counter()
+            self.predecessors[node] = Counter()
+            self.order = None
+
+
+    def add_edge(self, from_node: Hashable, to_node: Hashable) -> None:
+        '''
+        Добавляет ребро
+        '''
+        with self.lock:
+            self.add_node(from_node)
+            self.add_node(to_node)
+            self.successors[from_node][to_node] += 1
+            self.predecessors[to_node][from_node] += 1
+            if self.successors[from_node][to_node] > 1:
+                return
+            self.order = None
+            self._merge_components(from_node, to_node)
+
+
+    def _merge_components(self, from_node: Hashable, to_node: Hashable) -> None:
+        '''
+        Объединяет компоненты, если новое ребро from_node -> to_node замкнуло цикл
+        '''
+        from_component = self.node_component.get(from_node)
+        if from_component is not None and from_component == self.node_component.get(to_node):
+            return
+
+        # Новый цикл появляется, только если из to_node достижим from_node
+        reachable = self._reachable(to_node, self.successors)
+        if from_node not in reachable:
+            return
+        reaching = self._reachable(from_node, self.predecessors, within=reachable)
+        self._set_component(reachable & reaching)
+
+
+    def remove_edge(self, from_node: Hashable, to_node: Hashable) -> None:
+        '''
+        Удаляет ребро
+        '''
+        with self.lock:
+            if self.successors.get(from_node, {}).get(to_node, 0) <= 0:
+                return
+            self.successors[from_node][to_node] -= 1
+            self.predecessors[to_node][from_node] -= 1
+            if self.successors[from_node][to_node] > 0:
+                return
+            del self.successors[from_node][to_node]
+            del self.predecessors[to_node][from_node]
+            self.order = None
+            self._split_component(from_node, to_node)
+
+
+    def _split_component(self, from_node: Hashable, to_node: Hashable) -> None:
+        '''
+        Разделяет компоненту, если удаленное ребро from_node -> to_node лежало на цикле
+        '''
+        component = self.node_component.get(from_node)
+        if component is None or component != self.node_component.get(to_node):
+            return
+
+        # Компонента могла распасться: пересчитываем только ее узлы
+        nodes = self.components.pop(component)
+        for node in nodes:
+            del self.node_component[node]
+        for sub_component in self._strongly_connected_components(nodes):
+            self._set_component(sub_component)
+
+
+    def remove_node(self, node: Hashable) -> None:
+        '''
+        Удаляет узел и все его ребра
+        '''
+        with self.lock:
+            if node not in self.successors:
+                return
+            for neighbor, edges_count in list(self.successors[node].items()):
+                for _ in range(edges_count):
+                    self.remove_edge(node, neighbor)
+            for neighbor, edges_count in list(self.predecessors[node].items()):
+                for _ in range(edges_count):
+                    self.remove_edge(neighbor, node)
+            del self.successors[node]
+            del self.predecessors[node]
+            self.order = None
+
+
+    def has_cycles(self) -> bool:
+        '''
+        Возвращает True, если в графе есть циклы
+        '''
+        return len(self.components) != 0
+
+
+    def is_in_cycle(self, node: Hashable) -> bool:
+        '''
+        Возвращает True, если узел лежит на цикле
+        '''
+        return node in self.node_component
+
+
+    def get_cycles(self) -> List[List[Hashable]]:
+        '''
+        Возвращает компоненты сильной связности, содержащие циклы
+        '''
+        with self.lock:
+            return [list(nodes) for nodes in self.components.values()]
+
+
+    def get_graph(self, nodes: Iterable[Hashable] = None) -> Dict[Hashable, List[Hashable]]:
+        '''
+        Возвращает копию графа смежности (узел -> список зависимых узлов).
+        Если заданы nodes, то только для них
+        '''
+        with self.lock:
+            if nodes is None:
+                nodes = self.successors
+            return {
+                node: list(self.successors[node])
+                for node in nodes
+                if self.successors.get(node)
+            }
+
+
+    def get_out_degree(self, node: Hashable) -> int:
+        '''
+        Возвращает количество исходящих ребер узла (с учетом повторяющихся)
+        '''
+        with self.lock:
+            return sum(self.successors.get(node, {}).values())
+
+
+    def get_downstream(self, start_nodes: Iterable[Hashable]) -> Set[Hashable]:
+        '''
+        Возвращает start_nodes и все зависящие от них узлы
+        '''
+        with self.lock:
+            downstream = set()
+            for node in start_nodes:
+                if node not in downstream:
+                    downstream |= self._reachable(node, self.successors)
+            return downstream
+
+
+    def get_upstream(
+        self,
+        target_nodes: Iterable[Hashable],
+        is_included: Callable[[Hashable], bool] = None
+    ) -> Set[Hashable]:
+        '''
+        Возвращает target_nodes и все узлы, от которых они зависят.
+        is_included - условие, которому должны удовлетворять узлы (обход через остальные узлы не идет)
+        '''
+        with self.lock:
+            upstream = set()
+            stack = [
+                node for node in target_nodes
+                if is_included is None or is_included(node)
+            ]
+            upstream.update(stack)
+            while stack:
+                node = stack.pop()
+                for neighbor in self.predecessors.get(node, ()):
+                    if neighbor not in upstream and (is_included is None or is_included(neighbor)):
+                        upstream.add(neighbor)
+                        stack.append(neighbor)
+            return upstream
+
+
+    def has_cycle_from(self, start_nodes: Iterable[Hashable]) -> bool:
+        '''
+        Возвращает True, если из start_nodes достижим цикл
+        '''
+        with self.lock:
+            if not self.components:
+                return False
+            return any(node in self.node_component for node in self.get_downstream(start_nodes))
+
+
+    def get_topological_order(self) -> Optional[List[Hashable]]:
+        '''
+        Возвращает все узлы в топологическом порядке (алгоритм Кана) или None, если есть циклы.
+        Порядок кэшируется до следующего изменения ребер
+        '''
+        with self.lock:
+            if self.components:
+                return None
+            if self.order is None:
+                self.order = self._kahn_sort(self.successors)
+                self.order_position = {node: position for position, node in enumerate(self.order)}
+            return list(self.order)
+
+
+    def sort_downstream(self, start_nodes: Iterable[Hashable]) -> Optional[List[Hashable]]:
+        '''
+        Возвращает start_nodes и зависящие от них узлы в топологическом порядке
+        или None, если среди них есть цикл.
+        Стоимость пропорциональна количеству зависимых узлов, а не размеру графа
+        '''
+        with self.lock:
+            return self.sort_nodes(self.get_downstream(start_nodes))
+
+
+    def sort_nodes(self, nodes: Iterable[Hashable]) -> Optional[List[Hashable]]:
+        '''
+        Возвращает узлы nodes в топологическом порядке или None, если среди них есть цикл
+        '''
+        with self.lock:
+            nodes = set(nodes)
+            if any(node in self.node_component for node in nodes):
+                return None
+            if self.order is not None:
+                # Узел вне индекса не имеет ребер, его место в порядке не важно
+                return sorted(nodes, key=lambda node: self.order_position.get(node, -1))
+            return self._kahn_sort(nodes)
+
+
+    def _kahn_sort(self, nodes: Iterable[Hashable]) -> Optional[List[Hashable]]:
+        '''
+        Топологическая сортировка подграфа из узлов nodes (алгоритм Кана)
+        '''
+        nodes = list(nodes)
+        in_degree = {node: 0 for node in nodes}
+        for node in nodes:
+            for neighbor in self.successors.get(node, ()):
+                if neighbor in in_degree:
+                    in_degree[neighbor] += 1
+
+        queue = deque(node for node in nodes if in_degree[node] == 0)
+        result = []
+        while queue:
+            node = queue.popleft()
+            result.append(node)
+            for neighbor in self.successors.get(node, ()):
+                if neighbor in in_degree:
+                    in_degree[neighbor] -= 1
+                    if in_degree[neighbor] == 0:
+                        queue.append(neighbor)
+
+        if len(result) != len(nodes):
+            return None
+        return result
+
+
+    def _set_component(self, nodes: Set[Hashable]) -> None:
+        '''
+        Объединяет узлы в компоненту, если они образуют цикл
+        '''
+        if len(nodes) == 1:
+            node = next(iter(nodes))
+            if node not in self.successors.get(node, ()):
+                return
+        for node in nodes:
+            old_component = self.node_component.get(node)
+            if old_component is not None:
+                self.components.pop(old_component, None)
+        component = next(self.component_counter)
+        self.components[component] = set(nodes)
+        for node in nodes:
+            self.node_component[node] = component
+
+
+    def _reachable(
+        self,
+        start_node: Hashable,
+        adjacency: Dict[Hashable, Counter],
+        within: Set[Hashable] = None
+    ) -> Set[Hashable]:
+        '''
+        Возвращает множество узлов, достижимых из start_node (итеративный обход)
+        '''
+        visited = {start_node}
+        stack = [start_node]
+        while stack:
+            node = stack.pop()
+            for neighbor in adjacency.get(node, ()):
+                if neighbor not in visited and (within is None or neighbor in within):
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        return visited
+
+
+    def _strongly_connected_components(self, nodes: Iterable[Hashable]) -> List[Set[Hashable]]:
+        '''
+        Находит компоненты сильной связности подграфа (итеративный алгоритм Тарьяна)
+        '''
+        nodes = set(nodes)
+        index_counter = count()
+        index: Dict[Hashable, int] = {}
+        low_link: Dict[Hashable, int] = {}
+        stack: List[Hashable] = []
+        on_stack: Set[Hashable] = set()
+        components: List[Set[Hashable]] = []
+
+        for root in nodes:
+            if root in index:
+                continue
+            work = [(root, iter(self.successors.get(root, ())))]
+            index[root] = low_link[root] = next(index_counter)
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor not in nodes:
+                        continue
+                    if neighbor not in index:
+                        index[neighbor] = low_link[neighbor] = next(index_counter)
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(self.successors.get(neighbor, ()))))
+                        break
+                    if neighbor in on_stack:
+                        low_link[node] = min(low_link[node], index[neighbor])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low_link[parent] = min(low_link[parent], low_link[node])
+                    if low_link[node] == index[node]:
+                        component = set()
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.add(member)
+                            if member == node:
+                                break
+                        components.append(component)
+        return components
@@ -0,0 +1,189 @@
+from ..calculation_functions import NodeResult, make_read_only
+
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from dataclasses import dataclass, replace
+from threading import Lock
+import os
+
+import numpy as np
+
+
+
+# В Windows сегмент разделяемой памяти освобождается, когда закрыты все его дескрипторы,
+# поэтому результат процесса-исполнителя передается обратно через pickle
+RETURN_THROUGH_SHARED_MEMORY = os.name != "nt"
+
+
+
+@dataclass(frozen=True)
+class SharedArray:
+    '''
+    Описание массива, размещенного в разделяемой памяти
+
+    name - имя сегмента разделяемой памяти
+    shape - форма массива
+    dtype - тип элементов массива
+    '''
+
+    name: str
+    shape: tuple
+    dtype: str
+
+
+
+def _to_shared(array: np.ndarray, segments: List[shared_memory.SharedMemory]) -> SharedArray:
+    '''
+    Копирует массив в новый сегмент разделяемой памяти
+    '''
+    segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    segments.append(segment)
+    np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+    return SharedArray(segment.name, array.shape, array.dtype.str)
+
+
+
+def pack(value: Any, segments: List[shared_memory.SharedMemory]) -> Any:
+    '''
+    Заменяет массивы (в том числе внутри NodeResult, словарей и списков) описаниями SharedArray
+    '''
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        return _to_shared(value, segments)
+    if isinstance(value, NodeResult):
+        return replace(value, value=pack(value.value, segments))
+    if isinstance(value, dict):
+        return {key: pack(item, segments) for key, item in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(pack(item, segments) for item in value)
+    return value
+
+
+
+def unpack(value: Any, segments: List[shared_memory.SharedMemory], copy: bool = False) -> Any:
+    '''
+    Заменяет описания SharedArray массивами.
+    copy=False - массив ссылается на разделяемую память (действителен, пока открыт сегмент)
+    '''
+    if isinstance(value, SharedArray):
+        segment = shared_memory.SharedMemory(name=value.name)
+        segments.append(segment)
+        array = np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=segment.buf)
+        return array.copy() if copy else array
+    if isinstance(value, NodeResult):
+        return replace(value, value=unpack(value.value, segments, copy))
+    if isinstance(value, dict):
+        return {key: unpack(item, segments, copy) for key, item in value.items()}
+    if type(value) in (list, tuple):
+        return type(value)(unpack(item, segments, copy) for item in value)
+    return value
+
+
+
+def _release(segments: List[shared_memory.SharedMemory], unlink: bool) -> None:
+    '''
+    Закрывает (и при unlink=True удаляет) сегменты разделяемой памяти
+    '''
+    for segment in segments:
+        try:
+            segment.close()
+        except BufferError:
+            pass
+        if unlink:
+            try:
+                segment.unlink()
+            except FileNotFoundError:
+                pass
+    segments.clear()
+
+
+
+def _run_in_worker(function: Callable, parameters: Dict[str, Any]) -> Any:
+    '''
+    Выполняется в процессе-исполнителе: подключает входные массивы и вызывает функцию узла.
+    Все сегменты удаляет основной процесс
+    '''
+    input_segments = []
+    try:
+        result = function(**unpack(parameters, input_segments))
+        if not RETURN_THROUGH_SHARED_MEMORY:
+            return result
+
+        output_segments = []
+        result = pack(result, output_segments)
+        _release(output_segments, unlink=False)
+        return result
+    finally:
+        _release(input_segments, unlink=False)
+
+
+
+class ProcessPoolBackend:
+    """
+    Пул процессов для функций узлов на чистом Python, которые удерживают GIL
+
+    Массивы изображений передаются между процессами через multiprocessing.shared_memory,
+    а не сериализуются через pickle
+
+    max_workers - количество процессов (None - по числу процессоров)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = Lock()
+
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        '''
+        Возвращает пул процессов (создается при первом обращении)
+        '''
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self.executor
+
+
+    def shutdown(self) -> None:
+        '''
+        Останавливает пул процессов
+        '''
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=True, cancel_futures=True)
+                self.executor = None
+
+
+    def call(self, function: Callable, parameters: Dict[str, Any]) -> Any:
+        '''
+        Вызывает функцию в пуле процессов и ждет результат
+        '''
+        input_segments = []
+        try:
+            future = self.get_executor().submit(
+                _run_in_worker, function, pack(parameters, input_segments)
+            )
+            result = future.result()
+        finally:
+            _release(input_segments, unlink=True)
+
+        output_segments = []
+        try:
+            return unpack(result, output_segments, copy=True)
+        finally:
+            _release(output_segments, unlink=True)
+
+
+
+process_pool = ProcessPoolBackend()
+
+
+
+def call_node_function(function: Callable, parameters: Dict[str, Any], run_in_process: bool = False) -> Any:
+    '''
+    Вызывает функцию узла в текущем потоке или в пуле процессов.
+    Массивы результата передаются зависимым узлам без копирования, поэтому запись в них запрещается
+    '''
+    if run_in_process:
+        return make_read_only(process_pool.call(function, parameters))
+    return make_read_only(function(**parameters))
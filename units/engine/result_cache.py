@@ -0,0 +1,188 @@
+from ..data_types import File
+from ..calculation_functions.input.read import decoded_file_cache
+
+from typing import Any, Dict, List, Optional
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import count
+from hashlib import blake2b
+from types import ModuleType
+from uuid import uuid4
+import sys
+import os
+
+import numpy as np
+
+
+
+_unique_counter = count()
+_session_id = uuid4().hex
+
+
+
+def unique_fingerprint() -> str:
+    '''
+    Возвращает уникальный отпечаток для результата, который нельзя кэшировать.
+    Отпечаток не повторяется и после перезапуска (результаты хранятся в кэше на диске)
+    '''
+    return f"run:{_session_id}:{next(_unique_counter)}"
+
+
+
+def fingerprint_value(value: Any) -> Optional[str]:
+    '''
+    Возвращает отпечаток значения параметра или None, если значение нельзя кэшировать
+    '''
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return f"{type(value).__name__}:{value!r}"
+    if isinstance(value, File):
+        try:
+            stat = os.stat(value.path)
+        except OSError:
+            return None
+        return f"file:{value.path}:{stat.st_mtime_ns}:{stat.st_size}"
+    if isinstance(value, np.ndarray):
+        # Декодированный файл определяется ключом кэша, без чтения всех данных (в том числе memmap)
+        file_key = decoded_file_cache.get_key(value)
+        if file_key is not None:
+            return f"decoded:{file_key!r}"
+        if value.dtype.hasobject:
+            return None
+        digest = blake2b(np.ascontiguousarray(value).view(np.uint8).data, digest_size=16)
+        return f"array:{value.dtype.str}:{value.shape}:{digest.hexdigest()}"
+    if isinstance(value, (tuple, list)):
+        tokens = [fingerprint_value(item) for item in value]
+        if None in tokens:
+            return None
+        return f"{type(value).__name__}:({','.join(tokens)})"
+    return None
+
+
+
+def make_fingerprint(function_key: str, tokens: Dict[str, Optional[str]]) -> Optional[str]:
+    '''
+    Возвращает отпечаток вызова функции по отпечаткам ее параметров
+    '''
+    if None in tokens.values():
+        return None
+    data = repr((function_key, sorted(tokens.items())))
+    return blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+
+def get_module_dependencies(module_name: str) -> List[str]:
+    '''
+    Возвращает модуль module_name и модули приложения, которые он использует (в том числе косвенно):
+    импортированные модули и модули импортированных функций и классов
+    '''
+    root = module_name.split(".")[0]
+    dependencies = set()
+    stack = [module_name]
+    while stack:
+        name = stack.pop()
+        module = sys.modules.get(name)
+        if name in dependencies or module is None:
+            continue
+        dependencies.add(name)
+        for value in list(vars(module).values()):
+            dependency = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+            if isinstance(dependency, str) and dependency.split(".")[0] == root:
+                stack.append(dependency)
+    return sorted(dependencies)
+
+
+
+@lru_cache(maxsize=None)
+def get_module_version(module_name: str) -> str:
+    '''
+    Возвращает версию кода модуля, которая меняется при изменении его кода.
+    Для модулей приложения - отпечаток исходных файлов модуля и используемых им модулей
+    (функции узлов вызывают вспомогательные функции из других модулей), для библиотек - __version__
+    '''
+    root = module_name.split(".")[0]
+    if root != __name__.split(".")[0]:
+        return str(getattr(sys.modules.get(root), "__version__", ""))
+
+    digest = blake2b(digest_size=8)
+    for name in get_module_dependencies(module_name):
+        path = getattr(sys.modules[name], "__file__", None)
+        if path is None:
+            continue
+        digest.update(name.encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+
+def get_function_key(function, config_key: str = "") -> str:
+    '''
+    Возвращает идентификатор функции узла.
+    Включает отпечаток байт-кода и версию кода модуля функции (get_module_version), чтобы после
+    изменения функции или используемых ею модулей не использовались результаты из кэша на диске
+    '''
+    module = getattr(function, "__module__", None) or ""
+    name = getattr(function, "__qualname__", repr(function))
+    version = get_module_version(module)
+    code = getattr(function, "__code__", None)
+    if code is None:
+        return f"{config_key}:{module}.{name}:{version}"
+    constants = repr([item for item in code.co_consts if not hasattr(item, "co_code")])
+    code_digest = blake2b(code.co_code + constants.encode(), digest_size=8).hexdigest()
+    return f"{config_key}:{module}.{name}:{code_digest}:{version}"
+
+
+
+class ResultCache:
+    """
+    Кэш результатов узла по отпечатку входных данных
+
+    max_entries - сколько последних результатов хранить
+    hits, misses - счетчики попаданий и промахов
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+
+    def get(self, fingerprint: Optional[str]) -> Optional[Dict]:
+        '''
+        Возвращает сохраненный результат или None
+        '''
+        if fingerprint is None or fingerprint not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(fingerprint)
+        return self.entries[fingerprint]
+
+
+    def put(self, fingerprint: Optional[str], result: Dict) -> None:
+        '''
+        Сохраняет результат
+        '''
+        if fingerprint is None or self.max_entries <= 0:
+            return
+        self.entries[fingerprint] = result
+        self.entries.move_to_end(fingerprint)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+    def trim(self, keep_result: Optional[Dict] = None) -> None:
+        '''
+        Удаляет сохраненные результаты, кроме keep_result (текущего результата узла)
+        '''
+        for fingerprint, result in list(self.entries.items()):
+            if result is not keep_result:
+                self.entries.pop(fingerprint, None)
+
+
+    def clear(self) -> None:
+        '''
+        Очищает кэш
+        '''
+        self.entries.clear()
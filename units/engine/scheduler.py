@@ -0,0 +1,102 @@
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from collections import deque
+
+
+
+class ThreadPoolScheduler:
+    """
+    Планировщик вычисления графа
+
+    Узлы, не зависящие друг от друга, вычисляются одновременно в пуле потоков.
+    Большинство функций узлов работают в OpenCV и NumPy, которые отпускают GIL,
+    поэтому независимые ветви графа выполняются параллельно
+
+    max_workers - количество потоков (1 - последовательное вычисление в текущем потоке)
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers
+        self.executor: Optional[ThreadPoolExecutor] = None
+
+
+    def get_executor(self) -> Optional[ThreadPoolExecutor]:
+        '''
+        Возвращает пул потоков (создается при первом обращении)
+        '''
+        if self.max_workers == 1:
+            return None
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(
+                max_workers = self.max_workers,
+                thread_name_prefix = "node_calculation"
+            )
+        return self.executor
+
+
+    def shutdown(self) -> None:
+        '''
+        Останавливает пул потоков
+        '''
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+
+    def run(
+        self,
+        nodes: Iterable[Hashable],
+        graph: Dict[Hashable, List[Hashable]],
+        calculate: Callable[[Hashable], Any],
+        on_done: Callable[[Hashable, Any], None] = None
+    ) -> Dict[Hashable, Any]:
+        '''
+        Вычисляет узлы nodes с учетом зависимостей из graph (узел -> список зависимых узлов).
+
+        calculate(node) вызывается в пуле потоков, как только вычислены все узлы, от которых он зависит.
+        on_done(node, result) вызывается в текущем потоке до запуска зависимых узлов
+        '''
+        nodes = list(nodes)
+        in_degree = {node: 0 for node in nodes}
+        for node in nodes:
+            for neighbor in graph.get(node, []):
+                if neighbor in in_degree:
+                    in_degree[neighbor] += 1
+
+        ready = deque(node for node in nodes if in_degree[node] == 0)
+        results = {}
+
+        def complete(node: Hashable, result: Any) -> None:
+            results[node] = result
+            if on_done is not None:
+                on_done(node, result)
+            for neighbor in graph.get(node, []):
+                if neighbor in in_degree:
+                    in_degree[neighbor] -= 1
+                    if in_degree[neighbor] == 0:
+                        ready.append(neighbor)
+
+        executor = self.get_executor()
+        if executor is None:
+            while ready:
+                node = ready.popleft()
+                complete(node, calculate(node))
+        else:
+            futures: Dict[Future, Hashable] = {}
+            try:
+                while ready or futures:
+                    while ready:
+                        node = ready.popleft()
+                        futures[executor.submit(calculate, node)] = node
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        node = futures.pop(future)
+                        complete(node, future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        if len(results) != len(nodes):
+            raise ValueError("Граф содержит циклы, вычисление невозможно")
+        return results
@@ -5,14 +5,20 @@ if TYPE_CHECKING:
     from .node_connection import NodeConnection
 
 from .node_config import NodeConfig
-from ..calculation_functions import NodeResult
 from ..result_area import ResultView
 from .node_view import NodeView
+from ..engine import get_signature_type_hints, BindingPlan
+from ..engine.process_pool import call_node_function
+from ..engine.disk_cache import disk_cache
+from ..data_types import ParameterConnectType
+from ..engine.result_cache import (
+    ResultCache, fingerprint_value, make_fingerprint, get_function_key, unique_fingerprint
+)
 
 from flet import *
 from itertools import count
-from typing import List, Dict, Any, get_type_hints
-from inspect import signature
+from typing import List, Dict, Any, Tuple
+from time import perf_counter
 import keyboard
 
 
@@ -78,6 +84,12 @@ class Node(GestureDetector):
         self.is_open = True
         self.is_selected = False
         self.is_processing = False
+        self.generation = 0
+        self.is_dirty = True
+        self.is_preview_displayed = False
+        self.is_pinned = False
+        self.last_used_time: float = 0
+        self.calculation_time: float = 0
         self.is_display_result = self.config.is_display_result
 
         self.name = self.config.name
@@ -89,6 +101,12 @@ class Node(GestureDetector):
 
         self.function = self.config.function
         self.function_signature = self.get_signature_type_hints()
+        self.function_key = get_function_key(self.function, self.config.key)
+        self.binding_plan = BindingPlan(self.function_signature, self.is_display_result)
+
+        self.result: Dict = None
+        self.result_fingerprint: str = None
+        self.result_cache = ResultCache()
 
         self.parameters_results_view_dict: Dict = {
             param.key: None
@@ -177,20 +195,15 @@ class Node(GestureDetector):
         is_init: bool = False
     ) -> None:
         '''
-        Вычисляет значение функции
+        Вычисляет значение функции.
+        Результаты фонового пересчета этого узла и зависимых от него узлов,
+        запущенного раньше, отбрасываются (их поколение устаревает)
         '''
+        self.node_area.recalculation.cancel(self)
         self.set_processing_state(is_processing = True, is_init = is_init)
 
-        # try:
-        valid_parameters = self._get_valid_parameters()
-        self.result: Dict = self.function(**valid_parameters)
-        # except Exception as e:
-        #     self.result = {"error": str(e)}
-        self.set_result_to_out_parameters()
-        print(self.id, self.name, self.result) # ОТЛАДКА TEST
-
-        if self.is_display_result:
-            self.display_result()
+        self.apply_result(*self.compute_result())
+        self.node_area.memory.update()
 
         self.set_processing_state(is_processing = False, is_init = is_init)
 
@@ -198,6 +211,94 @@ class Node(GestureDetector):
             self.node_area.recalculate_dependent_nodes(self)
 
 
+    def request_calculation(self) -> None:
+        '''
+        Запускает пересчет узла и зависимых узлов в фоновом потоке
+        '''
+        self.node_area.request_recalculation(self)
+
+
+    def request_preview(self, key: str, value: Any) -> None:
+        '''
+        Запускает предпросмотр зависимых узлов с новым значением параметра key
+        '''
+        self.node_area.preview.request(self, key, value)
+
+
+    def compute_result(self) -> Tuple[str, Dict, float]:
+        '''
+        Вычисляет значение функции, не изменяя состояние узла и интерфейс
+        (может выполняться в пуле потоков, результат устаревшего запуска просто отбрасывается).
+        Возвращает отпечаток входных данных, результат и время вычисления
+        (None, если результат взят из кэша)
+        '''
+        # Если входные данные не изменились, результат берется из кэша
+        fingerprint = self.get_fingerprint()
+        result = self.result_cache.get(fingerprint)
+        calculation_time = None
+
+        if result is None:
+            result = disk_cache.get(fingerprint)
+
+        if result is None:
+            # try:
+            start_time = perf_counter()
+            valid_parameters = self._get_valid_parameters()
+            result = call_node_function(
+                self.function, valid_parameters, self.config.run_in_process
+            )
+            calculation_time = perf_counter() - start_time
+            disk_cache.put(fingerprint, result, calculation_time)
+            # except Exception as e:
+            #     result = {"error": str(e)}
+        return fingerprint, result, calculation_time
+
+
+    def apply_result(self, fingerprint: str, result: Dict, calculation_time: float = None) -> None:
+        '''
+        Сохраняет результат, передает его в выходные параметры и отображает его
+        '''
+        is_result_changed = result is not self.result
+        self.result_cache.put(fingerprint, result)
+        self.result = result
+        self.result_fingerprint = fingerprint or unique_fingerprint()
+        self.is_dirty = False
+        self.last_used_time = perf_counter()
+        if calculation_time is not None:
+            self.calculation_time = calculation_time
+
+        if is_result_changed or self.is_preview_displayed:
+            self.set_result_to_out_parameters()
+            print(self.id, self.name, self.result) # ОТЛАДКА TEST
+
+            if self.is_display_result:
+                self.display_result()
+
+
+    def release_result(self) -> None:
+        '''
+        Освобождает результат узла, чтобы уменьшить занятую память.
+        Узел помечается требующим пересчета и вычисляется заново, когда понадобится.
+        Отпечаток результата сохраняется, поэтому зависимые узлы не пересчитываются
+        '''
+        self.result_cache.clear()
+        for key in self.result or {}:
+            parameter = self.parameters_dict.get(key)
+            if parameter is not None and parameter._connect_type == ParameterConnectType.OUT:
+                parameter.value = None
+        self.result = None
+        self.is_dirty = True
+
+
+    def toggle_pin(self, e = None) -> None:
+        '''
+        Закрепляет результат узла в памяти (или снимает закрепление)
+        '''
+        self.is_pinned = not self.is_pinned
+        self.node_view.set_pin_style()
+        self.update()
+
+
     def set_result_to_out_parameters(self) -> None:
         '''
         Устанавливает значение выходного параметра
@@ -211,74 +312,62 @@ class Node(GestureDetector):
         '''
         Возвращает типы параметров функции
         '''
-        if self.function is None:
-            return {}
-        type_hints = get_type_hints(self.function)
-        type_hints.pop('return', None)
-        return {
-            name: type_hints.get(name)
-            for name in signature(self.function).parameters
-        }
+        return get_signature_type_hints(self.function)
     
 
-    def _get_valid_parameters(self) -> dict:
-        '''Возвращает текущие значения параметров функции с учетом сигнатуры функции'''
-        valid_parameters = {}
+    def get_fingerprint(self) -> str:
+        '''
+        Возвращает отпечаток текущих входных данных или None, если результат нельзя кэшировать
+        '''
+        if not self.config.is_cacheable:
+            return None
+        tokens = {}
         for name in self.function_signature:
-            value = self.parameters_dict[name].value
-
-            if self.parameters_dict[name].is_connected:
-                connect: "NodeConnection" = self.parameters_dict[name].connect_point.current_connect
-                
-                if connect is None:
-                    value = self.parameters_dict[name].value
-                else:
-                    value = connect.from_param.value
-
-            if self.is_valid_parameter(name, value):
-                valid_parameters[name] = self.get_parameter_value(value)
-        
-        if len(valid_parameters) != len(self.function_signature):
-            raise ValueError(
-                "Количество параметров не совпадает, "
-                + f"ожидалось {len(self.function_signature)} и получено {len(valid_parameters)}\n"
-                + f"\nПараметры: {self.function_signature}"
-                + f"\nВалидные: {valid_parameters}"
+            parameter = self.parameters_dict[name]
+            connect: "NodeConnection" = (
+                parameter.connect_point.current_connect
+                if parameter.is_connected else None
             )
-        return valid_parameters
-    
+            if connect is None:
+                tokens[name] = fingerprint_value(parameter.value)
+            elif connect.from_node.result_fingerprint is None:
+                tokens[name] = None
+            else:
+                tokens[name] = f"{connect.from_node.result_fingerprint}:{connect.from_param._key}"
+        return make_fingerprint(self.function_key, tokens)
+
 
-    def get_parameter_value(self, value: Any) -> Any:
+    def _get_input_value(self, name: str) -> Any:
         '''
-        Возвращает значение параметра
+        Возвращает значение параметра name с учетом подключения
         '''
-        if isinstance(value, NodeResult) and not self.is_display_result:
-            return value.value
-        return value
-    
+        parameter = self.parameters_dict[name]
+        if parameter.is_connected:
+            connect: "NodeConnection" = parameter.connect_point.current_connect
+            if connect is not None:
+                connect.from_node.last_used_time = perf_counter()
+                return connect.from_param.value
+        return parameter.value
+
 
-    def is_valid_parameter(self, name: str, value) -> bool:
+    def _get_valid_parameters(self) -> dict:
         '''
-        Возвращает True, если параметр имеет допустимый тип
+        Возвращает текущие значения параметров функции по плану передачи параметров
         '''
-        if (
-            (
-                self.function_signature[name] in [bool, int, str]
-                and not type(value) == self.function_signature[name]
-            ) or (
-                self.function_signature[name] in [float]
-                and not isinstance(value, (float, int))
-            )
-        ):
-            raise TypeError(f"Тип параметра {name} должен быть типа {self.function_signature[name]}, а не {type(value)}")
-        return True
+        return self.binding_plan.bind(self._get_input_value)
     
 
-    def display_result(self) -> None:
+    def display_result(self, results: Dict = None, is_preview: bool = False) -> None:
         '''
         Отображает значение выходного параметра
+        (results - результат для отображения, по умолчанию self.result;
+        is_preview - результат предпросмотра в уменьшенном разрешении)
         '''
-        for param_key, result in self.result.items():
+        self.is_preview_displayed = is_preview
+        if results is None:
+            results = self.result
+
+        for param_key, result in results.items():
             if param_key not in self.parameters_results_view_dict:
                 continue
             
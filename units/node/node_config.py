@@ -26,6 +26,10 @@ class NodeConfig:
     function - функция узла
     parameters - параметры узла
     is_display_result - показывать ли результат узла (используется для узла отображения результата)
+    is_cacheable - можно ли повторно использовать результат при неизменных входных данных
+                   (False для функций со случайным результатом)
+    run_in_process - выполнять функцию в пуле процессов (для функций на чистом Python,
+                     которые удерживают GIL); функция должна быть объявлена на уровне модуля
     """
 
     key: str                = "unknown"
@@ -40,6 +44,8 @@ class NodeConfig:
     function: Callable      = lambda: {}
     parameters: List["ParameterConfigInterface"] = field(default_factory=list)
     is_display_result: bool = False
+    is_cacheable: bool      = True
+    run_in_process: bool    = False
     
     
     def __post_init__(self):
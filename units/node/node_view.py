@@ -36,6 +36,7 @@ class NodeView(Stack):
     NODE_SHADOW_COLOR = colors.BLACK38
 
     HEADER_ICON_COLOR = colors.WHITE
+    HEADER_PIN_COLOR = colors.DEEP_ORANGE_ACCENT_400
     HEADER_SHADOW_COLOR = colors.BLACK26
 
     def __init__(
@@ -130,6 +131,17 @@ class NodeView(Stack):
             max_lines = 1,
             text_align = TextAlign.CENTER,
         )
+        self.ref_pin_button = Ref[IconButton]()
+        pin_button = IconButton(
+            ref = self.ref_pin_button,
+            icon = icons.PUSH_PIN_OUTLINED,
+            icon_color = self.HEADER_ICON_COLOR,
+            on_click = self.node.toggle_pin,
+            icon_size = 15,
+            tooltip = "Закрепить результат в памяти",
+            # Результаты отображаемых узлов не освобождаются
+            visible = not self.node.is_display_result,
+        )
         delete_button = IconButton(
             icon = icons.CLOSE,
             icon_color = self.HEADER_ICON_COLOR,
@@ -142,6 +154,7 @@ class NodeView(Stack):
                 controls = [
                     collapse_button,
                     name_text,
+                    pin_button,
                     delete_button
                 ],
                 alignment = MainAxisAlignment.SPACE_BETWEEN,
@@ -385,4 +398,13 @@ class NodeView(Stack):
             conteiner.bgcolor = self.NODE_BGCOLOR
             conteiner.border = border.all(self.BORDER_WIDTH, self.NODE_BORDER_COLOR)
             self.node.node_area.remove_selection_node(self.node)
-    
\ No newline at end of file
+    
+
+
+    def set_pin_style(self) -> None:
+        """
+        Отображает закрепление результата узла в памяти
+        """
+        pin_button: IconButton = self.ref_pin_button.current
+        pin_button.icon = icons.PUSH_PIN if self.node.is_pinned else icons.PUSH_PIN_OUTLINED
+        pin_button.icon_color = self.HEADER_PIN_COLOR if self.node.is_pinned else self.HEADER_ICON_COLOR
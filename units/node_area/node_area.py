@@ -5,22 +5,36 @@ if TYPE_CHECKING:
 from .node_area_background_grid import NodeAreaBackgroundGrid
 from .node_area_selection_box import NodeAreaSelectionBox
 from .node_area_connections import NodeAreaConnections
+from .node_area_recalculation import NodeAreaRecalculation
+from .node_area_preview import NodeAreaPreview
+from .node_area_memory import NodeAreaMemory
 from ..node import Node, NodeConfig, NodeConnection
 from ..result_area import ResultArea
 from ..statistics_panel import StatisticsPanel
+from ..engine import ThreadPoolScheduler, GraphIndex
+from ..calculation_functions import copy_statistics
 
 from flet import *
 import flet.canvas as cv
-from typing import Union, List, Dict
-from collections import defaultdict, deque
+from typing import Union, List, Dict, Set
 
 
 
 class NodeArea(GestureDetector):
     """
     Область работы с нодами
+
+    MAX_CALCULATION_WORKERS - количество потоков для пересчета независимых узлов
+                              (None - по числу процессоров)
+    LAZY_EVALUATION - вычислять только узлы, от которых зависят отображаемые результаты
+                      (остальные узлы помечаются is_dirty и вычисляются, когда понадобятся)
+    graph_index - индекс связей между узлами, хранит найденные циклы
+    memory - учет памяти результатов узлов (освобождает промежуточные результаты сверх бюджета)
     """
 
+    MAX_CALCULATION_WORKERS: int = None
+    LAZY_EVALUATION: bool = True
+
     def __init__(
         self,
         page: Page,
@@ -64,8 +78,13 @@ class NodeArea(GestureDetector):
         self.canvas_connections = NodeAreaConnections(
             self.page, self, self.nodes_connects, self.canvas_connections_shapes, 
         )
+        self.graph_index = GraphIndex()
         self.stack_nodes = Stack(self.nodes)
         self.canvas_selection_box = NodeAreaSelectionBox(self.page, self)
+        self.scheduler = ThreadPoolScheduler(self.MAX_CALCULATION_WORKERS)
+        self.recalculation = NodeAreaRecalculation(self)
+        self.preview = NodeAreaPreview(self)
+        self.memory = NodeAreaMemory(self)
 
         self.drag_interval = 20
         self.on_tap = lambda e: self.clear_selection()
@@ -82,6 +101,7 @@ class NodeArea(GestureDetector):
         update_selected: bool = False,
         update_scale: bool = False,
         update_edges: bool = False,
+        update_memory: bool = False,
         cycles: List[List[Node]] = None
     ):
         """
@@ -95,6 +115,11 @@ class NodeArea(GestureDetector):
             self.node_area_statistics.update_text("scale", self.current_scale)
         if update_edges or update_all:
             self.node_area_statistics.update_text("edges", len(self.nodes_connects))
+        if update_memory or update_all:
+            self.node_area_statistics.update_text("memory", self.memory.total_bytes)
+            self.node_area_statistics.update_text(
+                "copies", (copy_statistics.copies, copy_statistics.copied_bytes)
+            )
         if cycles is not None or update_all:
             if update_all:
                 cycles = self.find_cycles()
@@ -107,10 +132,12 @@ class NodeArea(GestureDetector):
         """
         node_count = ref_text_counter.current.data
         for _ in range(node_count):
-            self.nodes.append(Node(
+            node = Node(
                 page=self.page, node_area=self,
                 scale=self.current_scale, config=config
-            ))
+            )
+            self.nodes.append(node)
+            self.graph_index.add_node(node)
         self.stack_nodes.update()
         self.update_stats(update_nodes = True)
 
@@ -135,6 +162,7 @@ class NodeArea(GestureDetector):
 
             self.nodes.remove(node)
         
+        self.memory.update()
         self.workplace.result_area.update()
         self.stack_nodes.update()
         self.canvas_connections.update_connects_lines()
@@ -288,35 +316,69 @@ class NodeArea(GestureDetector):
         self.stack_nodes.update()
     
 
+    def request_recalculation(self, start_node: Node) -> None:
+        '''
+        Запрашивает фоновый пересчет узла и зависимых от него узлов
+        '''
+        self.recalculation.request(start_node)
+
+
     def recalculate_dependent_nodes(self, start_node: List[Node] = None):
         '''
-        Пересчитывает зависимые узлы или все если start_node не указан
+        Пересчитывает зависимые узлы или все если start_node не указан.
+        Независимые ветви вычисляются параллельно в пуле потоков,
+        результаты отображаются в текущем потоке
         '''
-        recalculate_node_queue: List[Node] = (
-            self.topological_sort_all(node)
+        dependent_nodes: List[Node] = (
+            self.topological_sort_all()
             if start_node is None
             else self.topological_sort_from_node(start_node)
         )
         
-        cycles = self.find_cycles()
-        self.update_stats(cycles=cycles)
-        if len(cycles) != 0:
+        self.update_stats(cycles=self.find_cycles())
+        if self.graph_index.has_cycles():
             return
-        
+
+        for node in dependent_nodes:
+            node.is_dirty = True
+        recalculate_node_queue = self.graph_index.sort_nodes(self.get_demanded_nodes(dependent_nodes))
+
+        def on_node_done(node: Node, computed_result: tuple) -> None:
+            node.apply_result(*computed_result)
+            node.set_processing_state(is_processing = False)
+
         for node in recalculate_node_queue:
-            node.calculate(is_recalculate_dependent_nodes=False)
+            node.set_processing_state(is_processing = True)
+
+        self.scheduler.run(
+            nodes = recalculate_node_queue,
+            graph = self.get_graph(recalculate_node_queue),
+            calculate = lambda node: node.compute_result(),
+            on_done = on_node_done,
+        )
+        self.memory.update()
+
+
+    def get_demanded_nodes(self, changed_nodes: List[Node]) -> Set[Node]:
+        '''
+        Возвращает узлы, которые нужно вычислить после изменения changed_nodes:
+        при ленивом вычислении - только требующие пересчета узлы,
+        от которых зависят отображаемые результаты среди changed_nodes
+        '''
+        if not self.LAZY_EVALUATION:
+            # Узлы, результат которых был освобожден (NodeAreaMemory), вычисляются заново
+            return self.graph_index.get_upstream(changed_nodes, lambda node: node.is_dirty)
+        return self.graph_index.get_upstream(
+            [node for node in changed_nodes if node.is_display_result],
+            lambda node: node.is_dirty
+        )
 
 
-    def get_graph(self) -> Dict[Node, List[Node]]:
+    def get_graph(self, nodes: List[Node] = None) -> Dict[Node, List[Node]]:
         """
-        Функция для создания графа из списка связей
+        Возвращает граф смежности узлов (для nodes или для всех узлов)
         """
-        graph = {}
-        for connect in self.nodes_connects:
-            if connect.from_node not in graph:
-                graph[connect.from_node] = []
-            graph[connect.from_node].append(connect.to_node)
-        return graph
+        return self.graph_index.get_graph(nodes)
 
 
     def topological_sort_from_node(self, start_node) -> List[Node]:
@@ -324,129 +386,32 @@ class NodeArea(GestureDetector):
         Выполняет топологическую сортировку для заданного исходного узла
         Возвращает список узлов в топологическом порядке начиная со следающего после start_node
         """
-        graph = self.get_graph()
-
-        if self.has_cycle(graph, start_node):
+        result = self.graph_index.sort_downstream([start_node])
+        if result is None:
             return None
-
-        # Функция для рекурсивной топологической сортировки
-        def dfs(node, visited, result):
-            visited.add(node)
-            if node in graph:
-                for neighbor in graph[node]:
-                    if neighbor not in visited:
-                        dfs(neighbor, visited, result)
-            result.append(node)
-
-        result = []
-        visited = set()
-        dfs(start_node, visited, result)
-
-        return result[::-1][1:]
+        return [node for node in result if node != start_node]
     
 
     def topological_sort_all(self) -> List[Node]:
         """
-        Выполняет топологическую сортировку алгоритм Кана для определения
-        оптимального порядка обновления функций для всех узлов в графе 
+        Возвращает порядок обновления функций для всех узлов в графе
+        (кэшируется индексом связей до изменения соединений)
         """
-        # Инициализация словаря для хранения входящих рёбер для каждого узла
-        in_degree = defaultdict(int)
-        # Инициализация словаря для хранения списка смежных узлов для каждого узла
-        graph = defaultdict(list)
-        
-        # Заполнение словарей на основе связей
-        for connect in self.nodes_connects:
-            graph[connect.from_node].append(connect.to_node)
-            in_degree[connect.to_node] += 1
-        
-        # Инициализация списка узлов без входящих рёбер
-        zero_in_degree_nodes = deque([node for node in graph if in_degree[node] == 0])
-        
-        # Процесс топологической сортировки
-        result = []
-        while zero_in_degree_nodes:
-            node = zero_in_degree_nodes.popleft()
-            result.append(node)
-            for neighbor in graph[node]:
-                in_degree[neighbor] -= 1
-                if in_degree[neighbor] == 0:
-                    zero_in_degree_nodes.append(neighbor)
-        
-        # Проверка наличия цикла
-        if len(result) != len(graph):
-            return None  # Граф содержит цикл
-        else:
-            return result  # Топологическая сортировка выполнена успешно
+        return self.graph_index.get_topological_order()
         
 
-    def has_cycle(self, graph: Dict[Node, List[Node]] = None, start_node: Node = None) -> bool:
+    def has_cycle(self, start_node: Node = None) -> bool:
         """
-        Проверяет наличие циклов в графе с использованием алгоритма поиска в глубину (DFS).
+        Проверяет наличие циклов в графе (или достижимых из start_node)
         """
-        # Функция для поиска циклов
-        def dfs(node):
-            if node in on_path:
-                return True
-            if node in visited:
-                return False
-
-            visited.add(node)
-            on_path.add(node)
-
-            if node in graph:
-                for neighbor in graph[node]:
-                    if dfs(neighbor):
-                        return True
-
-            on_path.remove(node)
-            return False
-
-        if graph is None:
-            graph = self.get_graph()
-
-        # Маркеры для отслеживания посещенных узлов и узлов на текущем пути
-        visited = set()
-        on_path = set()
-
-        # Запускаем поиск в глубину из каждого узла графа
         if start_node is None:
-            for node in graph:
-                if dfs(node):
-                    return True
-        else:
-            if dfs(start_node):
-                return True
-
-        return False
+            return self.graph_index.has_cycles()
+        return self.graph_index.has_cycle_from([start_node])
     
 
-    def find_cycles(self, graph: Dict[Node, List[Node]] = None) -> List[List[Node]]:
+    def find_cycles(self) -> List[List[Node]]:
         """
-        Функция для поиска всех циклов в графе
+        Возвращает циклы графа (компоненты сильной связности).
+        Циклы отслеживаются индексом graph_index при изменении связей
         """
-        if graph is None:
-            graph = self.get_graph()
-
-        def dfs(node, visited, current_path):
-            visited[node] = True
-            current_path.append(node)
-            
-            if node in graph:
-                for neighbor in graph[node]:
-                    if neighbor not in current_path:
-                        if neighbor not in visited:
-                            dfs(neighbor, visited, current_path)
-                    else:
-                        index = current_path.index(neighbor)
-                        cycle = current_path[index:]
-                        cycles.append(cycle)
-            
-            current_path.pop()
-        
-        cycles = []
-        visited = {}
-        for node in graph:
-            if node not in visited:
-                dfs(node, visited, [])
-        return cycles
\ No newline at end of file
+        return self.graph_index.get_cycles()
@@ -6,7 +6,7 @@ if TYPE_CHECKING:
 
 from flet import *
 import flet.canvas as cv
-from typing import List
+from typing import Callable, List
 
 
 
@@ -35,9 +35,10 @@ class NodeAreaConnections(cv.Canvas):
         """
         self.shapes.append(node_connection.connect_path)
         self.nodes_connects.append(node_connection)
+        self.node_area.graph_index.add_edge(node_connection.from_node, node_connection.to_node)
 
         self.update()
-        self.node_area.update_stats(update_edges = True)
+        self.node_area.update_stats(update_edges = True, cycles = self.node_area.find_cycles())
 
 
     def remove_node_connect(self, node_connection: "NodeConnection") -> None:
@@ -46,9 +47,10 @@ class NodeAreaConnections(cv.Canvas):
         """
         self.shapes.remove(node_connection.connect_path)
         self.nodes_connects.remove(node_connection)
+        self.node_area.graph_index.remove_edge(node_connection.from_node, node_connection.to_node)
 
         self.update()
-        self.node_area.update_stats(update_edges = True)
+        self.node_area.update_stats(update_edges = True, cycles = self.node_area.find_cycles())
 
 
     def delete_nodes_connects(self, nodes_to_delete: list["Node"]) -> None:
@@ -82,9 +84,23 @@ class NodeAreaConnections(cv.Canvas):
             if is_delete:
                 self.shapes.remove(connect.connect_path)
                 self.nodes_connects.remove(connect)
+                self.node_area.graph_index.remove_edge(connect.from_node, connect.to_node)
+
+        for node in nodes_to_delete:
+            self.node_area.graph_index.remove_node(node)
 
         for node in node_to_recalculate:
-            node.calculate()
+            node.request_calculation()
+
+
+    def reconnect_node_connect(self, node_connection: "NodeConnection", change: Callable[[], None]) -> None:
+        """
+        Изменить источник или приемник соединения (change) с обновлением индекса связей
+        """
+        self.node_area.graph_index.remove_edge(node_connection.from_node, node_connection.to_node)
+        change()
+        self.node_area.graph_index.add_edge(node_connection.from_node, node_connection.to_node)
+        self.node_area.update_stats(cycles = self.node_area.find_cycles())
 
 
     def update_connects_lines(self, selected_only = False):
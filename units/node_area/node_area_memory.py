@@ -0,0 +1,174 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .node_area import NodeArea
+    from ..node.node import Node
+
+from ..calculation_functions import NodeResult, Signal
+
+from typing import Any, Dict, List, Set
+from threading import RLock
+from time import perf_counter
+
+import numpy as np
+
+
+
+def get_value_nbytes(value: Any, seen: Set[int]) -> int:
+    '''
+    Возвращает объем памяти массивов в значении (в том числе внутри NodeResult, словарей и списков).
+    Массивы, ссылающиеся на одну память, учитываются один раз (seen - id уже учтенных буферов).
+    Для графиков matplotlib учитывается размер растрового изображения
+    '''
+    if isinstance(value, np.ndarray):
+        base = value
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if id(base) in seen:
+            return 0
+        seen.add(id(base))
+        return base.nbytes
+    if isinstance(value, NodeResult):
+        return get_value_nbytes(value.value, seen)
+    if isinstance(value, Signal):
+        return get_value_nbytes(value.x, seen) + get_value_nbytes(value.values, seen)
+    if isinstance(value, dict):
+        return sum(get_value_nbytes(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(get_value_nbytes(item, seen) for item in value)
+    if isinstance(value, (bytes, str)):
+        return len(value)
+    if hasattr(value, "get_size_inches") and hasattr(value, "dpi"):
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        width, height = value.get_size_inches() * value.dpi
+        return int(width * height * 4)
+    return 0
+
+
+
+class NodeAreaMemory:
+    """
+    Учет памяти, занятой результатами узлов и их кэшами (ResultCache)
+
+    Суммарный объем результатов показывается на панели статистики.
+    Когда он превышает MEMORY_BUDGET, сначала очищаются кэши предыдущих результатов узлов
+    (в том числе отображаемых и закрепленных), затем освобождаются промежуточные результаты,
+    которые можно вычислить заново: в первую очередь большие, давно не использованные и быстро
+    вычисляемые (приоритет - размер * время с последнего использования / время вычисления).
+    Не освобождаются результаты отображаемых и закрепленных узлов, узлов со случайным результатом
+    (is_cacheable=False) и результаты, которые сейчас нужны для пересчета.
+    Освобожденный узел помечается is_dirty и вычисляется заново, когда понадобится.
+    Подсчет выполняется один раз после каждого пересчета узлов, а не после каждого узла
+
+    MEMORY_BUDGET - допустимый объем результатов (байт, None - без ограничения)
+    MIN_CALCULATION_TIME - время вычисления, меньше которого узлы считаются одинаково дешевыми (сек)
+    total_bytes - объем результатов при последнем подсчете
+    """
+
+    MEMORY_BUDGET: int = 2 * 1024 ** 3
+    MIN_CALCULATION_TIME: float = 0.01
+
+    def __init__(self, node_area: "NodeArea"):
+        self.node_area: "NodeArea" = node_area
+        self.lock = RLock()
+        self.total_bytes = 0
+
+
+    def is_protected(self, node: "Node") -> bool:
+        '''
+        Возвращает True, если результат узла нельзя освободить
+        '''
+        return (
+            node.is_display_result
+            or node.is_pinned
+            or node.is_processing
+            or not node.config.is_cacheable
+        )
+
+
+    def get_needed_nodes(self) -> Set["Node"]:
+        '''
+        Возвращает узлы, результаты которых нужны узлам, которые сейчас вычисляются
+        '''
+        return self.node_area.graph_index.get_upstream(
+            [node for node in self.node_area.nodes if node.is_processing]
+        )
+
+
+    def get_nodes_nbytes(self, seen: Set[int]) -> Dict["Node", int]:
+        '''
+        Возвращает объем памяти, который освободится при освобождении результата каждого узла.
+        Память, общая с защищенными результатами, не учитывается
+        '''
+        nodes = [node for node in self.node_area.nodes if node.result is not None]
+        nodes_nbytes = {}
+        # Сначала учитываются защищенные результаты: их память не освобождается
+        for node in sorted(nodes, key=lambda node: not self.is_protected(node)):
+            nodes_nbytes[node] = get_value_nbytes(node.result, seen)
+        return nodes_nbytes
+
+
+    def get_caches_nbytes(self, seen: Set[int]) -> Dict["Node", int]:
+        '''
+        Возвращает объем памяти предыдущих результатов в кэше каждого узла
+        (без памяти, общей с текущими результатами узлов)
+        '''
+        return {
+            node: sum(
+                get_value_nbytes(result, seen)
+                for result in list(node.result_cache.entries.values())
+                if result is not node.result
+            )
+            for node in self.node_area.nodes
+        }
+
+
+    def get_eviction_priority(self, node: "Node", nbytes: int, now: float) -> float:
+        '''
+        Возвращает приоритет освобождения результата узла (больше - освобождается раньше)
+        '''
+        idle_time = max(now - node.last_used_time, 0) + 1
+        return nbytes * idle_time / max(node.calculation_time, self.MIN_CALCULATION_TIME)
+
+
+    def update(self) -> None:
+        '''
+        Пересчитывает объем результатов и освобождает результаты при превышении бюджета
+        '''
+        with self.lock:
+            seen: Set[int] = set()
+            nodes_nbytes = self.get_nodes_nbytes(seen)
+            caches_nbytes = self.get_caches_nbytes(seen)
+            self.total_bytes = sum(nodes_nbytes.values()) + sum(caches_nbytes.values())
+
+            if self.MEMORY_BUDGET is not None and self.total_bytes > self.MEMORY_BUDGET:
+                # Предыдущие результаты освобождаются первыми: текущие результаты не пересчитываются
+                for node in sorted(caches_nbytes, key=caches_nbytes.get, reverse=True):
+                    if self.total_bytes <= self.MEMORY_BUDGET or caches_nbytes[node] == 0:
+                        break
+                    if node.is_processing:
+                        continue
+                    node.result_cache.trim(node.result)
+                    self.total_bytes -= caches_nbytes[node]
+
+            if self.MEMORY_BUDGET is not None and self.total_bytes > self.MEMORY_BUDGET:
+                now = perf_counter()
+                needed_nodes = self.get_needed_nodes()
+                candidates: List["Node"] = sorted(
+                    (
+                        node for node, nbytes in nodes_nbytes.items()
+                        if nbytes > 0 and not self.is_protected(node)
+                    ),
+                    key=lambda node: self.get_eviction_priority(node, nodes_nbytes[node], now),
+                    reverse=True
+                )
+                for node in candidates:
+                    if self.total_bytes <= self.MEMORY_BUDGET:
+                        break
+                    if node in needed_nodes:
+                        continue
+                    node.release_result()
+                    self.total_bytes -= nodes_nbytes[node]
+
+        self.node_area.update_stats(update_memory = True)
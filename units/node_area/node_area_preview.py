@@ -0,0 +1,233 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .node_area import NodeArea
+    from ..node.node import Node
+    from ..node import NodeConnection
+
+from ..calculation_functions import NodeResult, read_file, as_native_byte_order
+from ..engine.process_pool import call_node_function
+from ..data_types import File
+
+from typing import Any, Dict, List, Set, Tuple
+from dataclasses import replace
+from threading import Thread, Lock
+from time import perf_counter, sleep
+
+import numpy as np
+import cv2
+
+
+
+def make_proxy(value: Any, scale: float, min_size: int) -> Any:
+    '''
+    Возвращает уменьшенную копию изображения (в том числе внутри NodeResult).
+    Остальные значения, а также изображения меньше min_size, возвращаются без изменений
+    '''
+    if isinstance(value, NodeResult):
+        proxy_value = make_proxy(value.value, scale, min_size)
+        return value if proxy_value is value.value else replace(value, value=proxy_value)
+    if (
+        not isinstance(value, np.ndarray)
+        or value.ndim not in (2, 3)
+        or np.iscomplexobj(value)
+        or min(value.shape[:2]) * scale < min_size
+    ):
+        return value
+
+    height, width = value.shape[:2]
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    try:
+        return cv2.resize(value, size, interpolation=cv2.INTER_AREA)
+    except cv2.error:
+        # Тип данных не поддерживается OpenCV - прореживаем
+        step = max(1, round(1 / scale))
+        return np.ascontiguousarray(value[::step, ::step])
+
+
+
+class NodeAreaPreview:
+    """
+    Предпросмотр в уменьшенном разрешении при перетаскивании числовых параметров
+
+    Зависимые узлы, ведущие к отображаемым результатам, вычисляются на уменьшенных копиях (прокси)
+    входных изображений и выбранных файлов (PROXY_SCALE от исходного размера)
+    не чаще раза в PREVIEW_INTERVAL секунд. Запросы, пришедшие чаще, не отбрасываются:
+    последний из них выполняется по истечении интервала, поэтому предпросмотр показывает
+    последнее значение параметра, даже если перетаскивание остановилось внутри интервала.
+    Результаты предпросмотра только отображаются: они не попадают в кэш, выходные параметры и result узлов.
+    Вычисление в полном разрешении выполняется обычным пересчетом после отпускания параметра
+
+    PROXY_SCALE - масштаб прокси-изображений
+    PROXY_MIN_SIZE - изображения, у которых прокси получился бы меньше, не уменьшаются
+    PREVIEW_INTERVAL - минимальный интервал между запусками предпросмотра (сек)
+    """
+
+    PROXY_SCALE: float = 0.25
+    PROXY_MIN_SIZE: int = 64
+    PREVIEW_INTERVAL: float = 0.1
+
+    def __init__(self, node_area: "NodeArea"):
+        self.node_area: "NodeArea" = node_area
+        self.lock = Lock()
+        self.thread: Thread = None
+        self.pending: Tuple["Node", str, Any] = None
+        self.generation = 0
+        self.last_run_time: float = 0
+        self.displayed_nodes: Set["Node"] = set()
+        # id декодированного файла -> (данные, прокси)
+        self.file_proxies: Dict[int, Tuple[Any, Any]] = {}
+
+
+    def request(self, node: "Node", key: str, value: Any) -> None:
+        '''
+        Запрашивает предпросмотр с новым значением value параметра key узла node
+        '''
+        with self.lock:
+            self.pending = (node, key, value)
+
+            is_need_start = self.thread is None
+            if is_need_start:
+                self.thread = Thread(target=self.run_pending, name="node_preview", daemon=True)
+
+        if is_need_start:
+            self.thread.start()
+
+
+    def finish(self, is_restore: bool) -> None:
+        '''
+        Завершает предпросмотр и отбрасывает незавершенные запуски.
+        is_restore - вернуть отображение результатов в полном разрешении
+                     (если пересчет запускаться не будет)
+        '''
+        with self.lock:
+            self.pending = None
+            self.generation += 1
+            self.last_run_time = 0
+            self.file_proxies = {}
+            displayed_nodes, self.displayed_nodes = self.displayed_nodes, set()
+
+        if is_restore:
+            for node in displayed_nodes:
+                if node.result is not None:
+                    node.display_result()
+
+
+    def run_pending(self) -> None:
+        '''
+        Выполняет последний запрос предпросмотра, пока они есть (в фоновом потоке).
+        Между запусками выдерживается PREVIEW_INTERVAL
+        '''
+        while True:
+            with self.lock:
+                if self.pending is None:
+                    self.thread = None
+                    return
+                delay = self.last_run_time + self.PREVIEW_INTERVAL - perf_counter()
+                if delay <= 0:
+                    (node, key, value), self.pending = self.pending, None
+                    generation = self.generation
+                    self.last_run_time = perf_counter()
+
+            if delay > 0:
+                # За время ожидания запрос может смениться более новым
+                sleep(delay)
+                continue
+
+            try:
+                self.run(node, key, value, generation)
+            except Exception as e:
+                # Ошибки предпросмотра не мешают работе, результат будет получен при отпускании
+                print(f"Ошибка предпросмотра: {e}")
+
+
+    def is_cancelled(self, generation: int) -> bool:
+        '''
+        Возвращает True, если запуск устарел (предпросмотр завершен).
+        Запуск, во время которого пришел новый запрос, завершается: новый запрос выполнится следом
+        '''
+        return generation != self.generation
+
+
+    def get_plan(self, start_node: "Node") -> List["Node"]:
+        '''
+        Возвращает зависимые от start_node узлы, которые ведут к отображаемым результатам
+        '''
+        graph_index = self.node_area.graph_index
+        downstream = graph_index.get_downstream([start_node])
+        plan = graph_index.get_upstream(
+            [node for node in downstream if node.is_display_result],
+            lambda node: node in downstream
+        )
+        return graph_index.sort_nodes(plan) or []
+
+
+    def get_input_value(
+        self,
+        node: "Node",
+        name: str,
+        preview_results: Dict["Node", Dict]
+    ) -> Any:
+        '''
+        Возвращает значение входного параметра для предпросмотра
+        '''
+        parameter = node.parameters_dict[name]
+        connect: "NodeConnection" = (
+            parameter.connect_point.current_connect
+            if parameter.is_connected else None
+        )
+        if connect is None:
+            if isinstance(parameter.value, File):
+                return self.get_file_proxy(parameter.value)
+            return parameter.value
+        if connect.from_node in preview_results:
+            return preview_results[connect.from_node].get(connect.from_param._key)
+        return make_proxy(connect.from_param.value, self.PROXY_SCALE, self.PROXY_MIN_SIZE)
+
+
+    def get_file_proxy(self, file: File) -> Any:
+        '''
+        Возвращает прокси изображения из файла (файл читается через кэш декодированных файлов).
+        Если файл не является изображением или прокси не нужен, возвращается сам файл
+        '''
+        try:
+            data = read_file(file, is_lazy=True)
+        except ValueError:
+            return file
+        with self.lock:
+            cached = self.file_proxies.get(id(data))
+        if cached is not None and cached[0] is data:
+            return cached[1]
+
+        proxy = make_proxy(as_native_byte_order(data), self.PROXY_SCALE, self.PROXY_MIN_SIZE)
+        if not isinstance(proxy, np.ndarray) or proxy.shape == data.shape:
+            proxy = file
+        with self.lock:
+            self.file_proxies[id(data)] = (data, proxy)
+        return proxy
+
+
+    def run(self, start_node: "Node", key: str, value: Any, generation: int) -> None:
+        '''
+        Вычисляет и отображает предпросмотр
+        '''
+        preview_results: Dict["Node", Dict] = {}
+        for node in self.get_plan(start_node):
+            if self.is_cancelled(generation):
+                return
+
+            parameters = node.binding_plan.bind(
+                lambda name: (
+                    value if node == start_node and name == key
+                    else self.get_input_value(node, name, preview_results)
+                )
+            )
+
+            result = call_node_function(node.function, parameters, node.config.run_in_process)
+            preview_results[node] = result
+
+            if node.is_display_result:
+                with self.lock:
+                    if self.is_cancelled(generation):
+                        return
+                    node.display_result(result, is_preview=True)
+                    self.displayed_nodes.add(node)
@@ -0,0 +1,143 @@
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .node_area import NodeArea
+    from ..node.node import Node
+
+from typing import Dict, Set, Tuple
+from threading import Thread, Lock
+import traceback
+
+
+
+class NodeAreaRecalculation:
+    """
+    Фоновый пересчет узлов
+
+    Пересчет выполняется в отдельном потоке и не блокирует обработчики событий flet.
+    Каждый запрос увеличивает номер поколения (generation) у узла и всех зависимых от него узлов
+    и помечает их как требующие пересчета (is_dirty), а вычисляются только узлы,
+    нужные для отображаемых результатов (NodeArea.get_demanded_nodes).
+    Поэтому узлы устаревшего запуска, который еще выполняется, пропускаются,
+    а уже полученные для них результаты отбрасываются.
+    Запросы, пришедшие во время пересчета, объединяются в один следующий запуск.
+    Синхронный пересчет (Node.calculate) тоже увеличивает поколения (invalidate),
+    поэтому фоновый запуск не перезапишет более новый результат
+    """
+
+    def __init__(self, node_area: "NodeArea"):
+        self.node_area: "NodeArea" = node_area
+        self.lock = Lock()
+        self.thread: Thread = None
+        self.pending_nodes: Set["Node"] = set()
+        self.pending_start_nodes: Set["Node"] = set()
+
+
+    def invalidate(self, start_node: "Node") -> Set["Node"]:
+        '''
+        Увеличивает поколение узла и зависимых от него узлов и помечает их как требующие пересчета.
+        Возвращает эти узлы. Вызывается под блокировкой self.lock
+        '''
+        changed_nodes = self.node_area.graph_index.get_downstream([start_node])
+        for node in changed_nodes:
+            node.generation += 1
+            node.is_dirty = True
+        return changed_nodes
+
+
+    def cancel(self, start_node: "Node") -> None:
+        '''
+        Отменяет результаты уже запущенного пересчета для узла и зависимых от него узлов
+        (перед синхронным пересчетом). Еще не начатые запросы выполнятся с новым поколением
+        '''
+        with self.lock:
+            self.invalidate(start_node)
+
+
+    def request(self, start_node: "Node") -> None:
+        '''
+        Запрашивает пересчет узла и зависимых от него узлов
+        '''
+        with self.lock:
+            changed_nodes = self.invalidate(start_node)
+            plan = self.node_area.get_demanded_nodes(changed_nodes)
+            self.pending_nodes.update(plan)
+            if start_node in plan:
+                self.pending_start_nodes.add(start_node)
+
+            is_need_start = self.thread is None and len(self.pending_nodes) != 0
+            if is_need_start:
+                self.thread = Thread(target=self.run_pending, name="node_recalculation", daemon=True)
+
+        for node in plan:
+            node.set_processing_state(is_processing = True)
+
+        if is_need_start:
+            self.thread.start()
+
+
+    def run_pending(self) -> None:
+        '''
+        Выполняет накопленные запросы, пока они есть (в фоновом потоке)
+        '''
+        while True:
+            with self.lock:
+                if not self.pending_nodes:
+                    self.thread = None
+                    return
+                nodes, start_nodes = self.pending_nodes, self.pending_start_nodes
+                self.pending_nodes, self.pending_start_nodes = set(), set()
+                expected_generations = {node: node.generation for node in nodes}
+
+            try:
+                self.run(nodes, start_nodes, expected_generations)
+            except Exception:
+                print("Ошибка при пересчете узлов:")
+                traceback.print_exc()
+                for node in nodes:
+                    if not self.is_stale(node, expected_generations):
+                        node.set_processing_state(is_processing = False)
+
+
+    def is_stale(self, node: "Node", expected_generations: Dict["Node", int]) -> bool:
+        '''
+        Возвращает True, если узел уже запрошен более новым запуском
+        '''
+        return node.generation != expected_generations[node]
+
+
+    def run(
+        self,
+        nodes: Set["Node"],
+        start_nodes: Set["Node"],
+        expected_generations: Dict["Node", int]
+    ) -> None:
+        '''
+        Пересчитывает узлы, пропуская устаревшие
+        '''
+        graph = self.node_area.get_graph(nodes)
+        self.node_area.update_stats(cycles=self.node_area.find_cycles())
+        if self.node_area.graph_index.has_cycles():
+            # Пока есть циклы, пересчитываются только сами измененные узлы
+            for node in nodes - start_nodes:
+                node.set_processing_state(is_processing = False)
+            nodes, graph = start_nodes, {}
+
+        def calculate(node: "Node") -> Tuple[str, Dict, float]:
+            if self.is_stale(node, expected_generations):
+                return None
+            return node.compute_result()
+
+        def on_node_done(node: "Node", computed_result: Tuple[str, Dict, float]) -> None:
+            if computed_result is None or self.is_stale(node, expected_generations):
+                return
+            node.apply_result(*computed_result)
+            node.set_processing_state(is_processing = False)
+
+        self.node_area.scheduler.run(
+            nodes = nodes,
+            graph = graph,
+            calculate = calculate,
+            on_done = on_node_done,
+        )
+        # Память учитывается один раз за пересчет, а не после каждого узла
+        self.node_area.memory.update()
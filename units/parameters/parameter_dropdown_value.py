@@ -43,6 +43,14 @@ class DropdownValueParamConfig(ParameterConfigInterface):
     def __post_init__(self):
         super().__post_init__()
 
+    def normalize_value(self, value: str) -> str:
+        """
+        Возвращает ключ первого элемента, если значение не задано
+        """
+        if value is None and not self.include_none and self.options:
+            return self.options[0].key
+        return value
+
     @property
     def type(self) -> ParameterType:
         return ParameterType.DROPDOWN_VALUE
@@ -91,8 +99,8 @@ class DropdownValueParam(Container, ParameterInterface):
         self.include_none = self._config.include_none
         if self.include_none:
             self.options.insert(0, DropdownOptionConfig(key = None, text = 'Не задано'))
-        elif self.value is None:
-            self.value = self.options[0].key
+        else:
+            self.value = self._config.normalize_value(self.value)
 
         self.key_to_text = {option.key: option.text for option in self.options}
 
@@ -3,10 +3,13 @@ if TYPE_CHECKING:
     from ..node.node import Node
 
 from .parameter_typing import *
-from ..data_types import File, ParameterConnectType
+from ..data_types import File, ParameterConnectType, PortType, IMAGE_PORT
+from ..calculation_functions.input.prefetch import file_prefetcher
+from ..calculation_functions.input.thumbnail import thumbnail_cache
 
 from flet import *
 from dataclasses import dataclass, field
+from concurrent.futures import Future
 from typing import List
 
 
@@ -20,6 +23,7 @@ class FilePickerParamConfig(ParameterConfigInterface):
     initial_directory - директория, в которой открывается окно выбора файла
     file_type - тип выбираемого файла
     allowed_extensions - допустимые расширения выбираемого файла
+    port_type - тип данных, принимаемых при подключении (по умолчанию изображение или файл)
     """
 
     height: int = 30
@@ -28,8 +32,9 @@ class FilePickerParamConfig(ParameterConfigInterface):
     initial_directory: str          = None
     file_type: FilePickerFileType   = FilePickerFileType.CUSTOM
     allowed_extensions: List[str]   = field(default_factory=lambda: [
-        'png', 'jpg', "jpeg", "png", "bmp", "gif", "xcr", "bin"
+        'png', 'jpg', "jpeg", "png", "bmp", "gif", "xcr", "bin", "dat"
     ])
+    port_type: PortType = IMAGE_PORT
 
     def __post_init__(self):
         super().__post_init__()
@@ -46,8 +51,20 @@ class FilePickerParamConfig(ParameterConfigInterface):
 
 class FilePickerParam(Container, ParameterInterface):
     '''
-    Параметр с одним булевым значением
+    Параметр выбора файла
+
+    Выбранный файл декодируется в фоне (file_prefetcher), узел пересчитывается после чтения.
+    При наведении на кнопку истории в фоне читаются последние выбранные файлы.
+    Вместо исходных файлов показываются превью из кэша (thumbnail_cache), создаваемые в фоне
+
+    PREFETCH_HISTORY_COUNT - количество файлов истории, читаемых заранее
+    HISTORY_THUMBNAIL_SIZE - размер превью в истории
+    PREVIEW_THUMBNAIL_SIZE - размер превью выбранного файла
     '''
+
+    PREFETCH_HISTORY_COUNT = 3
+    HISTORY_THUMBNAIL_SIZE = 100
+    PREVIEW_THUMBNAIL_SIZE = 260
     
     def __init__(
         self,
@@ -74,8 +91,8 @@ class FilePickerParam(Container, ParameterInterface):
         if self._config.has_connect_point:
             self.connect_point = self._create_connect_point()
 
-        if self._config.default_value is not None:
-            self.list_picked_files
+        if self.value is not None:
+            file_prefetcher.prefetch(self.value)
 
 
 
@@ -163,6 +180,8 @@ class FilePickerParam(Container, ParameterInterface):
         '''
         Обработчик наведения на кнопку истории
         '''
+        if is_hover:
+            self.prefetch_history()
         ref_history_button.current.color = (
             colors.GREY_700 if len(self.list_picked_files) == 0
             else (self.ACCENT_COLOR if is_hover else colors.WHITE)
@@ -188,7 +207,14 @@ class FilePickerParam(Container, ParameterInterface):
             visible = False,
             controls = [Text(value="Удалено", expand=True, text_align=TextAlign.CENTER)],
         )
-        file_image = Image(src=file.path, height=100, width=100, border_radius=3, fit=ImageFit.CONTAIN)
+        file_image = Container(
+            width = self.HISTORY_THUMBNAIL_SIZE,
+            height = self.HISTORY_THUMBNAIL_SIZE,
+            content = self.set_thumbnail(
+                Image(border_radius=3, fit=ImageFit.CONTAIN),
+                file, self.HISTORY_THUMBNAIL_SIZE
+            ),
+        )
         file_name = Text(value=file, expand=True, size=14, selectable=True)
         file_path = Text(value=file.path, size=10, selectable=True)
         ref_close_button = Ref[IconButton]()
@@ -315,23 +341,26 @@ class FilePickerParam(Container, ParameterInterface):
                 tooltip = self.value.formatted_name if self.value is not None else None,
                 content = Image(
                     ref = self.ref_main_control_file_preview,
-                    src = self.value.path if self.value is not None else None,
                     fit = ImageFit.FIT_HEIGHT,
                     border_radius = 3,
+                    visible = False,
                 ),
                 items = [
                     PopupMenuItem(
                         content = Image(
                             ref = self.ref_main_control_file_image,
-                            src = self.value.path if self.value is not None else None,
                             fit = ImageFit.CONTAIN,
-                            width = 260,
+                            width = self.PREVIEW_THUMBNAIL_SIZE,
                             border_radius = 5,
+                            visible = False,
                         )
                     )
                 ],
             )
         )
+        if self.value is not None:
+            self.set_thumbnail(self.ref_main_control_file_preview.current, self.value, self.PREVIEW_THUMBNAIL_SIZE)
+            self.set_thumbnail(self.ref_main_control_file_image.current, self.value, self.PREVIEW_THUMBNAIL_SIZE)
         return Container(
             ref = self.ref_main_control_file_container,
             visible = self.value is not None,
@@ -350,6 +379,37 @@ class FilePickerParam(Container, ParameterInterface):
         )
     
 
+    def set_thumbnail(self, image: Image, file: File, size: int) -> Image:
+        '''
+        Показывает в image превью файла: готовое превью сразу, иначе - после создания в фоне
+        (до этого изображение скрыто)
+        '''
+        image.data = file
+        path = thumbnail_cache.get(file, size)
+        if path is not None:
+            image.src = path
+            image.visible = True
+        else:
+            image.visible = False
+            thumbnail_cache.request(file, size).add_done_callback(
+                lambda future: self.on_thumbnail_created(image, file, future)
+            )
+        return image
+
+
+    def on_thumbnail_created(self, image: Image, file: File, future: Future) -> None:
+        '''
+        Показывает созданное превью (вызывается из потока создания превью).
+        Если за это время в image показан другой файл или превью создать нельзя, ничего не меняется
+        '''
+        if image.data != file or future.exception() is not None:
+            return
+        image.src = future.result()
+        image.visible = True
+        if image.page is not None:
+            image.update()
+
+
     def create_hover_conteiner(
         self,
         control: Control,
@@ -459,7 +519,8 @@ class FilePickerParam(Container, ParameterInterface):
 
     def file_update(self, file: File) -> None:
         '''
-        Обновляет список выбранных файлов, представление и состояние файла
+        Обновляет список выбранных файлов, представление и состояние файла.
+        Узел пересчитывается после чтения файла в фоне
         '''
         if file == self.value:
             return
@@ -468,7 +529,26 @@ class FilePickerParam(Container, ParameterInterface):
         self.update_file_view()
         self.toggle_file_view(is_file_opened = True)
         self.on_history_button_hover(self.ref_main_control_history_button, False)
-        self._on_change()
+        file_prefetcher.prefetch(file).add_done_callback(lambda _: self.on_file_decoded(file))
+
+
+    def on_file_decoded(self, file: File) -> None:
+        '''
+        Запускает пересчет после чтения файла (вызывается из потока чтения).
+        Если за время чтения выбран другой файл, пересчет запустит его обработчик
+        '''
+        if file == self.value and not self.is_connected:
+            self._on_change()
+
+
+    def prefetch_history(self) -> None:
+        '''
+        Читает в фоне последние выбранные файлы
+        '''
+        file_prefetcher.prefetch_many(
+            file for file in self.list_picked_files[:self.PREFETCH_HISTORY_COUNT]
+            if file != self.value
+        )
 
 
     def move_file_to_top(self, file: File) -> None:
@@ -499,8 +579,8 @@ class FilePickerParam(Container, ParameterInterface):
         Обновляет содержимое окна файла
         '''
         self.ref_main_control_file_name.current.value = self.value
-        self.ref_main_control_file_preview.current.src = self.value.path
-        self.ref_main_control_file_image.current.src = self.value.path
+        self.set_thumbnail(self.ref_main_control_file_preview.current, self.value, self.PREVIEW_THUMBNAIL_SIZE)
+        self.set_thumbnail(self.ref_main_control_file_image.current, self.value, self.PREVIEW_THUMBNAIL_SIZE)
         self.ref_main_control_file_popup_button.current.tooltip = self.value.formatted_name
 
         self.ref_main_control_history_popup.current.items = self.get_history_popup_menu_items()
@@ -3,7 +3,7 @@ if TYPE_CHECKING:
     from ..node.node import Node
 
 from .parameter_typing import *
-from ..data_types import ParameterConnectType
+from ..data_types import ParameterConnectType, PortType, SCALAR_PORT
 
 from flet import *
 from dataclasses import dataclass
@@ -27,10 +27,25 @@ class SingleValueParamConfig(ParameterConfigInterface):
     min_value: int | float = None
     max_value: int | float = None
     decimal_accuracy: int = None
+    port_type: PortType = SCALAR_PORT
 
     def __post_init__(self):
         super().__post_init__()
 
+    def normalize_value(self, value: float) -> float:
+        """
+        Ограничивает значение диапазоном и округляет до заданной точности
+        """
+        if self.min_value is not None and value < self.min_value:
+            value = self.min_value
+        if self.max_value is not None and value > self.max_value:
+            value = self.max_value
+        if self.decimal_accuracy is None:
+            return float(value)
+        elif self.decimal_accuracy == 0:
+            return int(value)
+        return round(float(value), self.decimal_accuracy)
+
     @property
     def type(self) -> ParameterType:
         return ParameterType.SINGLE_VALUE
@@ -251,15 +266,7 @@ class SingleValueParam(Container, ParameterInterface):
         """
         Проверяет значение на валидность
         """
-        if self.min_value is not None and value < self.min_value:
-            value = self.min_value
-        if self.max_value is not None and value > self.max_value:
-            value = self.max_value
-        if self.decimal_accuracy is None:
-            return float(value)
-        elif self.decimal_accuracy == 0:
-            return int(value)
-        return round(float(value), self.decimal_accuracy)
+        return self._config.normalize_value(value)
         
 
     def drag_value_update(self, e: DragUpdateEvent) -> None:
@@ -281,6 +288,10 @@ class SingleValueParam(Container, ParameterInterface):
         value_text.value =  self.min_max_check(value)
         value_text.update()
 
+        # Предпросмотр зависимых узлов в уменьшенном разрешении
+        if value_text.value != cur_value:
+            self.node.request_preview(self._key, value_text.value)
+
 
     def drag_value_update_start(self, e: DragUpdateEvent) -> None:
         """
@@ -301,6 +312,8 @@ class SingleValueParam(Container, ParameterInterface):
         value_text.color = None
         value_text.update()
 
-        if self.value != float(value_text.value):
+        is_value_changed = self.value != float(value_text.value)
+        self.node.node_area.preview.finish(is_restore = not is_value_changed)
+        if is_value_changed:
             self.value = self.min_max_check(value_text.value)
             self._on_change()
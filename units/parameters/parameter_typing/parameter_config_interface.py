@@ -2,6 +2,8 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .parameter_type import ParameterType
 
+from ...data_types import PortType, ANY_PORT
+
 from dataclasses import dataclass
 from typing import Any
 from flet import colors
@@ -17,6 +19,7 @@ class ParameterConfigInterface:
     name - название параметра
     height - высота параметра
     connect_point_color - цвет точки подключения
+    port_type - тип данных точки подключения (совместимость проверяется при соединении)
     '''
     
     key: str = 'unknown'
@@ -26,11 +29,19 @@ class ParameterConfigInterface:
     has_connect_point: bool = True
     connect_point_color: str = colors.GREY_500
     tooltip: str = None
+    port_type: PortType = ANY_PORT
 
 
     def __post_init__(self):
         if self.key == 'unknown':
             self.key = self.name.lower().replace(" ", "_")
+
+
+    def normalize_value(self, value: Any) -> Any:
+        '''
+        Приводит значение к допустимому для параметра виду
+        '''
+        return value
         
 
     @property
@@ -151,11 +151,25 @@ class ParameterConnectPoint(Container):
             print("Неизвестный тип src_data")
 
 
+    def is_compatible(self, from_param: "ParameterInterface") -> bool:
+        """
+        Проверяет, что данные выходного параметра подходят параметру этого контакта
+        (типы проверяются один раз при соединении, а не при каждом вычислении)
+        """
+        if self.parameter.port_type.accepts(from_param.port_type):
+            return True
+        self.node.node_area.workplace.show_message(
+            f"Нельзя подключить '{from_param.name}' ({from_param.port_type}) "
+            + f"к параметру '{self.parameter.name}' ({self.parameter.port_type})"
+        )
+        return False
+
+
     def handle_node_connect_point_data(self, e: DragTargetAcceptEvent, src_data: "ParameterConnectPoint") -> None:
         """
         Обрабатывает данные от выходного параметра (NodeConnectPoint)
         """
-        if src_data.node == self.node:
+        if src_data.node == self.node or not self.is_compatible(src_data.parameter):
             self.drag_leave(e)
 
         else:
@@ -165,13 +179,16 @@ class ParameterConnectPoint(Container):
 
                 else:
                     from_param: "ParameterInterface" = src_data.parameter
-                    self.current_connect.change_from_param(from_param)
+                    self.node_area_connections.reconnect_node_connect(
+                        self.current_connect,
+                        lambda: self.current_connect.change_from_param(from_param)
+                    )
                     self.current_point_color = self.current_connect.path_color
                     self.set_point_color(
                         point_color = self.current_point_color,
                         is_update = True
                     )
-                    self.node.calculate()
+                    self.node.request_calculation()
                     
             else:
                 from_param: "ParameterInterface" = src_data.parameter
@@ -187,7 +204,11 @@ class ParameterConnectPoint(Container):
         """
         Обрабатывает данные от подключения к другому параметру (NodeConnection)
         """
-        if src_data.from_node == self.node or src_data == self.current_connect:
+        if (
+            src_data.from_node == self.node
+            or src_data == self.current_connect
+            or not self.is_compatible(src_data.from_param)
+        ):
             self.drag_leave(e)
 
         else:
@@ -199,14 +220,18 @@ class ParameterConnectPoint(Container):
                     is_recalculate = self.current_connect.to_node != src_data.to_node
                 )
 
-                src_data.change_to_param(self.parameter)
+                self.node_area_connections.reconnect_node_connect(
+                    src_data, lambda: src_data.change_to_param(self.parameter)
+                )
                 self.set_current_connect(src_data)
 
             else:
                 cur_to_point: ParameterConnectPoint = src_data.to_point
                 cur_to_point.clear_point_on_reconnect()
 
-                src_data.change_to_param(self.parameter)
+                self.node_area_connections.reconnect_node_connect(
+                    src_data, lambda: src_data.change_to_param(self.parameter)
+                )
                 self.set_current_connect(src_data)
 
 
@@ -46,6 +46,7 @@ class ParameterInterface(ABC):
         self.name = self._config.name
         self.has_connect_point = self._config.has_connect_point
         self.connect_point_color = self._config.connect_point_color
+        self.port_type = self._config.port_type
         self.is_connected = False
         self.value = self._config.default_value
 
@@ -81,7 +82,7 @@ class ParameterInterface(ABC):
     
 
     def _on_change(self) -> None:
-        self.node.calculate()
+        self.node.request_calculation()
 
 
     def _create_connect_point(self) -> ParameterConnectPoint:
@@ -3,7 +3,7 @@ if TYPE_CHECKING:
     from ..node.node import Node
     from .result_area import ResultArea
 
-from ..calculation_functions import ResultType, NodeResult
+from ..calculation_functions import ResultType, NodeResult, as_native_byte_order, plot_signal
 
 from flet import *
 from flet.matplotlib_chart import MatplotlibChart
@@ -11,6 +11,7 @@ from flet.plotly_chart import PlotlyChart
 import cv2
 import base64
 import io
+import os
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
@@ -114,6 +115,8 @@ class ResultView(DragTarget):
             ResultType.HISTOGRAM:       self.crate_histogram_view_element,
             ResultType.MATPLOTLIB_FIG:  self.crate_matplotlib_view_element,
             ResultType.PLOTLY_FIG:      self.crate_plotly_view_element,
+            ResultType.SIGNAL:          self.crate_signal_view_element,
+            ResultType.AUDIO:           self.crate_audio_view_element,
         }
         result_title = self.create_result_title()
         result_body = value_type_to_view[self.result_type]()
@@ -243,6 +246,31 @@ class ResultView(DragTarget):
         return self.crate_image_base64_view_element()
     
 
+    def crate_signal_view_element(self):
+        """
+        Создает элемент для отображения сигнала (график matplotlib).
+        График нужен только для кодирования в base64 и закрывается сразу после него
+        """
+        self.result_value = self.fig_to_base64(plot_signal(self.result_value))
+        return self.crate_image_base64_view_element()
+    
+
+    def crate_audio_view_element(self):
+        """
+        Создает элемент для отображения звукового потока (параметры записи, отсчеты не читаются)
+        """
+        audio = self.result_value
+        return Row(
+            alignment = MainAxisAlignment.CENTER,
+            controls = [Text(
+                value = (
+                    f"{os.path.basename(audio.path)}: {audio.duration:.2f} с, "
+                    + f"{audio.sample_rate} Гц, каналов: {audio.channels}, {8 * audio.sample_width} бит"
+                ),
+            )],
+        )
+    
+
     def crate_plotly_view_element(self):
         """
         Создает элемент для отображения графика
@@ -264,7 +292,7 @@ class ResultView(DragTarget):
             image = cv2.imread(image)
         
         # Кодирование изображения в формате base64
-        _, buffer = cv2.imencode('.jpg', image)
+        _, buffer = cv2.imencode('.jpg', as_native_byte_order(image))
         base64_image = base64.b64encode(buffer).decode('utf-8')
         
         return base64_image
@@ -272,12 +300,13 @@ class ResultView(DragTarget):
 
     def fig_to_base64(self, fig):
         """
-        Преобразует объект fig из matplotlib в изображение в формате base64
+        Преобразует объект fig из matplotlib в изображение в формате base64.
+        Фигура закрывается (удаляется из pyplot) даже при ошибке отрисовки
         """
         buf = io.BytesIO()
-        fig.savefig(buf, format='png')
-        buf.seek(0)
-        # return base64.b64encode(buf.read()).decode('utf-8')
-        plt.close(fig)
+        try:
+            fig.savefig(buf, format='png')
+        finally:
+            plt.close(fig)
         return base64.b64encode(buf.getvalue()).decode('utf-8')
     
\ No newline at end of file
@@ -38,6 +38,21 @@ class StatisticsPanel(Row):
                 cycle.append(cycle[0])
                 cycles_str.append('(' + '->'.join([f'{e.id}' for e in cycle]) + ')')
             return f"Циклов ({len(unique_cycles)}): {'; '.join(cycles_str)}"
+
+        def format_bytes(value):
+            units = ["Б", "КБ", "МБ", "ГБ"]
+            unit = 0
+            while value >= 1024 and unit < len(units) - 1:
+                value /= 1024
+                unit += 1
+            return f"{value:.1f}\u00A0{units[unit]}"
+
+        def bytes_to_string(value):
+            return f"Память:\u00A0{format_bytes(value)}"
+
+        def copies_to_string(value):
+            copies, copied_bytes = value
+            return f"Копий:\u00A0{copies}\u00A0({format_bytes(copied_bytes)})"
         
         return {
             param.key: param
@@ -46,6 +61,16 @@ class StatisticsPanel(Row):
                 StatisticParameter("edges", 0, "Соединений", values_not_shown=[0]),
                 StatisticParameter("scale", 1, "Масштаб", values_not_shown=[1], prefix='x'),
                 StatisticParameter("selected", 0, "Выбрано", values_not_shown=[0]),
+                StatisticParameter(
+                    "memory", 0, "Память", values_not_shown=[0],
+                    tooltip = "Память результатов узлов (сверх бюджета промежуточные результаты освобождаются)",
+                    to_string = bytes_to_string,
+                ),
+                StatisticParameter(
+                    "copies", (0, 0), "Копий", values_not_shown=[(0, 0)],
+                    tooltip = "Копирования входных данных узлами, изменяющими их (копирование при записи)",
+                    to_string = copies_to_string,
+                ),
                 StatisticParameter(
                     "cycles", [], "Циклов", values_not_shown=[[]],
                     tooltip = "Функции не могут быть пересчитаны пока есть циклы",
@@ -100,6 +100,15 @@ class Workplace(Column):
         ]
     
     
+    def show_message(self, message: str) -> None:
+        '''
+        Показывает сообщение пользователю (всплывающая полоса внизу окна)
+        '''
+        self.page.snack_bar = SnackBar(content = Text(message), bgcolor = colors.GREY_900)
+        self.page.snack_bar.open = True
+        self.page.update()
+
+
     def resize_columns(self, e: DragUpdateEvent) -> None:
         '''
         Изменяет ширину колонок